@@ -27,7 +27,7 @@ de tratamento de dados, modelagem matemática, previsão temporal e visualizaç
    - Base  
    - Otimista  
    - Pessimista  
-6. Utilizar **Facebook Prophet** para prever a evolução das emissões até um ano escolhido.  
+6. Prever a evolução das emissões até um ano escolhido pelos **direcionadores**: consumo de energia previsto × fator de emissão projetado.  
 7. Apresentar resultados em um **dashboard interativo** usando **Streamlit + Plotly**.
 
 ---
@@ -59,8 +59,12 @@ de tratamento de dados, modelagem matemática, previsão temporal e visualizaç
 
 ### 🔮 Modelo de Previsão
 
-Usamos o **Prophet** para modelar a série histórica de emissões totais, prevendo valores até o ano solicitado.
-Essas projeções alimentam o cálculo dos cenários dos data centers.
+Em vez de prever direto a série de emissões totais, prevemos os dois direcionadores e multiplicamos:
+- **Consumo de energia**: previsão hierárquica (nacional, subsistema, UF e classe), com tendência linear
+  ajustada para todas as séries de uma vez e partindo do último ano observado (o Prophet fica como opção);
+- **Fator de emissão**: projetado a partir das usinas que entram em operação (capacidade instalada).
+
+Emissão total = consumo previsto × fator projetado. Essas projeções alimentam o cálculo dos cenários dos data centers.
 
 ---
 
@@ -0,0 +1,5 @@
+#############################################################
+# Funções de cálculo do estimador, separadas das páginas do
+# Streamlit pra poderem ser reaproveitadas (e cacheadas) por
+# qualquer página ou script.
+#############################################################
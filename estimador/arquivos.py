@@ -0,0 +1,16 @@
+#############################################################
+# Utilidades para arquivos de entrada.
+#############################################################
+
+import hashlib
+
+
+def hash_arquivo(path):
+    # Hash do conteúdo do arquivo. Serve de "versão dos dados":
+    # passamos esse valor para as funções com cache, assim o cache
+    # só é refeito quando o arquivo realmente muda.
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
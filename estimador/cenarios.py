@@ -0,0 +1,52 @@
+#############################################################
+# Cenários de participação dos data centers.
+#
+# A conta das seções 6 e 7 do dashboard, fora do Streamlit:
+# participação dos DCs numa curva suave (0,3% no início da série,
+# 1,7% em 2024, alvo no ano final) × consumo total × fator.
+# Assim a mesma regra serve ao dashboard, à versão do gráfico que
+# roda no navegador e a quem mais precisar dos cenários.
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+
+PARTICIPACAO_INICIAL = 0.003     # 0,3% no primeiro ano (valor estimado)
+ANO_REFERENCIA = 2024
+PARTICIPACAO_REFERENCIA = 0.017  # 1,7% em 2024 (dado Brasscom)
+
+# Alvo de cada cenário = participação informada × multiplicador
+# Otimista: DCs mais eficientes / menos crescimento; Pessimista: explosão de DCs
+MULTIPLICADORES = {"Base": 1.0, "Otimista": 0.7, "Pessimista": 1.3}
+CORES = {"Base": "#1f77b4", "Otimista": "#2ca02c", "Pessimista": "#d62728"}
+
+
+def curva_suave(anos, ano_inicio, ano_fim, alvo):
+    return np.interp(
+        anos,
+        [ano_inicio, ANO_REFERENCIA, ano_fim],
+        [PARTICIPACAO_INICIAL, PARTICIPACAO_REFERENCIA, alvo]
+    )
+
+
+def alvos(participacao_final):
+    # Participação no ano final de cada cenário (nunca passa de 100%)
+    return {nome: min(1.0, participacao_final * m) for nome, m in MULTIPLICADORES.items()}
+
+
+def calcular_cenarios(previsao, ano_inicio, ano_fim, participacao_final):
+    # previsao: ano, consumo_total_MWh, fator_emissao_tCO2_MWh (+ o que mais tiver).
+    # Devolve uma linha por (cenário, ano) com participação, consumo e emissão dos DCs.
+    anos = previsao["ano"].to_numpy(dtype=float)
+
+    cenarios_detalhados = []
+    for nome, alvo in alvos(participacao_final).items():
+        df_c = previsao.copy()
+        df_c["cenario"] = nome
+        df_c["participacao_DC"] = curva_suave(anos, ano_inicio, ano_fim, alvo)
+        df_c["consumo_DC_MWh"] = df_c["consumo_total_MWh"] * df_c["participacao_DC"]
+        df_c["emissao_DC_tCO2"] = df_c["consumo_DC_MWh"] * df_c["fator_emissao_tCO2_MWh"]
+        cenarios_detalhados.append(df_c)
+
+    return pd.concat(cenarios_detalhados, ignore_index=True)
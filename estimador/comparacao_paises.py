@@ -0,0 +1,126 @@
+#############################################################
+# Comparação entre países.
+#
+# A mesma metodologia do dashboard (consumo × participação dos
+# DCs × fator da rede), mas para vários países ao mesmo tempo.
+# Tudo é guardado em matrizes (países × anos) e o resultado sai
+# num tensor (países × cenários × anos), sem laço por país.
+#
+# Entradas: tabelas longas (pais, ano, valor) de consumo elétrico
+# (MWh) e de fator de emissão (tCO₂/MWh), por exemplo as colunas
+# electricity_demand e carbon_intensity_elec do World Energy
+# Consumption (OWID).
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+from estimador.cenarios import MULTIPLICADORES, PARTICIPACAO_INICIAL, PARTICIPACAO_REFERENCIA
+from estimador.previsao_consumo import prever_tendencia
+
+
+# Mesmos multiplicadores do dashboard
+CENARIOS = MULTIPLICADORES
+
+# Participação dos DCs no consumo elétrico no último ano histórico.
+# Estimativas grosseiras (IEA/relatórios nacionais); o resto usa a
+# média global.
+PARTICIPACAO_DC_PADRAO = 0.015
+PARTICIPACAO_DC_PAIS = {
+    "Brazil": 0.017,
+    "United States": 0.044,
+    "Ireland": 0.21,
+    "Singapore": 0.07,
+    "Netherlands": 0.04,
+    "Denmark": 0.03,
+    "United Kingdom": 0.025,
+    "Germany": 0.025,
+    "Japan": 0.02,
+    "China": 0.02,
+}
+
+def preparar_tabelas_owid(df):
+    # World Energy Consumption → tabelas de consumo (MWh) e fator (tCO₂/MWh).
+    # Agregados (World, continentes, grupos de renda) não têm código ISO.
+    if "iso_code" in df.columns:
+        df = df[df["iso_code"].notna() & ~df["iso_code"].astype(str).str.startswith("OWID")]
+
+    coluna_consumo = next(
+        (c for c in ["electricity_demand", "electricity_generation"] if c in df.columns), None
+    )
+    if coluna_consumo is None or "carbon_intensity_elec" not in df.columns:
+        raise ValueError(
+            "O arquivo precisa das colunas electricity_demand (ou electricity_generation) "
+            "e carbon_intensity_elec."
+        )
+
+    consumo = pd.DataFrame({
+        "pais": df["country"], "ano": df["year"],
+        "valor": df[coluna_consumo] * 1e6,  # TWh → MWh
+    }).dropna()
+    fator = pd.DataFrame({
+        "pais": df["country"], "ano": df["year"],
+        "valor": df["carbon_intensity_elec"] / 1000,  # gCO₂/kWh → tCO₂/MWh
+    }).dropna()
+    return consumo, fator
+
+
+def matriz_paises(tabela, paises, anos):
+    # Tabela longa → matriz (países × anos); buracos no meio da série
+    # são interpolados, nas pontas ficam NaN
+    m = tabela.pivot_table(index="pais", columns="ano", values="valor", aggfunc="sum")
+    m = m.reindex(index=paises, columns=anos)
+    return m.interpolate(axis=1, limit_area="inside").to_numpy(dtype=float)
+
+
+def montar_matrizes(consumo, fator, ano_ini, ano_ref, ano_fim, anos_ajuste=15):
+    # Matrizes (países × anos) de ano_ini até ano_fim:
+    # - consumo futuro: reta ajustada nos últimos `anos_ajuste` anos,
+    #   todos os países numa única chamada de mínimos quadrados;
+    # - fator futuro: último valor observado (rede congelada).
+    # Países sem série completa na janela de ajuste ficam de fora.
+    anos_hist = np.arange(ano_ini, ano_ref + 1)
+    paises = sorted(set(consumo["pais"]) & set(fator["pais"]))
+
+    c = matriz_paises(consumo, paises, anos_hist)
+    f = pd.DataFrame(matriz_paises(fator, paises, anos_hist)).ffill(axis=1).to_numpy()
+
+    janela = anos_hist >= ano_ref - anos_ajuste + 1
+    completos = ~np.isnan(c[:, janela]).any(axis=1) & ~np.isnan(f[:, -1])
+    paises = [p for p, ok in zip(paises, completos) if ok]
+    c, f = c[completos], f[completos]
+
+    anos_futuros = np.arange(ano_ref + 1, ano_fim + 1)
+    if len(anos_futuros) and len(paises):
+        c_fut = prever_tendencia(c[:, janela].T, anos_hist[janela], anos_futuros).T
+        c = np.hstack([c, np.clip(c_fut, 0, None)])
+        f = np.hstack([f, np.repeat(f[:, -1:], len(anos_futuros), axis=1)])
+
+    return paises, np.arange(ano_ini, ano_fim + 1), c, f
+
+
+def emissoes_dc_paises(consumo, fator, part_atual, part_final, anos, ano_ref,
+                       multiplicadores=tuple(CENARIOS.values())):
+    # consumo, fator: (países × anos); part_atual, part_final: (países)
+    # Devolve (participação, consumo_DC, emissão_DC), todos (países × cenários × anos).
+    anos = np.asarray(anos, dtype=float)
+    ano_ini, ano_fim = anos[0], anos[-1]
+    mult = np.asarray(multiplicadores, dtype=float)
+
+    # Até ano_ref: formato da curva histórica do Brasil (a mesma dos
+    # cenários, 0,3% → 1,7%), relativo ao valor atual de cada país
+    forma_hist = np.interp(anos, [ano_ini, ano_ref],
+                           [PARTICIPACAO_INICIAL / PARTICIPACAO_REFERENCIA, 1.0])
+
+    # Depois de ano_ref: reta até o alvo de cada cenário
+    alvo = np.minimum(1.0, part_final[:, None] * mult[None, :])  # (países × cenários)
+    passo = np.clip((anos - ano_ref) / max(ano_fim - ano_ref, 1), 0, None)
+    futuro = part_atual[:, None, None] + (alvo - part_atual[:, None])[:, :, None] * passo[None, None, :]
+
+    participacao = np.where(
+        anos[None, None, :] <= ano_ref,
+        part_atual[:, None, None] * forma_hist[None, None, :],
+        futuro
+    )
+    consumo_dc = consumo[:, None, :] * participacao
+    return participacao, consumo_dc, consumo_dc * fator[:, None, :]
@@ -0,0 +1,248 @@
+#############################################################
+# Construção dos arquivos derivados a partir dos dados brutos.
+#
+# Antes, input/consumo_anual_MWh.csv e input/emissoes_anuais_2006_2024.csv
+# saíam de células do notebook (testes/projeto_final.ipynb), rodadas
+# à mão. Aqui cada arquivo derivado é uma etapa declarada em ETAPAS:
+# entradas, saídas e a função que gera as saídas.
+#
+# Um manifesto (cache/construcao.json) guarda, por etapa, o hash das
+# entradas, do código e das saídas. O código é o da função da etapa
+# mais o do que ela usa e não está nela (os módulos/funções listados
+# em "codigo" e as constantes em "parametros"); mudar outra coisa no
+# projeto não refaz a etapa. Ao rodar de novo:
+# - etapa com entradas, código e saídas iguais → pulada;
+# - etapa com alguma mudança → refeita. Se a saída refeita tiver o
+#   mesmo conteúdo de antes, as etapas seguintes continuam puladas.
+# As dependências vêm das próprias declarações (a entrada de uma é a
+# saída da outra), e etapas que não dependem entre si rodam em
+# paralelo, em processos separados.
+#
+# Uso:
+#   python -m estimador.construir [etapa ...] [--forcar]
+#############################################################
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from estimador import fatores_mcti, ingestao_epe
+from estimador.arquivos import hash_arquivo
+from estimador.fatores_mcti import ARQUIVO_FE, ARQUIVO_INVENTARIO, ingerir
+from estimador.ingestao_epe import DESTINO_PADRAO as AGREGADO, atualizar_agregado
+from estimador.pipeline import ARQUIVO_CONSUMO, ARQUIVO_FATORES
+
+
+MANIFESTO = "cache/construcao.json"
+
+CONSUMO_ANUAL = "input/consumo_anual_MWh.csv"
+EMISSOES_ANUAIS = "input/emissoes_anuais_2006_2024.csv"
+ANOS = (2006, 2024)
+
+
+#############################################################
+# Etapas. Cada função grava as suas saídas e devolve a lista de
+# arquivos gravados.
+#############################################################
+
+def _gravar_csv(df, destino):
+    # Temporário + troca: nunca fica um CSV pela metade
+    os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+    df.to_csv(destino + ".tmp", index=False)
+    os.replace(destino + ".tmp", destino)
+
+
+def _agregado_epe():
+    # Consumo mensal da EPE → agregado por (ano, mês, UF, classe).
+    # Refeito do zero: a etapa só roda quando algo mudou (entrada, código
+    # ou saída) ou com --forcar, e o manifesto do próprio agregado
+    # pularia o arquivo se o hash dele não tivesse mudado
+    atualizar_agregado([ARQUIVO_CONSUMO], AGREGADO, reprocessar=True)
+    return [AGREGADO]
+
+
+def _consumo_anual():
+    # Soma de todos os meses, UFs e classes do ano (2006–2024)
+    agregado = pd.read_csv(AGREGADO, dtype={"uf": str, "classe": str})
+    agregado = agregado[agregado["ano"].between(*ANOS)]
+    df = agregado.groupby("ano")["consumo_MWh"].sum().reset_index()
+    df = df.rename(columns={"consumo_MWh": "consumo_anual_MWh"})
+    # A EPE publica com até 3 casas; arredondar tira o ruído da ordem da
+    # soma, e a mesma entrada sempre grava o mesmo arquivo, byte a byte
+    df["consumo_anual_MWh"] = df["consumo_anual_MWh"].round(3)
+    _gravar_csv(df, CONSUMO_ANUAL)
+    return [CONSUMO_ANUAL]
+
+
+def _emissoes_anuais():
+    # Emissão do ano = consumo anual × fator de emissão do ano
+    consumo = pd.read_csv(CONSUMO_ANUAL)
+    fatores = pd.read_csv(ARQUIVO_FATORES)
+    consumo["ano"] = consumo["ano"].astype(int)
+    fatores["ano"] = fatores["ano"].astype(int)
+
+    df = consumo.merge(fatores, on="ano", how="inner")
+    df["emissao_tCO2"] = df["consumo_anual_MWh"] * df["fator_emissao_tCO2_MWh"]
+    _gravar_csv(df, EMISSOES_ANUAIS)
+    return [EMISSOES_ANUAIS]
+
+
+def _fatores_mcti():
+    # Planilhas do MCTI → .npz tipado (o nome do arquivo leva o hash delas)
+    return [ingerir(ARQUIVO_FE, ARQUIVO_INVENTARIO)]
+
+
+ETAPAS = {
+    "agregado_epe": {
+        "entradas": [ARQUIVO_CONSUMO],
+        "saidas": [AGREGADO],
+        "funcao": _agregado_epe,
+        "codigo": [ingestao_epe],
+    },
+    "consumo_anual": {
+        "entradas": [AGREGADO],
+        "saidas": [CONSUMO_ANUAL],
+        "funcao": _consumo_anual,
+        "codigo": [_gravar_csv],
+        "parametros": {"anos": ANOS},
+    },
+    "emissoes_anuais": {
+        "entradas": [CONSUMO_ANUAL, ARQUIVO_FATORES],
+        "saidas": [EMISSOES_ANUAIS],
+        "funcao": _emissoes_anuais,
+        "codigo": [_gravar_csv],
+    },
+    "fatores_mcti": {
+        "entradas": [ARQUIVO_FE, ARQUIVO_INVENTARIO],
+        "saidas": [],  # nome depende do hash das planilhas
+        "funcao": _fatores_mcti,
+        "codigo": [fatores_mcti],
+    },
+}
+
+
+#############################################################
+# Ordem, hashes e execução
+#############################################################
+
+def dependencias(etapas=ETAPAS):
+    # etapa → etapas que produzem alguma das suas entradas
+    produtor = {saida: nome for nome, e in etapas.items() for saida in e["saidas"]}
+    return {
+        nome: {produtor[x] for x in e["entradas"] if x in produtor and produtor[x] != nome}
+        for nome, e in etapas.items()
+    }
+
+
+def niveis(etapas=ETAPAS):
+    # Agrupa as etapas em níveis: cada nível só depende dos anteriores,
+    # então as etapas de um mesmo nível podem rodar ao mesmo tempo
+    depende = dependencias(etapas)
+    resultado, feitas = [], set()
+    while len(feitas) < len(etapas):
+        nivel = [n for n in etapas if n not in feitas and depende[n] <= feitas]
+        if not nivel:
+            raise ValueError(f"Dependência circular entre: {sorted(set(etapas) - feitas)}")
+        resultado.append(nivel)
+        feitas.update(nivel)
+    return resultado
+
+
+def _hash_codigo(etapa):
+    # Fonte da função, do que ela chama de fora e as constantes da etapa
+    h = hashlib.sha1()
+    for objeto in [etapa["funcao"], *etapa.get("codigo", [])]:
+        h.update(inspect.getsource(objeto).encode())
+    h.update(repr(sorted(etapa.get("parametros", {}).items())).encode())
+    return h.hexdigest()
+
+
+def _hashes(arquivos):
+    return {a: hash_arquivo(a) if os.path.exists(a) else None for a in arquivos}
+
+
+def _em_dia(etapa, registro):
+    # Entradas e código iguais aos da última construção, e as saídas
+    # ainda no disco do jeito que ficaram
+    if not registro or registro["codigo"] != _hash_codigo(etapa):
+        return False
+    if registro["entradas"] != _hashes(etapa["entradas"]):
+        return False
+    return registro["saidas"] == _hashes(registro["saidas"])
+
+
+def _rodar(nome):
+    # Roda dentro de um processo do pool
+    inicio = time.perf_counter()
+    saidas = ETAPAS[nome]["funcao"]()
+    return nome, saidas, time.perf_counter() - inicio
+
+
+def construir(alvos=None, forcar=False, max_workers=None, manifesto=MANIFESTO):
+    # alvos: nomes das etapas (None = todas; as dependências entram junto).
+    # Devolve {etapa: "pulada" | segundos que levou}.
+    if os.path.exists(manifesto):
+        with open(manifesto, encoding="utf-8") as f:
+            registros = json.load(f)
+    else:
+        registros = {}
+
+    escolhidas = set(ETAPAS) if alvos is None else set(alvos)
+    desconhecidas = escolhidas - set(ETAPAS)
+    if desconhecidas:
+        raise ValueError(f"Etapas desconhecidas: {sorted(desconhecidas)}. Use {list(ETAPAS)}.")
+
+    ordem = niveis()
+    # Inclui as etapas de que os alvos dependem
+    depende = dependencias()
+    for nivel in reversed(ordem):
+        for nome in nivel:
+            if nome in escolhidas:
+                escolhidas |= depende[nome]
+
+    situacao = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for nivel in ordem:
+            # Os hashes de entrada são lidos depois que o nível anterior
+            # terminou, então só é refeito o que de fato mudou
+            pendentes = [
+                n for n in nivel
+                if n in escolhidas and (forcar or not _em_dia(ETAPAS[n], registros.get(n)))
+            ]
+            situacao.update({n: "pulada" for n in nivel if n in escolhidas and n not in pendentes})
+
+            for nome, saidas, duracao in pool.map(_rodar, pendentes):
+                etapa = ETAPAS[nome]
+                registros[nome] = {
+                    "codigo": _hash_codigo(etapa),
+                    "entradas": _hashes(etapa["entradas"]),
+                    "saidas": _hashes(saidas),
+                }
+                situacao[nome] = duracao
+
+            # Manifesto salvo a cada nível: se algo quebrar depois, o que
+            # já ficou pronto não é refeito na próxima vez
+            os.makedirs(os.path.dirname(manifesto) or ".", exist_ok=True)
+            with open(manifesto + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(registros, f, indent=2, ensure_ascii=False)
+            os.replace(manifesto + ".tmp", manifesto)
+
+    return situacao
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    forcar = "--forcar" in args
+    alvos = [a for a in args if a != "--forcar"] or None
+
+    inicio = time.perf_counter()
+    situacao = construir(alvos, forcar)
+    for nome, estado in situacao.items():
+        print(f"{nome:<16} {'em dia' if estado == 'pulada' else f'refeita em {estado:.1f} s'}")
+    print(f"total: {time.perf_counter() - inicio:.1f} s")
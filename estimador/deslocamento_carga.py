@@ -0,0 +1,95 @@
+#############################################################
+# Deslocamento de carga flexível para horas de menor emissão.
+#
+# Parte da carga de um DC (backups, treinos, processamento em
+# lote) pode mudar de horário. Dentro de cada janela (ex.: 24 h),
+# a energia flexível é redistribuída para as horas de menor fator
+# de emissão, sem passar da capacidade da instalação.
+#
+# Por janela isso é uma mochila fracionária: ordenar as horas pelo
+# fator e encher a folga de capacidade da mais limpa para a mais
+# suja. Com todas as janelas numa matriz (janelas × horas) o
+# problema inteiro sai com um argsort e uma soma acumulada.
+#
+# Só há fatores mensais (Inventário MCTI, via estimador/fatores_mcti).
+# O perfil horário é o
+# fator do mês × um formato diário típico do SIN (mais limpo ao
+# meio-dia com a solar, mais sujo no pico da noite com térmicas);
+# a amplitude desse formato é um parâmetro.
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+
+# Formato diário do fator (média zero, escala 1): vale às 12 h, pico às 19 h
+_h = np.arange(24)
+FORMATO_DIARIO = (-np.exp(-0.5 * ((_h - 12) / 3.0) ** 2)
+                  + 0.8 * np.exp(-0.5 * ((_h - 19) / 2.0) ** 2))
+FORMATO_DIARIO = FORMATO_DIARIO - FORMATO_DIARIO.mean()
+FORMATO_DIARIO = FORMATO_DIARIO / np.abs(FORMATO_DIARIO).max()
+
+
+def fator_horario(tempo, fatores_mensais, ano=None, amplitude=0.3):
+    # Fator de emissão em cada hora de `tempo` (DatetimeIndex).
+    # ano: usa os meses desse ano do Inventário para qualquer ano de
+    # `tempo` (útil para simular um perfil sintético); None = mesmo ano.
+    tempo = pd.DatetimeIndex(tempo)
+    tabela = fatores_mensais.set_index(["ano", "mes"])["fator_emissao_tCO2_MWh"]
+
+    anos = np.full(len(tempo), ano) if ano is not None else tempo.year.to_numpy()
+    chaves = pd.MultiIndex.from_arrays([anos, tempo.month.to_numpy()])
+    mensal = tabela.reindex(chaves).to_numpy()
+    if np.isnan(mensal).any():
+        raise ValueError("Há meses sem fator de emissão no Inventário para o período pedido.")
+
+    return mensal * (1 + amplitude * FORMATO_DIARIO[tempo.hour.to_numpy()])
+
+
+def deslocar_carga(carga, fator, participacao_flexivel=0.2, capacidade=None, horas_janela=24):
+    # carga (MWh por hora) e fator (tCO2/MWh): arrays do mesmo tamanho.
+    # participacao_flexivel: fração da carga de cada hora que pode mudar
+    #   de horário (dentro da mesma janela).
+    # capacidade: limite de carga por hora (padrão: o pico original).
+    # Devolve um dict com a carga deslocada e as emissões antes/depois.
+    carga = np.asarray(carga, dtype=float)
+    fator = np.asarray(fator, dtype=float)
+    n = len(carga)
+    if capacidade is None:
+        capacidade = carga.max()
+    if capacidade < carga.max():
+        raise ValueError("A capacidade precisa ser pelo menos o pico da carga original.")
+
+    # Completa a última janela com horas vazias (sem carga, sem folga)
+    k = -(-n // horas_janela) * horas_janela
+    C = np.zeros(k)
+    F = np.full(k, np.inf)
+    folga_max = np.zeros(k)
+    C[:n], F[:n], folga_max[:n] = carga, fator, capacidade
+    C, F, folga_max = (a.reshape(-1, horas_janela) for a in (C, F, folga_max))
+
+    fixa = C * (1 - participacao_flexivel)
+    flexivel = (C - fixa).sum(axis=1, keepdims=True)
+    folga = folga_max - fixa
+
+    # Mochila fracionária por janela: enche a folga das horas mais limpas
+    ordem = np.argsort(F, axis=1, kind="stable")
+    folga_ord = np.take_along_axis(folga, ordem, axis=1)
+    antes = np.cumsum(folga_ord, axis=1) - folga_ord
+    alocado_ord = np.clip(flexivel - antes, 0, folga_ord)
+
+    alocado = np.empty_like(alocado_ord)
+    np.put_along_axis(alocado, ordem, alocado_ord, axis=1)
+    nova = (fixa + alocado).ravel()[:n]
+
+    emissao_antes = carga * fator
+    emissao_depois = nova * fator
+    return {
+        "carga_original": carga,
+        "carga_deslocada": nova,
+        "fator": fator,
+        "emissao_original_tCO2": emissao_antes.sum(),
+        "emissao_deslocada_tCO2": emissao_depois.sum(),
+        "evitado_tCO2": emissao_antes.sum() - emissao_depois.sum(),
+        "energia_deslocada": 0.5 * np.abs(nova - carga).sum(),
+    }
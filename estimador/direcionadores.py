@@ -0,0 +1,45 @@
+#############################################################
+# Previsão pelos direcionadores.
+#
+# Emissão total = consumo × fator. Em vez de prever a emissão
+# total direto (e depois multiplicar consumo e fator congelados
+# nos cenários), prevemos os dois direcionadores e calculamos a
+# emissão a partir deles. Assim a previsão total e os cenários
+# usam exatamente os mesmos números.
+#
+# - consumo: nível nacional da previsão hierárquica
+#   (previsao_consumo.prever_hierarquia, todas as séries ajustadas
+#   numa única chamada em lote);
+# - fator: fator projetado pela capacidade instalada
+#   (projecao_fatores.projetar_fatores).
+#############################################################
+
+import numpy as np
+
+
+def prever_direcionadores(historico, consumo_previsto, fatores_projetados):
+    # historico: ano | consumo_total_MWh | fator_emissao_tCO2_MWh
+    # Devolve, do primeiro ao último ano projetado:
+    #   ano | consumo_total_MWh | fator_emissao_tCO2_MWh | emissao_total_tCO2 | origem
+    ultimo_ano_hist = int(historico["ano"].max())
+
+    nacional = consumo_previsto.loc[
+        consumo_previsto["nivel"] == "Nacional", ["ano", "consumo_MWh"]
+    ]
+
+    df = fatores_projetados[["ano", "fator_emissao_tCO2_MWh"]].rename(
+        columns={"fator_emissao_tCO2_MWh": "fator_projetado"}
+    )
+    df = df.merge(historico[["ano", "consumo_total_MWh", "fator_emissao_tCO2_MWh"]],
+                  on="ano", how="left")
+    df = df.merge(nacional, on="ano", how="left")
+
+    # Histórico onde existe, previsão no resto
+    df["consumo_total_MWh"] = df["consumo_total_MWh"].fillna(df["consumo_MWh"]).ffill()
+    df["fator_emissao_tCO2_MWh"] = df["fator_emissao_tCO2_MWh"].fillna(df["fator_projetado"]).ffill()
+
+    df["emissao_total_tCO2"] = df["consumo_total_MWh"] * df["fator_emissao_tCO2_MWh"]
+    df["origem"] = np.where(df["ano"] <= ultimo_ano_hist, "histórico", "previsto")
+
+    return df[["ano", "consumo_total_MWh", "fator_emissao_tCO2_MWh",
+               "emissao_total_tCO2", "origem"]].reset_index(drop=True)
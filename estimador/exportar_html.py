@@ -0,0 +1,143 @@
+#############################################################
+# Exportação do gráfico de cenários para um HTML estático.
+#
+# Roda o pipeline uma vez e grava um único arquivo .html com o
+# gráfico do dashboard e os cenários já calculados para uma grade
+# de valores:
+# - menu: participação dos DCs no ano final;
+# - slider: ano final da projeção.
+# Cada passo do slider troca os dados das linhas dos cenários
+# (restyle) e cada opção do menu troca o slider. São controles do
+# próprio Plotly, sem servidor: publicar o arquivo custa só banda
+# de arquivo estático.
+#
+# Uso:
+#   python -m estimador.exportar_html [saida.html] [--cdn]
+# --cdn: não embute o plotly.js (arquivo ~5 MB menor, precisa de internet)
+#############################################################
+
+import sys
+import time
+
+import numpy as np
+
+from estimador.cenarios import MULTIPLICADORES, calcular_cenarios
+from estimador.grafico_cenarios import figura_cenarios
+from estimador.pipeline import executar
+
+
+SAIDA_PADRAO = "dashboard_cenarios.html"
+
+# Participação no ano final (%) oferecida no menu
+PARTICIPACOES = [1.0, 2.0, 3.0, 3.6, 5.0, 7.5, 10.0, 15.0, 20.0]
+PARTICIPACAO_INICIAL = 3.6
+ANO_FIM_INICIAL = 2030
+
+
+def _valores(serie, casas=1):
+    # Arredonda para deixar o JSON do HTML menor
+    return np.round(serie.to_numpy(dtype=float), casas).tolist()
+
+
+def dados_cenarios(direcionadores, ano_inicio, ultimo_ano_hist, ano_fim, participacao_percentual):
+    # x/y das 6 linhas de cenário (emissão e consumo × 3 cenários),
+    # ligadas ao último ponto histórico, como no dashboard
+    previsao = direcionadores[direcionadores["ano"].between(ano_inicio, ano_fim)]
+    df_plot = calcular_cenarios(previsao, ano_inicio, ano_fim, participacao_percentual / 100)
+
+    xs, ys = [], []
+    for cenario in MULTIPLICADORES:
+        df_c = df_plot[(df_plot["cenario"] == cenario) & (df_plot["ano"] >= ultimo_ano_hist)]
+        for coluna in ["emissao_DC_tCO2", "consumo_DC_MWh"]:
+            xs.append(df_c["ano"].astype(int).tolist())
+            ys.append(_valores(df_c[coluna]))
+    return xs, ys
+
+
+def montar_figura(direcionadores, ano_inicio, ultimo_ano_hist,
+                  participacoes=PARTICIPACOES, anos_fim=None,
+                  participacao_inicial=PARTICIPACAO_INICIAL, ano_fim_inicial=ANO_FIM_INICIAL):
+    ano_max = int(direcionadores["ano"].max())
+    anos_fim = list(range(ultimo_ano_hist, ano_max + 1)) if anos_fim is None else list(anos_fim)
+    ano_fim_inicial = min(max(ano_fim_inicial, anos_fim[0]), anos_fim[-1])
+    i_ano = anos_fim.index(ano_fim_inicial)
+
+    # Grade inteira: participação × ano final
+    grade = {
+        (p, a): dados_cenarios(direcionadores, ano_inicio, ultimo_ano_hist, a, p)
+        for p in participacoes for a in anos_fim
+    }
+
+    # Figura do dashboard com os valores iniciais; as linhas de cenário
+    # (índices 2..7) são as que o slider e o menu trocam
+    previsao = direcionadores[direcionadores["ano"].between(ano_inicio, ano_fim_inicial)]
+    fig = figura_cenarios(
+        calcular_cenarios(previsao, ano_inicio, ano_fim_inicial, participacao_inicial / 100),
+        ultimo_ano_hist
+    )
+    k = 2 * len(MULTIPLICADORES)
+    indices_cenarios = list(range(2, 2 + k))
+
+    # Um slider de ano final para cada participação
+    def slider(p, ativo):
+        return dict(
+            active=ativo,
+            currentvalue=dict(prefix=f"Participação {p:g}% · ano final: "),
+            pad=dict(t=40),
+            steps=[
+                dict(
+                    method="restyle",
+                    label=str(a),
+                    args=[{"x": grade[(p, a)][0], "y": grade[(p, a)][1]}, indices_cenarios],
+                )
+                for a in anos_fim
+            ],
+        )
+
+    # Menu de participação: troca os dados e o slider (ano final volta ao inicial)
+    botoes = []
+    for p in participacoes:
+        xs, ys = grade[(p, ano_fim_inicial)]
+        botoes.append(dict(
+            method="update",
+            label=f"{p:g}%",
+            args=[{"x": xs, "y": ys}, {"sliders": [slider(p, i_ano)]}, indices_cenarios],
+        ))
+
+    fig.update_xaxes(range=[ano_inicio - 0.5, anos_fim[-1] + 0.5])
+    fig.update_layout(
+        sliders=[slider(participacao_inicial, i_ano)],
+        updatemenus=[dict(
+            buttons=botoes,
+            active=participacoes.index(participacao_inicial),
+            direction="down",
+            x=0.0, xanchor="left", y=1.25, yanchor="top",
+        )],
+        annotations=[dict(
+            text="Participação dos DCs no ano final:", showarrow=False,
+            x=0.0, xref="paper", y=1.32, yref="paper", xanchor="left"
+        )],
+        margin=dict(t=160),
+        height=700,
+    )
+    return fig
+
+
+def exportar(saida=SAIDA_PADRAO, plotlyjs=True, **kwargs):
+    inicio = time.perf_counter()
+    resultado = executar()
+    fig = montar_figura(
+        resultado["direcionadores"], resultado["ano_inicio"], resultado["ultimo_ano_hist"], **kwargs
+    )
+    fig.write_html(saida, include_plotlyjs=plotlyjs, full_html=True,
+                   config={"responsive": True})
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    plotlyjs = "cdn" if "--cdn" in args else True
+    args = [a for a in args if a != "--cdn"]
+    saida = args[0] if args else SAIDA_PADRAO
+    duracao = exportar(saida, plotlyjs)
+    print(f"{saida} gravado em {duracao:.1f} s")
@@ -0,0 +1,169 @@
+#############################################################
+# Exportação da tabela de cenários (CSV, Parquet, Excel).
+#
+# Os dados chegam como uma sequência de blocos (DataFrames) e cada
+# bloco é escrito assim que fica pronto:
+# - CSV: cabeçalho uma vez, depois um to_csv por bloco;
+# - Parquet: um row group por bloco (pyarrow, se estiver instalado);
+# - Excel: planilha em modo write_only do openpyxl (linhas vão
+#   direto para o arquivo, sem montar a planilha na memória). Uma aba
+#   do Excel tem no máximo 1.048.576 linhas: passando disso, o resto
+#   continua em abas novas (cenarios_2, cenarios_3...), cada uma com
+#   o cabeçalho.
+#
+# Para a varredura de parâmetros (grade de ano final × participação)
+# os blocos vêm de um gerador: um cenário calculado por vez, sem
+# juntar a varredura inteira num DataFrame só.
+#
+# Uso pela linha de comando (varredura direto para um arquivo):
+#   python -m estimador.exportar_resultados varredura.csv
+#############################################################
+
+import io
+import sys
+import tempfile
+
+import numpy as np
+
+from estimador.cenarios import MULTIPLICADORES, calcular_cenarios
+
+
+# formato → (extensão, MIME)
+FORMATOS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+COLUNAS = [
+    "cenario", "ano", "origem", "participacao_DC", "consumo_DC_MWh", "emissao_DC_tCO2",
+    "consumo_total_MWh", "fator_emissao_tCO2_MWh", "emissao_total_tCO2",
+]
+
+LIMITE_LINHAS_EXCEL = 1_048_576  # por aba, contando o cabeçalho
+
+
+def parquet_disponivel():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def formatos_disponiveis():
+    return [f for f in FORMATOS if f != "Parquet" or parquet_disponivel()]
+
+
+def _csv(blocos, arquivo):
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8", newline="")
+    cabecalho = True
+    for bloco in blocos:
+        bloco.to_csv(texto, index=False, header=cabecalho)
+        cabecalho = False
+    texto.flush()
+    texto.detach()  # devolve o arquivo binário sem fechar
+
+
+def _parquet(blocos, arquivo):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    escritor = None
+    for bloco in blocos:
+        tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+        if escritor is None:
+            escritor = pq.ParquetWriter(arquivo, tabela.schema)
+        escritor.write_table(tabela)
+    if escritor is not None:
+        escritor.close()
+
+
+def _excel(blocos, arquivo, linhas_por_aba=LIMITE_LINHAS_EXCEL):
+    from openpyxl import Workbook
+
+    livro = Workbook(write_only=True)
+    planilha = livro.create_sheet("cenarios")
+    colunas, linhas = None, 0
+    for bloco in blocos:
+        if colunas is None:
+            colunas = list(bloco.columns)
+            planilha.append(colunas)
+            linhas = 1
+        # astype(object): numpy → tipos do Python, que o openpyxl sabe gravar
+        for linha in bloco.astype(object).to_numpy().tolist():
+            if linhas == linhas_por_aba:
+                # Aba cheia: continua numa nova, com o cabeçalho de novo
+                planilha = livro.create_sheet(f"cenarios_{len(livro.worksheets) + 1}")
+                planilha.append(colunas)
+                linhas = 1
+            planilha.append(linha)
+            linhas += 1
+    livro.save(arquivo)
+
+
+_ESCRITORES = {"CSV": _csv, "Parquet": _parquet, "Excel": _excel}
+
+
+def escrever(blocos, arquivo, formato="CSV"):
+    # blocos: iterável de DataFrames com as mesmas colunas.
+    # arquivo: caminho ou arquivo binário aberto para escrita.
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato desconhecido: {formato}. Use um de {list(FORMATOS)}.")
+    if formato == "Parquet" and not parquet_disponivel():
+        raise ValueError("Exportar em Parquet precisa do pacote pyarrow.")
+
+    if isinstance(arquivo, str):
+        with open(arquivo, "wb") as f:
+            _ESCRITORES[formato](blocos, f)
+    else:
+        _ESCRITORES[formato](blocos, arquivo)
+
+
+def arquivo_temporario(blocos, formato="CSV"):
+    # Escreve num arquivo temporário em disco e devolve o arquivo aberto,
+    # já no início. O arquivo some quando é fechado.
+    arquivo = tempfile.TemporaryFile()
+    escrever(blocos, arquivo, formato)
+    arquivo.seek(0)
+    return arquivo
+
+
+def tabela_cenarios(df_plot):
+    # Tabela completa dos cenários (todas as colunas, todos os cenários)
+    return df_plot[[c for c in COLUNAS if c in df_plot.columns]]
+
+
+def linhas_varredura(direcionadores, ano_inicio, anos_fim, participacoes):
+    # Nº de linhas que varredura() vai gerar, sem calcular os cenários
+    anos = direcionadores["ano"].to_numpy()
+    por_ano_fim = sum(int(((anos >= ano_inicio) & (anos <= ano_fim)).sum()) for ano_fim in anos_fim)
+    return por_ano_fim * len(participacoes) * len(MULTIPLICADORES)
+
+
+def varredura(direcionadores, ano_inicio, anos_fim, participacoes):
+    # Gerador: um bloco por (ano final, participação no ano final),
+    # com os parâmetros da combinação como colunas
+    for ano_fim in anos_fim:
+        previsao = direcionadores[direcionadores["ano"].between(ano_inicio, ano_fim)]
+        for participacao in participacoes:
+            bloco = tabela_cenarios(calcular_cenarios(previsao, ano_inicio, ano_fim, participacao))
+            bloco.insert(0, "participacao_final", participacao)
+            bloco.insert(0, "ano_fim", ano_fim)
+            yield bloco
+
+
+if __name__ == "__main__":
+    # Varredura padrão: ano final 2025–2050 × participação 1%–20%
+    from estimador.pipeline import executar
+
+    saida = sys.argv[1] if len(sys.argv) > 1 else "varredura_cenarios.csv"
+    formato = {"csv": "CSV", "parquet": "Parquet", "xlsx": "Excel"}[saida.rsplit(".", 1)[-1]]
+
+    resultado = executar()
+    blocos = varredura(
+        resultado["direcionadores"], resultado["ano_inicio"],
+        range(2025, 2051), np.round(np.arange(0.01, 0.2001, 0.01), 4)
+    )
+    escrever(blocos, saida, formato)
+    print(f"{saida} gravado")
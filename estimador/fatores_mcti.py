@@ -0,0 +1,189 @@
+#############################################################
+# Tabelas de fatores de emissão do MCTI num formato único.
+#
+# Lê uma vez as duas planilhas publicadas pelo MCTI:
+# - FE_simplesajustado_2024_web.xlsx: fator da margem de operação
+#   (método simples ajustado) e energia despachada no SIN, por ano;
+# - tabelas de emissões do MCTI Inventario_2025_janset.xlsx: fator
+#   médio mensal e anual do SIN (um bloco por ano).
+#
+# O resultado vira arrays tipados e indexados por tempo, salvos em
+# .npz numa pasta de cache. O nome do arquivo leva o hash das duas
+# planilhas: se nenhuma mudou, carregamos o .npz direto (sem abrir
+# Excel); se alguma mudou, o nome muda e a leitura é refeita.
+#
+# Consultas: fatores_mensais / fatores_anuais (DataFrames) e
+# fator_no_tempo (valor do mês de cada instante, vetorizado).
+#############################################################
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from estimador.arquivos import hash_arquivo
+
+
+ARQUIVO_FE = "input/FE_simplesajustado_2024_web.xlsx"
+ARQUIVO_INVENTARIO = "input/tabelas de emissões do MCTI Inventario_2025_janset.xlsx"
+PASTA_PADRAO = "cache/fatores"
+
+
+#############################################################
+# Leitura das planilhas (só na ingestão)
+#############################################################
+
+def ler_fe_simples_ajustado(path=ARQUIVO_FE):
+    # Colunas B/C: ano e fator; G/H: ano e energia despachada.
+    # Anos com * foram revisados (ver notas no pé da planilha).
+    bruto = pd.read_excel(path, header=None)
+
+    ano_texto = bruto[1].astype(str).str.strip()
+    revisado = ano_texto.str.startswith("*")
+    ano = pd.to_numeric(ano_texto.str.lstrip("*"), errors="coerce")
+    linhas = ano.notna() & pd.to_numeric(bruto[2], errors="coerce").notna()
+
+    fator = pd.DataFrame({
+        "ano": ano[linhas].astype(int),
+        "margem_operacao_tCO2_MWh": pd.to_numeric(bruto.loc[linhas, 2]),
+        "revisado": revisado[linhas],
+    })
+    energia = pd.DataFrame({
+        "ano": pd.to_numeric(bruto[6], errors="coerce"),
+        "energia_despachada_MWh": pd.to_numeric(bruto[7], errors="coerce"),
+    }).dropna().astype({"ano": int})
+
+    return fator.merge(energia, on="ano", how="left").reset_index(drop=True)
+
+
+def ler_inventario(path=ARQUIVO_INVENTARIO):
+    # Blocos de 5 linhas: ano na coluna A; uma linha abaixo, o fator
+    # anual na coluna O; duas linhas abaixo, os 12 fatores mensais (C..N).
+    bruto = pd.read_excel(path, header=None)
+    ano = pd.to_numeric(bruto[0], errors="coerce")
+
+    mensal, anual = [], []
+    for i in np.flatnonzero(ano.notna().to_numpy()):
+        a = int(ano[i])
+        valores = pd.to_numeric(bruto.iloc[i + 2, 2:14], errors="coerce").to_numpy(dtype=float)
+        for mes, valor in enumerate(valores, start=1):
+            if not np.isnan(valor):
+                mensal.append((a, mes, valor))
+        valor_ano = pd.to_numeric(bruto.iloc[i + 1, 14], errors="coerce")
+        anual.append((a, valor_ano))
+
+    mensal = pd.DataFrame(mensal, columns=["ano", "mes", "fator_emissao_tCO2_MWh"])
+    anual = pd.DataFrame(anual, columns=["ano", "fator_medio_tCO2_MWh"])
+    return mensal, anual
+
+
+#############################################################
+# Armazenamento (.npz) e cache por hash
+#############################################################
+
+def _arquivo_cache(pasta, arquivo_fe, arquivo_inventario):
+    versao = hash_arquivo(arquivo_fe)[:12] + "_" + hash_arquivo(arquivo_inventario)[:12]
+    return os.path.join(pasta, f"fatores_{versao}.npz")
+
+
+def ingerir(arquivo_fe=ARQUIVO_FE, arquivo_inventario=ARQUIVO_INVENTARIO, pasta=PASTA_PADRAO):
+    # Lê as planilhas e grava o .npz. Devolve o caminho gravado.
+    fe = ler_fe_simples_ajustado(arquivo_fe)
+    mensal, anual = ler_inventario(arquivo_inventario)
+
+    # Um eixo de anos comum às tabelas anuais (NaN onde não há valor)
+    anos = np.arange(min(fe["ano"].min(), anual["ano"].min()),
+                     max(fe["ano"].max(), anual["ano"].max()) + 1)
+    fe = fe.set_index("ano").reindex(anos)
+    anual = anual.set_index("ano").reindex(anos)
+
+    periodo = (pd.to_datetime(dict(year=mensal["ano"], month=mensal["mes"], day=1))
+               .to_numpy().astype("datetime64[M]"))
+    ordem = np.argsort(periodo)
+
+    os.makedirs(pasta, exist_ok=True)
+    destino = _arquivo_cache(pasta, arquivo_fe, arquivo_inventario)
+    # Temporário + troca: um .npz pela metade nunca fica com o nome final
+    with open(destino + ".tmp", "wb") as f:
+        np.savez(
+            f,
+            ano=anos.astype(np.int16),
+            fator_medio_anual=anual["fator_medio_tCO2_MWh"].to_numpy(dtype=np.float32),
+            margem_operacao=fe["margem_operacao_tCO2_MWh"].to_numpy(dtype=np.float32),
+            margem_revisada=fe["revisado"].fillna(False).to_numpy(dtype=bool),
+            energia_despachada=fe["energia_despachada_MWh"].to_numpy(dtype=np.float64),
+            mes=periodo[ordem],
+            fator_mensal=mensal["fator_emissao_tCO2_MWh"].to_numpy(dtype=np.float32)[ordem],
+        )
+    os.replace(destino + ".tmp", destino)
+
+    # As versões anteriores (outro hash) não servem mais
+    for nome in os.listdir(pasta):
+        antigo = os.path.join(pasta, nome)
+        if nome.startswith("fatores_") and nome.endswith(".npz") and antigo != destino:
+            try:
+                os.remove(antigo)
+            except OSError:
+                pass  # já apagado por outra sessão, ou aberto (Windows)
+    return destino
+
+
+def carregar(arquivo_fe=ARQUIVO_FE, arquivo_inventario=ARQUIVO_INVENTARIO, pasta=PASTA_PADRAO):
+    # Dict de arrays. Só abre as planilhas se o .npz desta versão não existir.
+    destino = _arquivo_cache(pasta, arquivo_fe, arquivo_inventario)
+    if not os.path.exists(destino):
+        destino = ingerir(arquivo_fe, arquivo_inventario, pasta)
+    with np.load(destino) as npz:
+        return {chave: npz[chave] for chave in npz.files}
+
+
+#############################################################
+# Consultas
+#############################################################
+
+def fatores_mensais(fatores, inicio=None, fim=None):
+    # DataFrame ano, mes, fator_emissao_tCO2_MWh (inicio/fim inclusivos)
+    mes = fatores["mes"]
+    i = 0 if inicio is None else np.searchsorted(mes, np.datetime64(pd.Timestamp(inicio), "M"), "left")
+    j = len(mes) if fim is None else np.searchsorted(mes, np.datetime64(pd.Timestamp(fim), "M"), "right")
+    periodo = pd.DatetimeIndex(mes[i:j])
+    return pd.DataFrame({
+        "ano": periodo.year,
+        "mes": periodo.month,
+        "fator_emissao_tCO2_MWh": fatores["fator_mensal"][i:j],
+    })
+
+
+def fatores_anuais(fatores, ano_inicio=None, ano_fim=None):
+    # DataFrame por ano com o fator médio (Inventário), a margem de
+    # operação (simples ajustado) e a energia despachada no SIN
+    df = pd.DataFrame({
+        "ano": fatores["ano"].astype(int),
+        "fator_medio_tCO2_MWh": fatores["fator_medio_anual"],
+        "margem_operacao_tCO2_MWh": fatores["margem_operacao"],
+        "margem_revisada": fatores["margem_revisada"],
+        "energia_despachada_MWh": fatores["energia_despachada"],
+    })
+    ano_inicio = df["ano"].min() if ano_inicio is None else ano_inicio
+    ano_fim = df["ano"].max() if ano_fim is None else ano_fim
+    return df[df["ano"].between(ano_inicio, ano_fim)].reset_index(drop=True)
+
+
+def fator_no_tempo(fatores, tempo):
+    # Fator médio mensal de cada instante (busca binária por mês).
+    # Meses fora da tabela → NaN.
+    alvo = np.asarray(pd.DatetimeIndex(tempo).to_numpy().astype("datetime64[M]"))
+    mes = fatores["mes"]
+    pos = np.clip(np.searchsorted(mes, alvo), 0, len(mes) - 1)
+    valores = fatores["fator_mensal"][pos].astype(float)
+    valores[mes[pos] != alvo] = np.nan
+    return valores
+
+
+if __name__ == "__main__":
+    # Uso: python -m estimador.fatores_mcti [pasta]
+    pasta = sys.argv[1] if len(sys.argv) > 1 else PASTA_PADRAO
+    destino = ingerir(pasta=pasta)
+    fatores = carregar(pasta=pasta)
+    print(f"{destino}: {len(fatores['mes'])} meses, anos {fatores['ano'][0]}–{fatores['ano'][-1]}")
@@ -0,0 +1,90 @@
+#############################################################
+# Gráfico de histórico + cenários (seção 8 do dashboard).
+#
+# figura_cenarios monta a figura inteira de uma vez: as 8 linhas
+# (histórico e 3 cenários, cada um com emissão e consumo), com os
+# dados em arrays NumPy compactos (int16 para os anos, float32 para
+# os valores). O Plotly manda esses arrays como binário em base64,
+# e o JSON enviado ao navegador fica menor do que com listas.
+#
+# Ligar/desligar emissão ou consumo não precisa refazer nada:
+# com_visibilidade só copia a figura e muda o "visible" das linhas.
+#############################################################
+
+import numpy as np
+import plotly.graph_objects as go
+
+from estimador.cenarios import CORES, MULTIPLICADORES
+
+
+def layout_cenarios():
+    # Eixo de emissões à esquerda, consumo à direita
+    return go.Layout(
+        template="plotly_white",
+        hovermode="x unified",
+        xaxis=dict(title="Ano", tickmode="linear", dtick=1),
+        yaxis=dict(title="Emissões (tCO₂)", showgrid=True, zeroline=True),
+        yaxis2=dict(title="Consumo (MWh)", overlaying="y", side="right", showgrid=False),
+        legend=dict(orientation="h", yanchor="bottom", y=1.06, xanchor="center", x=0.5),
+        font=dict(size=14),
+        title="Histórico vs Cenários – Emissões e Consumo dos Data Centers"
+    ).to_plotly_json()
+
+
+def _compacto(valores):
+    return np.asarray(valores, dtype=np.float32)
+
+
+def figura_cenarios(df_plot, ultimo_ano_hist):
+    # df_plot: uma linha por (cenário, ano), como sai de cenarios.calcular_cenarios
+    fig = go.Figure(layout=layout_cenarios())
+
+    ano = df_plot["ano"].to_numpy()
+    cenario = df_plot["cenario"].to_numpy()
+    emissao = df_plot["emissao_DC_tCO2"].to_numpy()
+    consumo = df_plot["consumo_DC_MWh"].to_numpy()
+
+    # 1) HISTÓRICO – até o último ano real todos os cenários são iguais,
+    # então usamos o primeiro
+    hist = (cenario == next(iter(MULTIPLICADORES))) & (ano <= ultimo_ano_hist)
+    anos_hist = ano[hist].astype(np.int16)
+
+    fig.add_trace(go.Scatter(
+        x=anos_hist, y=_compacto(emissao[hist]),
+        mode="lines+markers", name="Histórico – Emissões",
+        line=dict(color="#FFA500", width=4), marker=dict(color="#FFA500"),
+        yaxis="y"
+    ))
+    fig.add_trace(go.Scatter(
+        x=anos_hist, y=_compacto(consumo[hist]),
+        mode="lines+markers", name="Histórico – Consumo",
+        line=dict(color="#00CED1", width=4, dash="dot"), marker=dict(color="#00CED1"),
+        yaxis="y2"
+    ))
+
+    # 2) CENÁRIOS – ligados ao último ponto histórico
+    for nome in MULTIPLICADORES:
+        futuro = (cenario == nome) & (ano > ultimo_ano_hist)
+        x = np.concatenate([anos_hist[-1:], ano[futuro].astype(np.int16)])
+
+        fig.add_trace(go.Scatter(
+            x=x, y=_compacto(np.concatenate([emissao[hist][-1:], emissao[futuro]])),
+            mode="lines+markers", name=f"Emissões – {nome}",
+            line=dict(color=CORES[nome], width=3), yaxis="y"
+        ))
+        fig.add_trace(go.Scatter(
+            x=x, y=_compacto(np.concatenate([consumo[hist][-1:], consumo[futuro]])),
+            mode="lines+markers", name=f"Consumo – {nome}",
+            line=dict(color=CORES[nome], width=2, dash="dot"), yaxis="y2"
+        ))
+
+    return fig
+
+
+def com_visibilidade(fig, show_emissao=True, show_consumo=True):
+    # Cópia da figura com as linhas de emissão (eixo y) e consumo (y2)
+    # ligadas ou desligadas. A figura original não é alterada.
+    nova = go.Figure(fig)
+    nova.update_traces(visible=show_emissao, selector=dict(yaxis="y"))
+    nova.update_traces(visible=show_consumo, selector=dict(yaxis="y2"))
+    return nova
@@ -0,0 +1,160 @@
+#############################################################
+# Gráfico de cenários calculado no navegador.
+#
+# No Streamlit, mexer no ano final ou na participação reroda o
+# script inteiro no servidor. Mas a conta dos cenários é só
+# interpolação × consumo × fator. Aqui mandamos uma vez os arrays
+# base (anos, consumo total, fator, âncoras da curva suave) num
+# HTML com plotly.js, e um JavaScript pequeno refaz as linhas a
+# cada mudança nos controles, sem falar com o servidor.
+#
+# O JavaScript repete a regra de estimador/cenarios.py; as
+# constantes vêm de lá, para as duas versões não se separarem.
+#############################################################
+
+import json
+
+from plotly.offline import get_plotlyjs
+
+from estimador.cenarios import (
+    ANO_REFERENCIA, CORES, MULTIPLICADORES, PARTICIPACAO_INICIAL, PARTICIPACAO_REFERENCIA
+)
+from estimador.grafico_cenarios import layout_cenarios
+
+
+PLOTLY_CDN = "https://cdn.plot.ly/plotly-2.35.2.min.js"
+
+
+def dados_base(direcionadores, ano_inicio, ultimo_ano_hist):
+    # Só o que o navegador precisa: anos, consumo e fator (histórico + previsão)
+    df = direcionadores[direcionadores["ano"] >= ano_inicio]
+    return {
+        "anos": df["ano"].astype(int).tolist(),
+        "consumo": df["consumo_total_MWh"].to_numpy(dtype=float).tolist(),
+        "fator": df["fator_emissao_tCO2_MWh"].to_numpy(dtype=float).tolist(),
+        "ano_inicio": int(ano_inicio),
+        "ultimo_ano_hist": int(ultimo_ano_hist),
+        "participacao_inicial": PARTICIPACAO_INICIAL,
+        "ano_referencia": ANO_REFERENCIA,
+        "participacao_referencia": PARTICIPACAO_REFERENCIA,
+        "multiplicadores": MULTIPLICADORES,
+        "cores": CORES,
+        "layout": layout_cenarios(),
+    }
+
+
+_HTML = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8">__PLOTLY__</head>
+<body style="margin:0;font-family:sans-serif">
+<div style="display:flex;gap:24px;align-items:center;flex-wrap:wrap;padding:4px 8px">
+  <label>Ano final da projeção:
+    <input type="range" id="ano_fim" step="1"> <b id="ano_fim_txt"></b></label>
+  <label>Participação dos DCs no ano final (% do consumo):
+    <input type="number" id="participacao" min="0" max="100" step="0.1" style="width:6em"></label>
+  <label><input type="checkbox" id="show_emissao"> Emissões (tCO₂)</label>
+  <label><input type="checkbox" id="show_consumo"> Consumo (MWh)</label>
+</div>
+<div id="grafico" style="height:__ALTURA__px"></div>
+<script>
+const BASE = __DADOS__;
+const INICIAL = __INICIAL__;
+
+// np.interp: fora do intervalo fica no valor da ponta
+function interp(x, xp, fp) {
+  if (x <= xp[0]) return fp[0];
+  if (x >= xp[xp.length - 1]) return fp[fp.length - 1];
+  for (let i = 0; i < xp.length - 1; i++) {
+    if (x >= xp[i] && x < xp[i + 1]) {
+      return fp[i] + (fp[i + 1] - fp[i]) * (x - xp[i]) / (xp[i + 1] - xp[i]);
+    }
+  }
+  return fp[fp.length - 1];
+}
+
+function cenario(alvo, anoFim) {
+  const xp = [BASE.ano_inicio, BASE.ano_referencia, anoFim];
+  const fp = [BASE.participacao_inicial, BASE.participacao_referencia, alvo];
+  const anos = [], consumo = [], emissao = [];
+  BASE.anos.forEach(function (ano, i) {
+    if (ano > anoFim) return;
+    const c = BASE.consumo[i] * interp(ano, xp, fp);
+    anos.push(ano); consumo.push(c); emissao.push(c * BASE.fator[i]);
+  });
+  return {anos: anos, consumo: consumo, emissao: emissao};
+}
+
+function desenhar() {
+  const anoFim = Number(document.getElementById("ano_fim").value);
+  const participacao = Number(document.getElementById("participacao").value) / 100;
+  const showEmissao = document.getElementById("show_emissao").checked;
+  const showConsumo = document.getElementById("show_consumo").checked;
+  document.getElementById("ano_fim_txt").textContent = anoFim;
+
+  const ultimo = BASE.ultimo_ano_hist;
+  const traces = [];
+
+  // Histórico: igual em todos os cenários até o último ano real
+  const base = cenario(participacao, anoFim);
+  const nHist = base.anos.filter(function (a) { return a <= ultimo; }).length;
+  if (showEmissao) traces.push({x: base.anos.slice(0, nHist), y: base.emissao.slice(0, nHist),
+    mode: "lines+markers", name: "Histórico – Emissões", yaxis: "y",
+    line: {color: "#FFA500", width: 4}, marker: {color: "#FFA500"}});
+  if (showConsumo) traces.push({x: base.anos.slice(0, nHist), y: base.consumo.slice(0, nHist),
+    mode: "lines+markers", name: "Histórico – Consumo", yaxis: "y2",
+    line: {color: "#00CED1", width: 4, dash: "dot"}, marker: {color: "#00CED1"}});
+
+  // Cenários, ligados ao último ponto histórico
+  Object.keys(BASE.multiplicadores).forEach(function (nome) {
+    const alvo = Math.min(1.0, participacao * BASE.multiplicadores[nome]);
+    const c = cenario(alvo, anoFim);
+    const i0 = Math.max(nHist - 1, 0);
+    if (showEmissao) traces.push({x: c.anos.slice(i0), y: c.emissao.slice(i0),
+      mode: "lines+markers", name: "Emissões – " + nome, yaxis: "y",
+      line: {color: BASE.cores[nome], width: 3}});
+    if (showConsumo) traces.push({x: c.anos.slice(i0), y: c.consumo.slice(i0),
+      mode: "lines+markers", name: "Consumo – " + nome, yaxis: "y2",
+      line: {color: BASE.cores[nome], width: 2, dash: "dot"}});
+  });
+
+  Plotly.react("grafico", traces, BASE.layout, {responsive: true});
+}
+
+const anoFimInput = document.getElementById("ano_fim");
+anoFimInput.min = BASE.ultimo_ano_hist;
+anoFimInput.max = BASE.anos[BASE.anos.length - 1];
+anoFimInput.value = INICIAL.ano_fim;
+document.getElementById("participacao").value = INICIAL.participacao_percentual;
+document.getElementById("show_emissao").checked = INICIAL.show_emissao;
+document.getElementById("show_consumo").checked = INICIAL.show_consumo;
+
+["ano_fim", "participacao", "show_emissao", "show_consumo"].forEach(function (id) {
+  document.getElementById(id).addEventListener("input", desenhar);
+});
+desenhar();
+</script>
+</body>
+</html>
+"""
+
+
+def html_interativo(dados, ano_fim=2030, participacao_percentual=3.6,
+                    show_emissao=True, show_consumo=True, altura=600, plotlyjs="cdn"):
+    # HTML completo do gráfico. plotlyjs="cdn" carrega o plotly.js da
+    # internet; "inline" embute a biblioteca (arquivo maior, funciona offline).
+    if plotlyjs == "inline":
+        script = "<script>" + get_plotlyjs() + "</script>"
+    else:
+        script = f'<script src="{PLOTLY_CDN}"></script>'
+
+    inicial = {
+        "ano_fim": int(ano_fim),
+        "participacao_percentual": float(participacao_percentual),
+        "show_emissao": bool(show_emissao),
+        "show_consumo": bool(show_consumo),
+    }
+    return (_HTML
+            .replace("__PLOTLY__", script)
+            .replace("__ALTURA__", str(int(altura)))
+            .replace("__DADOS__", json.dumps(dados, ensure_ascii=False))
+            .replace("__INICIAL__", json.dumps(inicial)))
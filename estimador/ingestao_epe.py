@@ -0,0 +1,228 @@
+#############################################################
+# Ingestão em blocos dos dados abertos de consumo da EPE.
+#
+# O arquivo da EPE vem por mês, UF, classe de consumo etc. e
+# cresce todo mês. Em vez de carregar tudo na memória, lemos o
+# arquivo em blocos de linhas e vamos somando num agregado por
+# (ano, mês, UF, classe). A memória fica limitada pelo tamanho do
+# bloco + número de combinações, não pelo tamanho do arquivo.
+#
+# O agregado fica salvo em disco junto com um manifesto, e cada linha
+# guarda de qual arquivo veio. Por arquivo, o manifesto guarda o hash,
+# o último mês processado e um resumo de cada mês (soma e nº de
+# linhas). Na atualização:
+# - arquivo com o mesmo hash → nem é lido;
+# - arquivo alterado → só os meses depois do último processado são
+#   agregados; os anteriores só entram no resumo, para conferir se
+#   a EPE revisou algum. Se o resumo de um mês antigo mudou, sai tudo
+#   o que o arquivo tinha posto no agregado e ele é somado de novo;
+# - arquivo novo → só entram as combinações (ano, mês, UF, classe)
+#   que nenhum outro arquivo já trouxe. Assim dois arquivos por UF
+#   dos mesmos meses se somam, e um arquivo que repete meses de
+#   outro não conta o consumo duas vezes.
+#############################################################
+
+import json
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from estimador.arquivos import hash_arquivo
+
+
+DESTINO_PADRAO = "input/consumo_epe_agregado.csv"
+
+CHAVES = ["ano", "mes", "uf", "classe"]
+
+# Nomes de coluna que já apareceram nas publicações da EPE
+COLUNAS = {
+    "data": ["Data", "DataExcel", "data", "DATA"],
+    "uf": ["SiglaUF", "Sigla_UF", "UF", "uf"],
+    "classe": ["Classe", "classe", "CLASSE"],
+    "consumo": ["Consumo", "consumo", "CONSUMO"],
+}
+
+
+def ler_em_blocos(path, tamanho_bloco=100_000, aba=0):
+    # Gera DataFrames de até tamanho_bloco linhas, sem abrir o
+    # arquivo inteiro de uma vez.
+    if path.lower().endswith(".csv"):
+        with open(path, encoding="utf-8-sig") as f:
+            sep = ";" if ";" in f.readline() else ","
+        yield from pd.read_csv(path, sep=sep, dtype=str, chunksize=tamanho_bloco,
+                               encoding="utf-8-sig")
+        return
+
+    # Excel: modo read_only do openpyxl percorre as linhas em streaming
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[aba] if isinstance(aba, int) else wb[aba]
+        linhas = ws.iter_rows(values_only=True)
+        cabecalho = [str(c).strip() if c is not None else "" for c in next(linhas)]
+        bloco = []
+        for linha in linhas:
+            bloco.append(linha)
+            if len(bloco) == tamanho_bloco:
+                yield pd.DataFrame(bloco, columns=cabecalho)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=cabecalho)
+    finally:
+        wb.close()
+
+
+def padronizar(bloco):
+    # Bloco cru → colunas ano, mes, uf, classe, consumo_MWh
+    achadas = {}
+    for nome, candidatas in COLUNAS.items():
+        achadas[nome] = next((c for c in candidatas if c in bloco.columns), None)
+    if achadas["data"] is None or achadas["consumo"] is None:
+        raise ValueError(f"Colunas de data/consumo não encontradas: {list(bloco.columns)}")
+
+    data = bloco[achadas["data"]]
+    if not pd.api.types.is_datetime64_any_dtype(data):
+        # A EPE publica a data como AAAAmmdd (texto ou número)
+        texto = data.astype(str).str.replace(r"\D", "", regex=True).str[:8]
+        data = pd.to_datetime(texto, format="%Y%m%d", errors="coerce")
+
+    consumo = bloco[achadas["consumo"]]
+    if not pd.api.types.is_numeric_dtype(consumo):
+        # Formato brasileiro ("1.234,5"): tira o ponto de milhar e troca a
+        # vírgula decimal. Sem vírgula, o ponto já é o decimal ("1234.5").
+        texto = consumo.astype(str).str.strip()
+        brasileiro = texto.str.contains(",", regex=False)
+        texto = texto.where(~brasileiro, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        numero = pd.to_numeric(texto, errors="coerce")
+        ilegiveis = numero.isna() & consumo.notna() & (texto != "") & (texto.str.lower() != "nan")
+        if ilegiveis.any():
+            warnings.warn(f"{int(ilegiveis.sum())} linha(s) com consumo ilegível descartada(s), "
+                          f"ex.: {texto[ilegiveis].iloc[0]!r}")
+        consumo = numero
+
+    df = pd.DataFrame({
+        "ano": data.dt.year,
+        "mes": data.dt.month,
+        # Arquivos sem UF/classe viram um único balde nacional
+        "uf": bloco[achadas["uf"]].astype(str).str.strip() if achadas["uf"] else "BR",
+        "classe": bloco[achadas["classe"]].astype(str).str.strip() if achadas["classe"] else "Total",
+        "consumo_MWh": pd.to_numeric(consumo, errors="coerce"),
+    })
+    df = df.dropna(subset=["ano", "mes", "consumo_MWh"])
+    df["ano"] = df["ano"].astype(int)
+    df["mes"] = df["mes"].astype(int)
+    return df
+
+
+def agregar_arquivo(path, chaves_conhecidas=None, tamanho_bloco=100_000, aba=0, depois_de=None):
+    # Soma um arquivo bloco a bloco. Combinações (ano, mes, uf, classe)
+    # já conhecidas (MultiIndex) são descartadas antes de agregar; com
+    # depois_de (ano*100 + mes), só entram os meses posteriores.
+    # Devolve (agregado, resumo): resumo é {"AAAAmm": [soma, linhas]} de
+    # todos os meses do arquivo, inclusive os que não foram agregados.
+    acumulado, resumo = None, None
+    for bloco in ler_em_blocos(path, tamanho_bloco, aba):
+        bloco = padronizar(bloco)
+        mes = bloco["ano"] * 100 + bloco["mes"]
+        parcial = bloco.groupby(mes)["consumo_MWh"].agg(["sum", "count"])
+        resumo = parcial if resumo is None else resumo.add(parcial, fill_value=0)
+
+        if depois_de is not None:
+            bloco = bloco[mes > depois_de]
+        if chaves_conhecidas is not None and len(chaves_conhecidas):
+            bloco = bloco[~pd.MultiIndex.from_frame(bloco[CHAVES]).isin(chaves_conhecidas)]
+        if bloco.empty:
+            continue
+        parcial = bloco.groupby(CHAVES)["consumo_MWh"].sum()
+        acumulado = parcial if acumulado is None else acumulado.add(parcial, fill_value=0)
+
+    resumo = {} if resumo is None else {
+        str(m): [float(r["sum"]), int(r["count"])] for m, r in resumo.iterrows()
+    }
+    if acumulado is None:
+        return pd.DataFrame(columns=CHAVES + ["consumo_MWh"]), resumo
+    return acumulado.reset_index(), resumo
+
+
+def _meses_revistos(resumo_antigo, resumo_novo):
+    # Meses já processados cuja soma ou nº de linhas mudou (ou sumiram)
+    return [
+        m for m, (soma, linhas) in resumo_antigo.items()
+        if m not in resumo_novo or resumo_novo[m][1] != linhas
+        or not np.isclose(resumo_novo[m][0], soma, rtol=1e-9, atol=1e-6)
+    ]
+
+
+def atualizar_agregado(arquivos, destino=DESTINO_PADRAO, tamanho_bloco=100_000,
+                       aba=0, reprocessar=False):
+    # Atualiza (ou cria) o agregado em disco e devolve ele inteiro
+    # (ano, mes, uf, classe, consumo_MWh).
+    # reprocessar=True ignora o que já foi feito e refaz tudo.
+    path_manifesto = os.path.splitext(destino)[0] + ".json"
+
+    agregado, manifesto = None, {"arquivos": {}}
+    if os.path.exists(destino) and os.path.exists(path_manifesto) and not reprocessar:
+        agregado = pd.read_csv(destino, dtype={"uf": str, "classe": str, "arquivo": str})
+        with open(path_manifesto, encoding="utf-8") as f:
+            manifesto = json.load(f)
+        if "arquivo" not in agregado.columns:
+            # Agregado de antes da coluna de origem: não dá pra saber o
+            # que veio de cada arquivo, então refaz do zero
+            agregado, manifesto = None, {"arquivos": {}}
+    if agregado is None:
+        agregado = pd.DataFrame(columns=CHAVES + ["consumo_MWh", "arquivo"])
+
+    mudou = False
+    for path in arquivos:
+        versao = hash_arquivo(path)
+        registro = manifesto["arquivos"].get(path)
+        if not isinstance(registro, dict):
+            registro = None  # manifesto antigo (só o hash): refaz o arquivo
+        if registro and registro["hash"] == versao:
+            continue
+
+        novo = None
+        if registro:
+            # Só os meses depois do último processado; os antigos só conferidos
+            novo, resumo = agregar_arquivo(path, pd.MultiIndex.from_frame(agregado[CHAVES]),
+                                           tamanho_bloco, aba, depois_de=registro["ultimo"])
+            if _meses_revistos(registro["meses"], resumo):
+                novo = None
+        if novo is None:
+            # Arquivo novo ou revisão de meses antigos: o que ele tinha
+            # trazido sai e ele é somado de novo por inteiro
+            agregado = agregado[agregado["arquivo"] != path]
+            novo, resumo = agregar_arquivo(path, pd.MultiIndex.from_frame(agregado[CHAVES]),
+                                           tamanho_bloco, aba)
+
+        if not novo.empty:
+            agregado = pd.concat([agregado, novo.assign(arquivo=path)], ignore_index=True)
+        manifesto["arquivos"][path] = {
+            "hash": versao,
+            "ultimo": max(map(int, resumo), default=0),
+            "meses": resumo,
+        }
+        mudou = True
+
+    agregado = agregado.sort_values(CHAVES).reset_index(drop=True)
+    agregado = agregado.astype({"ano": int, "mes": int, "consumo_MWh": float})
+
+    if mudou:
+        # Escreve num temporário e troca, pra nunca deixar um
+        # agregado pela metade se o processo cair no meio.
+        os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+        agregado.to_csv(destino + ".tmp", index=False)
+        os.replace(destino + ".tmp", destino)
+        with open(path_manifesto, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, indent=2)
+
+    return agregado.drop(columns="arquivo")
+
+
+if __name__ == "__main__":
+    # Uso: python -m estimador.ingestao_epe arquivo1.csv [arquivo2.xlsx ...]
+    df = atualizar_agregado(sys.argv[1:] or ["input/Dados_abertos_Consumo_Mensal.xlsx"])
+    print(f"{len(df)} linhas agregadas, {df['ano'].min()}–{df['ano'].max()}")
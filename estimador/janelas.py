@@ -0,0 +1,66 @@
+#############################################################
+# Estatísticas móveis sobre séries horárias.
+#
+# Para cada janela (dia, semana, mês) calculamos, a cada hora:
+# - média do consumo;
+# - pico (máximo) do consumo;
+# - fator de carga = média / pico;
+# - participação renovável = Σ renovável / Σ consumo.
+#
+# Somas móveis vêm de uma soma acumulada calculada uma vez só
+# (S[i + w] - S[i]) e servem para todas as janelas. O máximo móvel
+# usa o algoritmo de van Herk/Gil-Werman: a série é dobrada em
+# blocos do tamanho da janela (reshape, sem laço) e o máximo de
+# cada janela sai de um prefixo e um sufixo acumulados.
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+
+JANELAS = {"Diária": 24, "Semanal": 24 * 7, "Mensal": 24 * 30}
+
+
+def maximo_movel(x, w):
+    # Máximo de cada janela x[i:i + w], para i = 0..n-w, em O(n)
+    n = len(x)
+    if w > n:
+        return np.empty(0, dtype=x.dtype)
+    k = -(-n // w) * w
+    blocos = np.full(k, -np.inf, dtype=float)
+    blocos[:n] = x
+    blocos = blocos.reshape(-1, w)
+
+    prefixo = np.maximum.accumulate(blocos, axis=1).ravel()
+    sufixo = np.maximum.accumulate(blocos[:, ::-1], axis=1)[:, ::-1].ravel()
+    i = np.arange(n - w + 1)
+    return np.maximum(sufixo[i], prefixo[i + w - 1])
+
+
+def estatisticas_moveis(tempo, consumo, renovavel, janelas=JANELAS):
+    # tempo: horas consecutivas; consumo/renovavel: arrays do mesmo tamanho.
+    # Devolve {nome da janela: DataFrame indexado pelo fim da janela}.
+    consumo = np.asarray(consumo, dtype=float)
+    renovavel = np.asarray(renovavel, dtype=float)
+
+    # Uma passada só: somas acumuladas usadas por todas as janelas
+    soma_c = np.concatenate([[0.0], np.cumsum(consumo)])
+    soma_r = np.concatenate([[0.0], np.cumsum(renovavel)])
+
+    resultado = {}
+    for nome, w in janelas.items():
+        if w > len(consumo):
+            continue
+        total_c = soma_c[w:] - soma_c[:-w]
+        total_r = soma_r[w:] - soma_r[:-w]
+        media = total_c / w
+        pico = maximo_movel(consumo, w)
+
+        resultado[nome] = pd.DataFrame({
+            "media": media,
+            "pico": pico,
+            "fator_carga": np.divide(media, pico, out=np.full_like(media, np.nan), where=pico > 0),
+            "participacao_renovavel": np.divide(total_r, total_c, out=np.full_like(media, np.nan),
+                                                where=total_c > 0),
+        }, index=pd.DatetimeIndex(np.asarray(tempo)[w - 1:], name="fim_janela"))
+    return resultado
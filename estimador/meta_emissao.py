@@ -0,0 +1,103 @@
+#############################################################
+# Busca da participação dos DCs que cumpre uma meta de emissões.
+#
+# A participação de cada ano vem de np.interp entre três âncoras, e
+# só a última (o alvo no ano final) é livre. np.interp é linear nos
+# valores das âncoras, então a emissão dos DCs em cada ano é
+#   emissão(ano) = a(ano) + b(ano) × alvo
+# com a = emissão com alvo 0 e b = emissão com alvo 1 menos a.
+# Com a e b de todos os anos em arrays, qualquer meta linear vira
+# uma divisão, sem tentativa e erro:
+# - "ano":       emissão de um ano ≤ meta
+# - "acumulado": soma das emissões num intervalo ≤ meta
+# - "teto":      emissão de todos os anos do intervalo ≤ meta
+# O alvo de cada cenário é participação × multiplicador, então a
+# participação máxima de cada cenário é alvo máximo / multiplicador
+# (limitada a 100%).
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+from estimador.cenarios import MULTIPLICADORES, curva_suave
+
+
+TIPOS = {
+    "ano": "Emissão máxima num ano",
+    "acumulado": "Orçamento acumulado no período",
+    "teto": "Teto em todos os anos do período",
+}
+
+
+def coeficientes(previsao, ano_inicio, ano_fim):
+    # previsao: ano, consumo_total_MWh, fator_emissao_tCO2_MWh.
+    # Devolve anos, a e b tais que emissão = a + b × alvo.
+    anos = previsao["ano"].to_numpy(dtype=float)
+    base = (previsao["consumo_total_MWh"] * previsao["fator_emissao_tCO2_MWh"]).to_numpy(dtype=float)
+    a = base * curva_suave(anos, ano_inicio, ano_fim, 0.0)
+    b = base * curva_suave(anos, ano_inicio, ano_fim, 1.0) - a
+    return anos.astype(int), a, b
+
+
+def restricoes(anos, a, b, tipo, ano_de, ano_ate=None):
+    # Restrições na forma A + B × alvo ≤ meta (uma posição por restrição)
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de meta desconhecido: {tipo}. Use um de {list(TIPOS)}.")
+    ano_ate = ano_de if tipo == "ano" or ano_ate is None else ano_ate
+    dentro = (anos >= ano_de) & (anos <= ano_ate)
+    if not dentro.any():
+        raise ValueError(f"Nenhum ano da projeção entre {ano_de} e {ano_ate}.")
+
+    if tipo == "acumulado":
+        return a[dentro].sum(keepdims=True), b[dentro].sum(keepdims=True)
+    return a[dentro], b[dentro]
+
+
+def alvo_maximo(A, B, meta):
+    # Maior alvo (participação no ano final) com A + B × alvo ≤ meta em
+    # todas as restrições. nan se nem alvo 0 cumpre; inf se até 100% cumpre.
+    folga = meta - A
+    if (folga < 0).any():
+        return np.nan  # a parte fixa da curva já passa da meta
+
+    com_alvo = B > 0
+    if not com_alvo.any():
+        return np.inf
+    limite = float(np.min(folga[com_alvo] / B[com_alvo]))
+    return np.inf if limite >= 1.0 else limite
+
+
+def resolver(direcionadores, ano_inicio, ano_fim, meta, tipo="ano", ano_de=None, ano_ate=None):
+    # Participação máxima no ano final (fração, até 1) de cada cenário
+    # que cumpre a meta (tCO₂). Uma linha por cenário:
+    #   cenario | participacao_final | situacao | emissao_meta_tCO2
+    # emissao_meta_tCO2 é o valor que a meta mede (emissão do ano, soma do
+    # período ou pior ano do período) com essa participação.
+    previsao = direcionadores[direcionadores["ano"].between(ano_inicio, ano_fim)]
+    anos, a, b = coeficientes(previsao, ano_inicio, ano_fim)
+    A, B = restricoes(anos, a, b, tipo, ano_fim if ano_de is None else ano_de, ano_ate)
+
+    alvo = alvo_maximo(A, B, meta)
+    mult = np.array(list(MULTIPLICADORES.values()))
+
+    # Todos os cenários param no mesmo alvo; muda só a participação
+    # informada que leva até ele (alvo = participação × multiplicador).
+    # Participação acima de 100% quer dizer que o cenário cumpre a meta
+    # com qualquer valor: fica em 100%.
+    if np.isnan(alvo):
+        participacao = np.full(mult.shape, np.nan)
+        situacao = np.full(mult.shape, "impossível: a parte fixa da curva já passa da meta", dtype=object)
+    else:
+        participacao = np.minimum(alvo / mult, 1.0)
+        situacao = np.where(alvo / mult >= 1.0, "qualquer participação cumpre", "ok").astype(object)
+
+    # Alvo de cada cenário com a participação encontrada (0 se impossível)
+    alvo_cenario = np.minimum(np.nan_to_num(participacao) * mult, 1.0)
+    emissao = (A[None, :] + B[None, :] * alvo_cenario[:, None]).max(axis=1)
+
+    return pd.DataFrame({
+        "cenario": list(MULTIPLICADORES),
+        "participacao_final": participacao,
+        "situacao": situacao,
+        "emissao_meta_tCO2": emissao,
+    })
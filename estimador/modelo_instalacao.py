@@ -0,0 +1,99 @@
+#############################################################
+# Modelo de consumo de energia de uma instalação (hora a hora).
+#
+# Base: input/Energy_consumption.csv (temperatura, umidade, área,
+# ocupação, uso de HVAC/iluminação, renovável, dia da semana,
+# feriado → EnergyConsumption).
+#
+# - montar_matriz: converte o DataFrame numa matriz de projeto
+#   NumPy (intercepto + numéricas + On/Off + dia da semana em
+#   one-hot) numa única passada, já pré-alocada;
+# - ajustar: regressão linear por mínimos quadrados;
+# - pontuar: calcula o consumo de cenários horários direto dos
+#   arrays (sem montar a matriz), para milhões de linhas.
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+
+COLUNAS_NUMERICAS = ["Temperature", "Humidity", "SquareFootage", "Occupancy", "RenewableEnergy"]
+
+# Colunas texto que viram 0/1
+COLUNAS_BINARIAS = {"HVACUsage": "On", "LightingUsage": "On", "Holiday": "Yes"}
+
+# Segunda-feira é a referência (fica no intercepto)
+DIAS_SEMANA = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+ALVO = "EnergyConsumption"
+
+
+def nomes_colunas():
+    return (["Intercepto"] + COLUNAS_NUMERICAS + list(COLUNAS_BINARIAS)
+            + [f"DayOfWeek={d}" for d in DIAS_SEMANA[1:]])
+
+
+def codificar_dia(dias):
+    # Nome do dia → 0..6 (Monday = 0); desconhecido conta como segunda
+    codigos = pd.Categorical(dias, categories=DIAS_SEMANA).codes.astype(np.int8)
+    return np.maximum(codigos, 0)
+
+
+def montar_matriz(df, dtype=np.float64):
+    # Uma coluna de X por vez, escrevendo direto no array final
+    n = len(df)
+    X = np.zeros((n, len(nomes_colunas())), dtype=dtype)
+    X[:, 0] = 1.0
+
+    j = 1
+    for col in COLUNAS_NUMERICAS:
+        X[:, j] = df[col].to_numpy(dtype=dtype)
+        j += 1
+    for col, positivo in COLUNAS_BINARIAS.items():
+        X[:, j] = df[col].to_numpy() == positivo
+        j += 1
+
+    # One-hot do dia: marca 1 na coluna do dia (segunda não tem coluna)
+    dia = codificar_dia(df["DayOfWeek"])
+    linhas = np.flatnonzero(dia > 0)
+    X[linhas, j + dia[linhas] - 1] = 1.0
+    return X
+
+
+def ajustar(df):
+    # Regressão linear. Devolve um dict com coeficientes e métricas.
+    X = montar_matriz(df)
+    y = df[ALVO].to_numpy(dtype=float)
+
+    coef = np.linalg.lstsq(X, y, rcond=None)[0]
+    residuo = y - X @ coef
+    r2 = 1 - (residuo @ residuo) / ((y - y.mean()) @ (y - y.mean()))
+
+    return {
+        "colunas": nomes_colunas(),
+        "coef": coef,
+        "r2": float(r2),
+        "rmse": float(np.sqrt(np.mean(residuo ** 2))),
+        "n": len(y),
+    }
+
+
+def pontuar(modelo, cenarios, dtype=np.float32):
+    # Consumo previsto para cenários horários já em arrays:
+    #   numéricas: valores; binárias: 0/1 (ou bool);
+    #   DayOfWeek: código 0..6 (codificar_dia).
+    # Escalares também valem (ficam iguais para todas as horas).
+    # Sem matriz de projeto: soma coeficiente × coluna e o efeito
+    # do dia entra por consulta numa tabela de 7 posições.
+    coef = modelo["coef"].astype(dtype)
+    n = max(np.size(v) for v in cenarios.values())
+
+    y = np.full(n, coef[0], dtype=dtype)
+    j = 1
+    for col in COLUNAS_NUMERICAS + list(COLUNAS_BINARIAS):
+        y += coef[j] * np.asarray(cenarios[col], dtype=dtype)
+        j += 1
+
+    efeito_dia = np.concatenate([[0], coef[j:]]).astype(dtype)
+    y += efeito_dia[np.asarray(cenarios["DayOfWeek"])]
+    return y
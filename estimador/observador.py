@@ -0,0 +1,156 @@
+#############################################################
+# Observa os arquivos de input/ e atualiza só o cache que depende
+# de cada um.
+#
+# As funções com st.cache_data recebem a "versão" (hash) dos arquivos
+# que leem, como carregar_fatores_projetados já fazia. Quem fornece a
+# versão é o Observador: uma thread olha os arquivos registrados a
+# cada poucos segundos (tamanho e data; o hash só é refeito quando um
+# dos dois muda). Quando um arquivo muda de verdade:
+# 1) as funções que dependem dele são chamadas com a versão nova, em
+#    segundo plano, enchendo o cache enquanto os usuários continuam
+#    vendo a versão antiga;
+# 2) a versão nova é publicada: o próximo rerun já usa os números
+#    novos, com o cache quente (sem pico de "primeira execução");
+# 3) as entradas da versão antiga dessas funções são apagadas.
+# Funções que não dependem do arquivo não são tocadas.
+#
+# Se a função falhar com o arquivo novo (ex.: arquivo ainda sendo
+# copiado), a versão antiga continua valendo e o erro fica em
+# `erros`; o arquivo é tentado de novo quando mudar outra vez.
+# Arquivos que mudaram juntos são tratados em grupos independentes
+# (só ficam no mesmo grupo se alguma função lê mais de um deles):
+# a falha de um grupo não segura a publicação dos outros.
+#############################################################
+
+import os
+import threading
+import time
+
+from estimador.arquivos import hash_arquivo
+
+
+class Observador:
+    def __init__(self, intervalo=2.0):
+        self.intervalo = intervalo
+        self.versoes = {}       # arquivo → hash publicado
+        self.erros = {}         # arquivo → mensagem da última falha
+        self.atualizado_em = {}  # arquivo → time.time() da última troca de versão
+        self._estado = {}       # arquivo → (tamanho, mtime) da última olhada
+        self._falhou = {}       # arquivo → hash que falhou (não tenta de novo)
+        self._dependentes = {}  # nome da função → (função, arquivos)
+        self._trava = threading.Lock()
+        self._thread = None
+        self._parar = threading.Event()
+
+    # --- registro ---
+
+    def versao(self, arquivo):
+        # Hash publicado do arquivo; o primeiro pedido passa a observar o arquivo
+        with self._trava:
+            if arquivo not in self.versoes:
+                self._estado[arquivo] = _assinatura(arquivo)
+                self.versoes[arquivo] = hash_arquivo(arquivo)
+            return self.versoes[arquivo]
+
+    def depende(self, funcao, *arquivos):
+        # funcao(versao_1, versao_2, ...) depende de arquivos (na mesma ordem).
+        # Pode ser chamado a cada rerun: o registro é pelo nome da função.
+        for arquivo in arquivos:
+            self.versao(arquivo)
+        with self._trava:
+            self._dependentes[funcao.__qualname__] = (funcao, arquivos)
+
+    def falhas(self):
+        # Cópia de `erros` para percorrer fora da trava (a thread mexe no dict)
+        with self._trava:
+            return dict(self.erros)
+
+    # --- thread ---
+
+    def iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._rodar, daemon=True, name="observador-input")
+            self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+
+    def _rodar(self):
+        while not self._parar.wait(self.intervalo):
+            self.verificar()
+
+    def verificar(self):
+        # Uma olhada em todos os arquivos; devolve os que trocaram de versão
+        with self._trava:
+            arquivos = list(self.versoes)
+
+        mudaram = {}
+        for arquivo in arquivos:
+            assinatura = _assinatura(arquivo)
+            if assinatura is None or assinatura == self._estado.get(arquivo):
+                continue
+            self._estado[arquivo] = assinatura
+            novo = hash_arquivo(arquivo)
+            if novo != self.versoes[arquivo] and novo != self._falhou.get(arquivo):
+                mudaram[arquivo] = novo
+
+        if mudaram:
+            self._atualizar(mudaram)
+        return list(mudaram)
+
+    def _atualizar(self, mudaram):
+        with self._trava:
+            antigas = dict(self.versoes)
+            dependentes = list(self._dependentes.values())
+        for grupo in _grupos(mudaram, dependentes):
+            self._atualizar_grupo({a: v for a, v in mudaram.items() if a in grupo}, antigas, dependentes)
+
+    def _atualizar_grupo(self, mudaram, antigas, dependentes):
+        novas = {**antigas, **mudaram}
+        afetadas = [(f, arqs) for f, arqs in dependentes if set(arqs) & set(mudaram)]
+
+        # 1) Aquece o cache com a versão nova (na ordem em que foram registradas)
+        try:
+            for funcao, arqs in afetadas:
+                funcao(*[novas[a] for a in arqs])
+        except Exception as erro:
+            with self._trava:
+                for arquivo, versao in mudaram.items():
+                    self._falhou[arquivo] = versao
+                    self.erros[arquivo] = f"{type(erro).__name__}: {erro}"
+            return
+
+        # 2) Publica
+        agora = time.time()
+        with self._trava:
+            self.versoes.update(mudaram)
+            for arquivo in mudaram:
+                self.erros.pop(arquivo, None)
+                self._falhou.pop(arquivo, None)
+                self.atualizado_em[arquivo] = agora
+
+        # 3) Apaga só as entradas da versão antiga
+        for funcao, arqs in afetadas:
+            funcao.clear(*[antigas[a] for a in arqs])
+
+
+def _grupos(mudaram, dependentes):
+    # Arquivos que mudaram, juntos quando alguma função depende de mais
+    # de um deles (ela precisa das versões novas de todos de uma vez)
+    grupos = [{arquivo} for arquivo in mudaram]
+    for _, arqs in dependentes:
+        tocados = set(arqs) & set(mudaram)
+        juntos = [g for g in grupos if g & tocados]
+        if len(juntos) > 1:
+            grupos = [g for g in grupos if not g & tocados] + [set().union(*juntos)]
+    return grupos
+
+
+def _assinatura(arquivo):
+    try:
+        info = os.stat(arquivo)
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
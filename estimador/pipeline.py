@@ -0,0 +1,55 @@
+#############################################################
+# Pipeline do dashboard fora do Streamlit.
+#
+# A mesma sequência das seções 1–3 de pages/01_Dashboard.py:
+# fatores → consumo da EPE (agregado) → previsão hierárquica do
+# consumo → fator projetado → direcionadores. Sem st.cache_data,
+# para scripts que precisam dos números sem abrir o app
+# (exportação em HTML, testes de carga, análises em lote).
+#############################################################
+
+import pandas as pd
+
+from estimador.direcionadores import prever_direcionadores
+from estimador.ingestao_epe import atualizar_agregado
+from estimador.previsao_consumo import prever_hierarquia
+from estimador.projecao_fatores import carregar_capacidade, projetar_fatores
+
+
+ARQUIVO_FATORES = "input/fatores_emissao.csv"
+ARQUIVO_CONSUMO = "input/Dados_abertos_Consumo_Mensal.xlsx"
+ARQUIVO_CAPACIDADE = "input/CAPACIDADE_GERACAO.csv"
+
+
+def historico(fatores, agregado):
+    # Consumo anual (2006–2024) × fator do ano = emissão total do sistema
+    consumo = agregado[agregado["ano"].between(2006, 2024)]
+    consumo = consumo.groupby("ano")["consumo_MWh"].sum().reset_index()
+    consumo = consumo.rename(columns={"consumo_MWh": "consumo_total_MWh"})
+
+    df = consumo.merge(fatores, on="ano", how="inner")
+    df["emissao_total_tCO2"] = df["consumo_total_MWh"] * df["fator_emissao_tCO2_MWh"]
+    return df
+
+
+def executar(path_fatores=ARQUIVO_FATORES, path_consumo=ARQUIVO_CONSUMO,
+             path_capacidade=ARQUIVO_CAPACIDADE, ano_fim=2050):
+    # Devolve um dict com as tabelas intermediárias e os direcionadores
+    fatores = pd.read_csv(path_fatores)
+    fatores["ano"] = fatores["ano"].astype(int)
+
+    agregado = atualizar_agregado([path_consumo])
+    df_final = historico(fatores, agregado)
+
+    consumo_previsto = prever_hierarquia(agregado, ano_fim)
+    fatores_projetados = projetar_fatores(fatores, carregar_capacidade(path_capacidade), ano_fim)
+    direcionadores = prever_direcionadores(df_final, consumo_previsto, fatores_projetados)
+
+    return {
+        "historico": df_final,
+        "consumo_previsto": consumo_previsto,
+        "fatores_projetados": fatores_projetados,
+        "direcionadores": direcionadores,
+        "ano_inicio": int(df_final["ano"].min()),
+        "ultimo_ano_hist": int(df_final["ano"].max()),
+    }
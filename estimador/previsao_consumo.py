@@ -0,0 +1,130 @@
+#############################################################
+# Previsão hierárquica do consumo de energia.
+#
+# A partir do agregado da EPE (ano, mês, UF, classe) montamos as
+# séries anuais de cada combinação UF × classe (nível mais baixo)
+# e todas as somas acima dela: nacional, subsistema, UF e classe.
+#
+# Todas as séries são ajustadas de uma vez:
+# - "tendencia": reta por mínimos quadrados, resolvida para todas
+#   as séries numa única chamada de lstsq (milissegundos);
+# - "prophet": um Prophet por série, distribuídos num pool de
+#   processos.
+# Nos dois casos a previsão parte do último ano observado (o ajuste
+# é deslocado para passar por ele), sem degrau entre o histórico e o
+# primeiro ano previsto.
+#
+# Depois as previsões são reconciliadas (projeção MQO na matriz de
+# soma), então UFs somam o subsistema, subsistemas somam o total etc.
+#############################################################
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from estimador.regional import UF_SUBSISTEMA
+
+
+def series_anuais(agregado):
+    # Tabela ano × (uf, classe) só com anos completos (12 meses),
+    # senão o último ano parcial puxa a tendência pra baixo.
+    meses = agregado.groupby("ano")["mes"].nunique()
+    completos = meses[meses == 12].index
+    df = agregado[agregado["ano"].isin(completos)]
+    tabela = df.pivot_table(index="ano", columns=["uf", "classe"],
+                            values="consumo_MWh", aggfunc="sum", fill_value=0.0)
+    return tabela.sort_index()
+
+
+def matriz_soma(colunas):
+    # Para cada série da hierarquia, quais séries do nível mais baixo
+    # entram na soma. Devolve (lista de (nível, nome), matriz S).
+    ufs = colunas.get_level_values("uf")
+    classes = colunas.get_level_values("classe")
+    subs = ufs.map(lambda uf: UF_SUBSISTEMA.get(uf, "Outros"))
+
+    nomes = [("Nacional", "Brasil")]
+    linhas = [np.ones(len(colunas), dtype=bool)]
+    for nivel, chaves in [("Subsistema", subs), ("UF", ufs), ("Classe", classes)]:
+        for chave in sorted(set(chaves)):
+            nomes.append((nivel, chave))
+            linhas.append(np.asarray(chaves == chave))
+    for uf, classe in colunas:
+        nomes.append(("UF × Classe", f"{uf} – {classe}"))
+    S = np.vstack([np.stack(linhas).astype(float), np.eye(len(colunas))])
+    return nomes, S
+
+
+def prever_tendencia(Y, anos, anos_futuros):
+    # Reta ajustada em todas as colunas de Y ao mesmo tempo:
+    # X (anos × 2) · B (2 × séries) ≈ Y (anos × séries).
+    # Da reta usamos só a inclinação: a previsão sai do último valor
+    # observado (Y[-1]) e cresce a inclinação por ano.
+    t0 = anos[0]
+    X = np.column_stack([np.ones(len(anos)), anos - t0])
+    B = np.linalg.lstsq(X, Y, rcond=None)[0]
+    return Y[-1] + np.outer(anos_futuros - anos[-1], B[1])
+
+
+def _ajustar_prophet(args):
+    # Roda dentro de um processo do pool: um Prophet por série
+    from prophet import Prophet
+
+    anos, y, anos_futuros = args
+    df = pd.DataFrame({"ds": pd.to_datetime([f"{a}-12-31" for a in anos]), "y": y})
+    modelo = Prophet(growth="linear", daily_seasonality=False,
+                     weekly_seasonality=False, yearly_seasonality=False)
+    modelo.fit(df)
+    # Prevê também o último ano observado para deslocar a curva até ele
+    datas = [anos[-1], *anos_futuros]
+    futuro = pd.DataFrame({"ds": pd.to_datetime([f"{a}-12-31" for a in datas])})
+    yhat = modelo.predict(futuro)["yhat"].to_numpy()
+    return yhat[1:] + (y[-1] - yhat[0])
+
+
+def prever_prophet(Y, anos, anos_futuros, max_workers=None):
+    tarefas = [(anos, Y[:, j], anos_futuros) for j in range(Y.shape[1])]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        colunas = list(pool.map(_ajustar_prophet, tarefas, chunksize=8))
+    return np.column_stack(colunas)
+
+
+def reconciliar(S, previsoes):
+    # Reconciliação MQO: projeta as previsões de todas as séries
+    # (linhas de S) no espaço das combinações coerentes.
+    # Depois cortamos negativos no nível mais baixo e somamos de
+    # novo, assim continua coerente.
+    P = np.linalg.solve(S.T @ S, S.T)
+    base = np.clip(previsoes @ P.T, 0, None)
+    return base @ S.T
+
+
+def prever_hierarquia(agregado, ano_fim=2050, metodo="tendencia", max_workers=None):
+    # Devolve DataFrame longo:
+    #   nivel | serie | ano | consumo_MWh | origem (histórico/previsto)
+    tabela = series_anuais(agregado)
+    nomes, S = matriz_soma(tabela.columns)
+
+    anos = tabela.index.to_numpy()
+    anos_futuros = np.arange(anos[-1] + 1, ano_fim + 1)
+    historico = tabela.to_numpy() @ S.T  # anos × todas as séries
+
+    if len(anos_futuros) == 0:
+        futuro = np.empty((0, len(nomes)))
+    elif metodo == "prophet":
+        futuro = reconciliar(S, prever_prophet(historico, anos, anos_futuros, max_workers))
+    else:
+        futuro = reconciliar(S, prever_tendencia(historico, anos, anos_futuros))
+
+    valores = np.vstack([historico, futuro])
+    todos_anos = np.concatenate([anos, anos_futuros])
+    niveis, series = zip(*nomes)
+
+    return pd.DataFrame({
+        "nivel": np.tile(niveis, len(todos_anos)),
+        "serie": np.tile(series, len(todos_anos)),
+        "ano": np.repeat(todos_anos, len(nomes)),
+        "consumo_MWh": valores.ravel(),
+        "origem": np.repeat(np.where(todos_anos <= anos[-1], "histórico", "previsto"), len(nomes)),
+    })
@@ -0,0 +1,143 @@
+#############################################################
+# Projeção do fator de emissão a partir da capacidade instalada.
+#
+# Depois do último ano histórico não temos fator oficial. Em vez
+# de repetir o último valor, olhamos as unidades geradoras do
+# CAPACIDADE_GERACAO.csv (ONS) que entram ou saem de operação no
+# futuro e calculamos como o mix da matriz muda ano a ano.
+#
+# O fator projetado é o último fator histórico escalado pela
+# variação da "intensidade do mix":
+#
+#   intensidade(ano) = Σ cap * fc * fe / Σ cap * fc
+#   fator(ano)       = fator(último ano) * intensidade(ano) / intensidade(último ano)
+#
+# cap = potência ativa no ano (MW), fc = fator de capacidade típico,
+# fe = fator de emissão típico do combustível (tCO₂/MWh).
+# Assim a variação hidrológica de cada ano fica fora da conta:
+# só a mudança estrutural da matriz mexe no fator.
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+
+# Fator de capacidade típico (fração do ano gerando na potência máxima).
+# Térmicas fósseis no Brasil operam como complemento das hidrelétricas,
+# por isso os valores baixos.
+FATOR_CAPACIDADE = {
+    "HIDRÁULICA": 0.50,
+    "EÓLICA": 0.40,
+    "FOTOVOLTAICA": 0.24,
+    "NUCLEAR": 0.85,
+    "BIOMASSA": 0.40,
+    "GÁS": 0.30,
+    "CARVÃO": 0.45,
+    "ÓLEO COMBUSTÍVEL": 0.05,
+    "ÓLEO DIESEL": 0.05,
+    "MULTI-COMBUSTÍVEL DIESEL/ÓLEO": 0.05,
+    "MULTI-COMBUSTÍVEL GÁS/DIESEL": 0.15,
+    "RESÍDUOS INDUSTRIAIS": 0.50,
+    "RESÍDUO CICLO COMBINADO": 0.50,
+}
+
+# Fator de emissão típico por combustível (tCO₂/MWh gerado).
+# Biomassa entra como zero (carbono biogênico), igual ao inventário.
+FATOR_EMISSAO_COMBUSTIVEL = {
+    "HIDRÁULICA": 0.0,
+    "EÓLICA": 0.0,
+    "FOTOVOLTAICA": 0.0,
+    "NUCLEAR": 0.0,
+    "BIOMASSA": 0.0,
+    "GÁS": 0.45,
+    "CARVÃO": 1.00,
+    "ÓLEO COMBUSTÍVEL": 0.75,
+    "ÓLEO DIESEL": 0.80,
+    "MULTI-COMBUSTÍVEL DIESEL/ÓLEO": 0.78,
+    "MULTI-COMBUSTÍVEL GÁS/DIESEL": 0.60,
+    "RESÍDUOS INDUSTRIAIS": 0.50,
+    "RESÍDUO CICLO COMBINADO": 0.40,
+}
+
+
+def carregar_capacidade(path="input/CAPACIDADE_GERACAO.csv"):
+    # Arquivo do ONS: separado por ";" e com muitos campos texto
+    # preenchidos com espaços à direita.
+    df = pd.read_csv(path, sep=";", dtype=str)
+    for col in df.columns:
+        df[col] = df[col].str.strip()
+
+    df["val_potenciaefetiva"] = pd.to_numeric(df["val_potenciaefetiva"], errors="coerce").fillna(0.0)
+    for col in ["dat_entradateste", "dat_entradaoperacao", "dat_desativacao"]:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
+
+    # A unidade já gera energia durante os testes, então a entrada
+    # é a primeira das duas datas que existir.
+    df["entrada"] = df[["dat_entradateste", "dat_entradaoperacao"]].min(axis=1)
+    return df
+
+
+def fracao_ativa(entrada, saida, anos):
+    # Matriz (anos × unidades) com a fração de cada ano em que a
+    # unidade esteve operando. Tudo com broadcasting, sem laço.
+    # Datas vazias: entrada = desde sempre, saída = nunca.
+    ini = pd.to_datetime(pd.Series(anos).astype(str) + "-01-01").to_numpy()[:, None]
+    fim = pd.to_datetime((pd.Series(anos) + 1).astype(str) + "-01-01").to_numpy()[:, None]
+
+    entrada = pd.Series(entrada).fillna(pd.Timestamp.min).to_numpy()[None, :]
+    saida = pd.Series(saida).fillna(pd.Timestamp.max).to_numpy()[None, :]
+
+    comeco = np.maximum(ini, entrada)
+    termino = np.minimum(fim, saida)
+    dias = (termino - comeco) / np.timedelta64(1, "D")
+    return np.clip(dias, 0, None) / ((fim - ini) / np.timedelta64(1, "D"))
+
+
+def capacidade_por_ano(cap, anos):
+    # Potência média ativa (MW) por ano e por combustível
+    frac = fracao_ativa(cap["entrada"], cap["dat_desativacao"], anos)
+    mw = frac * cap["val_potenciaefetiva"].to_numpy()[None, :]
+
+    combustiveis, codigos = np.unique(cap["nom_combustivel"].fillna("").to_numpy(), return_inverse=True)
+    tabela = np.zeros((len(anos), len(combustiveis)))
+    np.add.at(tabela.T, codigos, mw.T)
+    return pd.DataFrame(tabela, index=pd.Index(anos, name="ano"), columns=combustiveis)
+
+
+def intensidade_mix(cap_ano):
+    # Intensidade de emissão média da geração esperada (tCO₂/MWh)
+    fc = cap_ano.columns.map(lambda c: FATOR_CAPACIDADE.get(c, 0.0)).to_numpy(dtype=float)
+    fe = cap_ano.columns.map(lambda c: FATOR_EMISSAO_COMBUSTIVEL.get(c, 0.0)).to_numpy(dtype=float)
+    geracao = cap_ano.to_numpy() * fc
+    total = geracao.sum(axis=1)
+    return np.divide(geracao @ fe, total, out=np.zeros_like(total), where=total > 0)
+
+
+def projetar_fatores(fatores, cap, ano_fim=2050):
+    # Devolve um DataFrame com um fator por ano, do primeiro ano
+    # histórico até ano_fim:
+    #   ano | fator_emissao_tCO2_MWh | intensidade_mix | origem
+    fatores = fatores.sort_values("ano")
+    ultimo_ano = int(fatores["ano"].max())
+    anos = np.arange(int(fatores["ano"].min()), max(ano_fim, ultimo_ano) + 1)
+
+    intensidade = intensidade_mix(capacidade_por_ano(cap, anos))
+
+    df = pd.DataFrame({"ano": anos, "intensidade_mix": intensidade})
+    df = df.merge(fatores[["ano", "fator_emissao_tCO2_MWh"]], on="ano", how="left")
+    df["origem"] = np.where(df["ano"] <= ultimo_ano, "histórico", "projetado")
+
+    futuro = df["ano"] > ultimo_ano
+    base = df.loc[df["ano"] == ultimo_ano]
+    fator_base = float(base["fator_emissao_tCO2_MWh"].iloc[0])
+    intensidade_base = float(base["intensidade_mix"].iloc[0])
+
+    if intensidade_base > 0:
+        df.loc[futuro, "fator_emissao_tCO2_MWh"] = (
+            fator_base * df.loc[futuro, "intensidade_mix"] / intensidade_base
+        )
+    else:
+        # Sem térmica nenhuma no ano base não tem o que escalar
+        df["fator_emissao_tCO2_MWh"] = df["fator_emissao_tCO2_MWh"].ffill()
+
+    return df
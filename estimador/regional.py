@@ -0,0 +1,94 @@
+#############################################################
+# Modo regional: em vez de aplicar uma única participação
+# nacional, repartimos o consumo dos DCs entre estados/subsistemas
+# (os DCs estão concentrados em poucos estados) e usamos um fator
+# de emissão regional.
+#
+# O fator regional é o fator nacional (histórico/projetado)
+# escalado pela intensidade do mix de cada subsistema em relação
+# ao mix nacional, com as mesmas hipóteses de projecao_fatores.
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+from estimador.projecao_fatores import capacidade_por_ano, intensidade_mix
+
+
+# Subsistema do SIN de cada UF (SE = Sudeste/Centro-Oeste)
+UF_SUBSISTEMA = {
+    "SP": "SE", "RJ": "SE", "MG": "SE", "ES": "SE", "GO": "SE", "DF": "SE",
+    "MT": "SE", "MS": "SE", "AC": "SE", "RO": "SE",
+    "PR": "S", "SC": "S", "RS": "S",
+    "BA": "NE", "SE": "NE", "AL": "NE", "PE": "NE", "PB": "NE",
+    "RN": "NE", "CE": "NE", "PI": "NE",
+    "PA": "N", "TO": "N", "MA": "N", "AP": "N", "AM": "N", "RR": "N",
+}
+
+SUBSISTEMAS = ["SE", "S", "NE", "N"]
+
+# Distribuição padrão do consumo dos DCs por UF (fração).
+# Estimativa grosseira a partir da concentração de capacidade
+# instalada de DCs: São Paulo concentra mais da metade, seguido
+# por Rio, Sul e Fortaleza (cabos submarinos).
+PESOS_DC_UF = {
+    "SP": 0.55, "RJ": 0.12, "RS": 0.05, "PR": 0.04, "SC": 0.03,
+    "MG": 0.04, "DF": 0.04, "CE": 0.05, "PE": 0.02, "BA": 0.03,
+    "GO": 0.01, "ES": 0.01, "PA": 0.01,
+}
+
+
+def intensidade_por_subsistema(cap, anos):
+    # Matriz (subsistemas × anos) com a intensidade do mix de cada
+    # subsistema. A parte paraguaia de Itaipu (PY) abastece o SE.
+    sub = cap["id_subsistema"].replace({"PY": "SE"})
+    return np.stack([
+        intensidade_mix(capacidade_por_ano(cap[sub == s], anos))
+        for s in SUBSISTEMAS
+    ])
+
+
+def fatores_regionais(fatores_projetados, cap):
+    # Fator por subsistema (tCO₂/MWh), mesmo eixo de anos de
+    # fatores_projetados. Devolve (subsistemas × anos).
+    anos = fatores_projetados["ano"].to_numpy()
+    intensidade_nacional = fatores_projetados["intensidade_mix"].to_numpy()
+    relativo = np.divide(
+        intensidade_por_subsistema(cap, anos),
+        intensidade_nacional[None, :],
+        out=np.ones((len(SUBSISTEMAS), len(anos))),
+        where=intensidade_nacional[None, :] > 0,
+    )
+    return fatores_projetados["fator_emissao_tCO2_MWh"].to_numpy()[None, :] * relativo
+
+
+def pesos_por_regiao(pesos_uf, nivel="Subsistema"):
+    # Normaliza os pesos por UF e, se for o caso, soma por subsistema.
+    # Devolve (nomes das regiões, pesos, índice do subsistema de cada região).
+    pesos = pd.Series(pesos_uf, dtype=float).clip(lower=0)
+    pesos = pesos[pesos.index.isin(list(UF_SUBSISTEMA)) & (pesos > 0)]
+    if pesos.sum() == 0:
+        raise ValueError("Informe ao menos um peso positivo para os DCs.")
+    pesos = pesos / pesos.sum()
+
+    if nivel == "Subsistema":
+        pesos = pesos.groupby(pesos.index.map(UF_SUBSISTEMA)).sum()
+        pesos = pesos.reindex(SUBSISTEMAS).dropna()
+        indice_sub = np.array([SUBSISTEMAS.index(s) for s in pesos.index])
+    else:
+        pesos = pesos.sort_values(ascending=False)
+        indice_sub = np.array([SUBSISTEMAS.index(UF_SUBSISTEMA[uf]) for uf in pesos.index])
+
+    return list(pesos.index), pesos.to_numpy(), indice_sub
+
+
+def emissoes_regionais(consumo_total, participacao, pesos, fator_regiao):
+    # Tensor (cenários × regiões × anos) em uma única conta com broadcasting:
+    #   consumo_total (anos), participacao (cenários × anos),
+    #   pesos (regiões), fator_regiao (regiões × anos)
+    consumo = (
+        participacao[:, None, :]
+        * pesos[None, :, None]
+        * np.asarray(consumo_total)[None, None, :]
+    )
+    return consumo, consumo * fator_regiao[None, :, :]
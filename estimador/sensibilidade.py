@@ -0,0 +1,216 @@
+#############################################################
+# Análise de sensibilidade global das emissões dos DCs.
+#
+# Quais hipóteses mais mexem no resultado? Cada entrada dos cenários
+# vira um fator com uma faixa (fatores()): participação no primeiro
+# ano (0,3%), em 2024 (1,7%), no ano final, multiplicador do cenário
+# (0,7 a 1,3), escala do fator de emissão projetado e crescimento
+# extra do consumo projetado.
+#
+# Índices de Sobol (esquema de Saltelli): duas matrizes A e B de
+# amostras quase aleatórias, e para cada fator i uma matriz AB_i (A
+# com a coluna i de B). Com n amostras e k fatores são n × (k + 2)
+# avaliações, todas de uma vez: a curva de participação é montada
+# como uma matriz (amostras × anos), sem laço por amostra.
+# - S1 (primeira ordem): parte da variância explicada só pelo fator;
+# - ST (total): inclui as interações com os outros fatores.
+# O tornado mostra a métrica com cada fator no mínimo e no máximo da
+# faixa (os outros no valor nominal), ordenado pelo ST.
+#
+# Métricas: emissão dos DCs no ano final, ou acumulada depois do
+# histórico. No ano final a participação vale o alvo, então a de 2024
+# só pesa na métrica acumulada (ela puxa a curva dos anos seguintes).
+# A do primeiro ano só mexe nos anos até 2024, que ficam fora das duas
+# métricas: o índice dela sai zero, o que confirma que ela não muda a
+# projeção.
+#############################################################
+
+import numpy as np
+import pandas as pd
+
+from estimador.cenarios import (
+    ANO_REFERENCIA, MULTIPLICADORES, PARTICIPACAO_INICIAL, PARTICIPACAO_REFERENCIA
+)
+
+
+METRICAS = {
+    "ano_final": "Emissão dos DCs no ano final (tCO₂)",
+    "acumulada": "Emissão dos DCs acumulada após o histórico (tCO₂)",
+}
+
+
+def fatores(participacao_final, variacao=0.3):
+    # nome → (rótulo, mínimo, nominal, máximo). As participações, a
+    # escala do fator e o crescimento variam ± variacao em torno do nominal
+    def faixa(nominal):
+        return nominal * (1 - variacao), nominal, nominal * (1 + variacao)
+
+    return {
+        "participacao_inicial": ("Participação no primeiro ano", *faixa(PARTICIPACAO_INICIAL)),
+        "participacao_referencia": (f"Participação em {ANO_REFERENCIA}", *faixa(PARTICIPACAO_REFERENCIA)),
+        "participacao_final": ("Participação no ano final", *faixa(participacao_final)),
+        "multiplicador": ("Multiplicador do cenário",
+                          min(MULTIPLICADORES.values()), 1.0, max(MULTIPLICADORES.values())),
+        "escala_fator": ("Fator de emissão projetado (escala)", *faixa(1.0)),
+        "crescimento_consumo": ("Crescimento extra do consumo (ao ano)",
+                                -variacao * 0.05, 0.0, variacao * 0.05),
+    }
+
+
+#############################################################
+# Amostras quase aleatórias
+#############################################################
+
+def _halton(n, dimensoes, semente=0):
+    # Sequência de Halton (uma base prima por dimensão), com deslocamento
+    # aleatório para as duas metades (A e B) não ficarem correlacionadas
+    primos, candidato = [], 2
+    while len(primos) < dimensoes:
+        if all(candidato % p for p in primos):
+            primos.append(candidato)
+        candidato += 1
+
+    indices = np.arange(1, n + 1)
+    pontos = np.empty((n, dimensoes))
+    for j, base in enumerate(primos):
+        resto, escala, valor = indices.copy(), 1.0, np.zeros(n)
+        while resto.any():
+            escala /= base
+            valor += escala * (resto % base)
+            resto //= base
+        pontos[:, j] = valor
+    return (pontos + np.random.default_rng(semente).random(dimensoes)) % 1.0
+
+
+def amostras(n, dimensoes, semente=0):
+    # n pontos em [0, 1)^dimensoes: Sobol embaralhado (scipy) se houver,
+    # senão Halton
+    try:
+        from scipy.stats import qmc
+    except ImportError:
+        return _halton(n, dimensoes, semente)
+    return qmc.Sobol(dimensoes, scramble=True, seed=semente).random(n)
+
+
+#############################################################
+# Modelo vetorizado
+#############################################################
+
+def avaliar(X, nomes, previsao, ano_inicio, ultimo_ano_hist, ano_fim, metrica="ano_final"):
+    # X: (amostras × fatores), colunas na ordem de nomes.
+    # previsao: ano, consumo_total_MWh, fator_emissao_tCO2_MWh (ano_inicio..ano_fim).
+    # Devolve a métrica de cada amostra. Com os valores nominais é a
+    # mesma conta de calcular_cenarios.
+    if ano_fim <= ANO_REFERENCIA:
+        raise ValueError(f"O ano final precisa ser depois de {ANO_REFERENCIA}.")
+    if metrica not in METRICAS:
+        raise ValueError(f"Métrica desconhecida: {metrica}. Use uma de {list(METRICAS)}.")
+
+    col = {nome: X[:, [i]] for i, nome in enumerate(nomes)}  # colunas (amostras × 1)
+    anos = previsao["ano"].to_numpy(dtype=float)
+    consumo = previsao["consumo_total_MWh"].to_numpy(dtype=float)
+    fator = previsao["fator_emissao_tCO2_MWh"].to_numpy(dtype=float)
+    futuro = anos > ultimo_ano_hist
+
+    # Curva suave (a mesma interpolação de curva_suave, uma linha por amostra)
+    alvo = np.minimum(1.0, col["participacao_final"] * col["multiplicador"])
+    antes = col["participacao_inicial"] + (col["participacao_referencia"] - col["participacao_inicial"]) \
+        * (anos - ano_inicio) / (ANO_REFERENCIA - ano_inicio)
+    depois = col["participacao_referencia"] + (alvo - col["participacao_referencia"]) \
+        * (anos - ANO_REFERENCIA) / (ano_fim - ANO_REFERENCIA)
+    participacao = np.where(anos <= ANO_REFERENCIA, antes, depois)
+
+    # Consumo e fator só mudam nos anos projetados
+    anos_projecao = np.where(futuro, anos - ultimo_ano_hist, 0.0)
+    consumo = consumo * (1 + col["crescimento_consumo"]) ** anos_projecao
+    fator = np.where(futuro, fator * col["escala_fator"], fator)
+
+    emissao = participacao * consumo * fator
+    if metrica == "ano_final":
+        return emissao[:, -1]
+    return emissao[:, futuro].sum(axis=1)
+
+
+#############################################################
+# Índices
+#############################################################
+
+def sobol(modelo, faixas, n=4096, semente=0):
+    # modelo(X) → métrica por linha; faixas: saída de fatores().
+    # Devolve uma linha por fator com S1 e ST.
+    nomes = list(faixas)
+    k = len(nomes)
+    minimo = np.array([faixas[f][1] for f in nomes])
+    maximo = np.array([faixas[f][3] for f in nomes])
+
+    U = amostras(n, 2 * k, semente)
+    A = minimo + U[:, :k] * (maximo - minimo)
+    B = minimo + U[:, k:] * (maximo - minimo)
+    AB = np.repeat(A[np.newaxis], k, axis=0)  # (fatores × amostras × fatores)
+    AB[np.arange(k), :, np.arange(k)] = B.T
+
+    # Uma avaliação só para A, B e todas as AB_i
+    y = modelo(np.vstack([A, B, AB.reshape(-1, k)]))
+    yA, yB, yAB = y[:n], y[n:2 * n], y[2 * n:].reshape(k, n)
+
+    variancia = np.var(np.concatenate([yA, yB]))
+    if variancia == 0:
+        s1 = total = np.zeros(k)
+    else:
+        s1 = np.mean(yB * (yAB - yA), axis=1) / variancia          # Saltelli (2010)
+        total = 0.5 * np.mean((yA - yAB) ** 2, axis=1) / variancia  # Jansen
+
+    return pd.DataFrame({"fator": nomes, "S1": s1, "ST": total})
+
+
+def tornado(modelo, faixas):
+    # Métrica com cada fator no mínimo e no máximo, os outros no nominal
+    nomes = list(faixas)
+    nominal = np.array([faixas[f][2] for f in nomes])
+    X = np.tile(nominal, (2 * len(nomes) + 1, 1))
+    for i, f in enumerate(nomes):
+        X[2 * i, i] = faixas[f][1]
+        X[2 * i + 1, i] = faixas[f][3]
+    y = modelo(X)
+    return pd.DataFrame({
+        "fator": nomes,
+        "no_minimo": y[0:-1:2],
+        "no_maximo": y[1:-1:2],
+        "nominal": y[-1],
+    })
+
+
+def analisar(direcionadores, ano_inicio, ultimo_ano_hist, ano_fim, participacao_final,
+             metrica="ano_final", variacao=0.3, n=4096, semente=0):
+    # Sobol + tornado numa tabela só, do fator mais importante (ST) para o menos:
+    #   fator | rotulo | minimo | maximo | S1 | ST | no_minimo | no_maximo | nominal
+    previsao = direcionadores[direcionadores["ano"].between(ano_inicio, ano_fim)]
+    faixas = fatores(participacao_final, variacao)
+
+    def modelo(X):
+        return avaliar(X, list(faixas), previsao, ano_inicio, ultimo_ano_hist, ano_fim, metrica)
+
+    tabela = sobol(modelo, faixas, n, semente).merge(tornado(modelo, faixas), on="fator")
+    tabela.insert(1, "rotulo", [faixas[f][0] for f in tabela["fator"]])
+    tabela.insert(2, "minimo", [faixas[f][1] for f in tabela["fator"]])
+    tabela.insert(3, "maximo", [faixas[f][3] for f in tabela["fator"]])
+    return tabela.sort_values("ST", ascending=False, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from estimador.pipeline import executar
+
+    ano_fim = int(sys.argv[1]) if len(sys.argv) > 1 else 2050
+    resultado = executar(ano_fim=ano_fim)
+
+    inicio = time.perf_counter()
+    for metrica in METRICAS:
+        tabela = analisar(resultado["direcionadores"], resultado["ano_inicio"],
+                          resultado["ultimo_ano_hist"], ano_fim, 0.036, metrica)
+        print(METRICAS[metrica])
+        print(tabela[["rotulo", "S1", "ST", "no_minimo", "no_maximo"]].to_string(index=False))
+        print()
+    print(f"{time.perf_counter() - inicio:.2f} s")
@@ -0,0 +1,225 @@
+#############################################################
+# Armazenamento colunar mapeado em memória para telemetria.
+#
+# Um DC real gera anos de medições por minuto; reler CSV toda
+# vez não escala. Aqui cada coluna vira um arquivo binário de
+# largura fixa numa pasta:
+#
+#   pasta/meta.json        colunas, tipos, nº de linhas, categorias
+#   pasta/Timestamp.i8     segundos desde 1970 (int64, ordenado)
+#   pasta/<coluna>.f4      numéricas em float32
+#   pasta/<coluna>.i2      texto (On/Off, dia da semana...) como código int16
+#
+# As leituras usam np.memmap: o sistema operacional só traz do
+# disco as páginas que a consulta toca. Recorte por período é uma
+# busca binária no índice de tempo, e as agregações (hora, dia,
+# mês) percorrem o recorte em blocos, sem carregar tudo na RAM.
+#############################################################
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+PASTA_PADRAO = "cache/telemetria"
+COLUNA_TEMPO = "Timestamp"
+TIPOS = {"f4": np.float32, "i2": np.int16, "i8": np.int64}
+
+
+def _caminho(pasta, coluna, tipo):
+    return os.path.join(pasta, f"{coluna}.{tipo}")
+
+
+def _ler_meta(pasta):
+    path = os.path.join(pasta, "meta.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_meta(pasta, meta):
+    # Temporário + troca: meta.json nunca fica pela metade
+    path = os.path.join(pasta, "meta.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def _aparar(pasta, meta):
+    # Corta cada coluna no nº de linhas do meta.json. Se uma conversão
+    # caiu no meio de um bloco, algumas colunas ficaram com linhas a
+    # mais; sem cortar, o próximo bloco seria gravado depois delas e as
+    # colunas sairiam desalinhadas.
+    colunas = {COLUNA_TEMPO: "i8", **meta["colunas"]}
+    for col, tipo in colunas.items():
+        path = _caminho(pasta, col, tipo)
+        tamanho = meta["linhas"] * np.dtype(TIPOS[tipo]).itemsize
+        if os.path.exists(path) and os.path.getsize(path) > tamanho:
+            os.truncate(path, tamanho)
+
+
+def converter_csv(arquivos, pasta=PASTA_PADRAO, tamanho_bloco=500_000):
+    # Acrescenta os CSVs ao armazenamento, bloco a bloco.
+    # Os tempos precisam vir em ordem crescente (e depois do que já
+    # está gravado), assim o índice de tempo continua ordenado.
+    os.makedirs(pasta, exist_ok=True)
+    meta = _ler_meta(pasta)
+    if meta is not None:
+        _aparar(pasta, meta)
+
+    for path in arquivos:
+        for bloco in pd.read_csv(path, chunksize=tamanho_bloco):
+            tempo = pd.to_datetime(bloco[COLUNA_TEMPO]).to_numpy().astype("datetime64[s]").astype(np.int64)
+
+            if meta is None:
+                # Primeiro bloco define o esquema
+                colunas = {}
+                for col in bloco.columns:
+                    if col == COLUNA_TEMPO:
+                        continue
+                    if any(sep in str(col) for sep in ("/", "\\", os.sep)):
+                        # O nome vira nome de arquivo dentro da pasta
+                        raise ValueError(f"{path}: nome de coluna inválido (separador de caminho): {col!r}")
+                    colunas[col] = "f4" if pd.api.types.is_numeric_dtype(bloco[col]) else "i2"
+                meta = {"colunas": colunas, "categorias": {c: [] for c, t in colunas.items() if t == "i2"},
+                        "linhas": 0, "ultimo_tempo": None}
+                _aparar(pasta, meta)  # restos de uma primeira conversão interrompida
+
+            if np.any(np.diff(tempo) < 0) or (
+                    meta["ultimo_tempo"] is not None and len(tempo) and tempo[0] < meta["ultimo_tempo"]):
+                raise ValueError(f"{path}: os registros precisam estar em ordem de tempo.")
+
+            with open(_caminho(pasta, COLUNA_TEMPO, "i8"), "ab") as f:
+                tempo.tofile(f)
+
+            for col, tipo in meta["colunas"].items():
+                if tipo == "f4":
+                    valores = bloco[col].to_numpy(dtype=np.float32)
+                else:
+                    # Categoria nova ganha o próximo código
+                    categorias = meta["categorias"][col]
+                    for valor in pd.unique(bloco[col].astype(str)):
+                        if valor not in categorias:
+                            categorias.append(valor)
+                    valores = pd.Categorical(bloco[col].astype(str), categories=categorias).codes.astype(np.int16)
+                with open(_caminho(pasta, col, tipo), "ab") as f:
+                    valores.tofile(f)
+
+            meta["linhas"] += len(bloco)
+            if len(tempo):
+                meta["ultimo_tempo"] = int(tempo[-1])
+
+            # meta.json por último (e trocado de uma vez): se cair no meio,
+            # o nº de linhas gravado continua sendo o do último bloco
+            # completo, e a próxima conversão corta o que sobrou
+            _gravar_meta(pasta, meta)
+
+    return meta
+
+
+def abrir(pasta=PASTA_PADRAO):
+    # Dict coluna → np.memmap somente leitura (nada é lido ainda)
+    meta = _ler_meta(pasta)
+    if meta is None:
+        raise FileNotFoundError(f"Armazenamento de telemetria não encontrado em {pasta}.")
+    n = meta["linhas"]
+
+    def mapear(coluna, tipo):
+        if n == 0:
+            return np.empty(0, dtype=TIPOS[tipo])
+        return np.memmap(_caminho(pasta, coluna, tipo), dtype=TIPOS[tipo], mode="r", shape=(n,))
+
+    dados = {COLUNA_TEMPO: mapear(COLUNA_TEMPO, "i8")}
+    for col, tipo in meta["colunas"].items():
+        dados[col] = mapear(col, tipo)
+    return dados, meta
+
+
+def recortar(dados, inicio=None, fim=None):
+    # Linhas com inicio <= tempo < fim. Busca binária no índice de
+    # tempo; devolve fatias (visões do memmap, sem cópia).
+    tempo = dados[COLUNA_TEMPO]
+    i = 0 if inicio is None else int(np.searchsorted(tempo, _segundos(inicio), "left"))
+    j = len(tempo) if fim is None else int(np.searchsorted(tempo, _segundos(fim), "left"))
+    return {col: valores[i:j] for col, valores in dados.items()}
+
+
+def _segundos(momento):
+    return int(pd.Timestamp(momento).to_datetime64().astype("datetime64[s]").astype(np.int64))
+
+
+def agregar(dados, coluna, freq="D", inicio=None, fim=None, tamanho_bloco=1_000_000):
+    # Agregação por hora ("h"), dia ("D") ou mês ("M") de uma coluna
+    # numérica, com média, mínimo, máximo, soma e contagem.
+    # Como o tempo está ordenado, cada período é um trecho contínuo:
+    # usamos reduceat por bloco e juntamos o período que atravessa
+    # a fronteira entre dois blocos. Leituras NaN (sensor sem dado)
+    # ficam de fora: viram ±inf no mínimo/máximo e 0 na soma, e a
+    # contagem é só das leituras válidas. Período sem nenhuma leitura
+    # válida sai com média, mínimo e máximo NaN.
+    recorte = recortar(dados, inicio, fim)
+    tempo, valores = recorte[COLUNA_TEMPO], recorte[coluna]
+
+    chaves, somas, minimos, maximos, contagens = [], [], [], [], []
+    for a in range(0, len(tempo), tamanho_bloco):
+        t = np.asarray(tempo[a:a + tamanho_bloco]).astype("datetime64[s]").astype(f"datetime64[{freq}]")
+        v = np.asarray(valores[a:a + tamanho_bloco], dtype=np.float64)
+        valido = ~np.isnan(v)
+
+        inicios = np.concatenate([[0], np.flatnonzero(t[1:] != t[:-1]) + 1])
+        k = t[inicios]
+        s = np.add.reduceat(np.where(valido, v, 0.0), inicios)
+        mn = np.minimum.reduceat(np.where(valido, v, np.inf), inicios)
+        mx = np.maximum.reduceat(np.where(valido, v, -np.inf), inicios)
+        c = np.add.reduceat(valido.astype(np.int64), inicios)
+
+        if chaves and chaves[-1][-1] == k[0]:
+            # Mesmo período do fim do bloco anterior: junta
+            somas[-1][-1] += s[0]
+            minimos[-1][-1] = min(minimos[-1][-1], mn[0])
+            maximos[-1][-1] = max(maximos[-1][-1], mx[0])
+            contagens[-1][-1] += c[0]
+            k, s, mn, mx, c = k[1:], s[1:], mn[1:], mx[1:], c[1:]
+            if not len(k):
+                continue  # o bloco inteiro era continuação do período anterior
+
+        chaves.append(k)
+        somas.append(s)
+        minimos.append(mn)
+        maximos.append(mx)
+        contagens.append(c)
+
+    if not chaves:
+        return pd.DataFrame(columns=["media", "minimo", "maximo", "soma", "contagem"])
+
+    soma = np.concatenate(somas)
+    contagem = np.concatenate(contagens)
+    vazio = contagem == 0
+    return pd.DataFrame({
+        "media": np.where(vazio, np.nan, soma / np.maximum(contagem, 1)),
+        "minimo": np.where(vazio, np.nan, np.concatenate(minimos)),
+        "maximo": np.where(vazio, np.nan, np.concatenate(maximos)),
+        "soma": soma,
+        "contagem": contagem,
+    }, index=pd.DatetimeIndex(np.concatenate(chaves).astype("datetime64[s]"), name=COLUNA_TEMPO))
+
+
+def categorias(meta, coluna):
+    # Código int16 → texto original
+    return meta["categorias"][coluna]
+
+
+if __name__ == "__main__":
+    # Uso: python -m estimador.telemetria arquivo1.csv [arquivo2.csv ...] [--pasta cache/telemetria]
+    args = sys.argv[1:]
+    pasta = PASTA_PADRAO
+    if "--pasta" in args:
+        i = args.index("--pasta")
+        pasta = args[i + 1]
+        args = args[:i] + args[i + 2:]
+    meta = converter_csv(args or ["input/Energy_consumption.csv"], pasta)
+    print(f"{meta['linhas']} linhas em {pasta}")
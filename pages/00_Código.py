@@ -127,7 +127,7 @@ O aplicativo realiza:
   - Base
   - Otimista
   - Pessimista
-- Previsão com o modelo Prophet
+- Previsão pelos direcionadores: consumo previsto (hierárquico, por tendência) × fator de emissão projetado
 - Construção de gráfico interativo com Plotly
   - Eixo esquerdo: Emissões (tCO₂)
   - Eixo direito: Consumo (MWh)
@@ -147,7 +147,7 @@ Além disso, a interface permite configurar:
 O dashboard apresenta:
 
 - Histórico real (2006–2024)
-- Projeções baseadas no Prophet
+- Projeções a partir do consumo previsto e do fator projetado
 - Curva suavizada da participação dos Data Centers
 - Comparação entre cenários
 - Dois eixos Y independentes (tCO₂ e MWh)
@@ -5,9 +5,26 @@
 import numpy as np
 import pandas as pd
 import streamlit as st
-from prophet import Prophet
 import plotly.graph_objects as go
 
+from estimador.cenarios import alvos, calcular_cenarios, curva_suave
+from estimador.direcionadores import prever_direcionadores
+from estimador.exportar_resultados import (
+    FORMATOS, LIMITE_LINHAS_EXCEL, arquivo_temporario, formatos_disponiveis, linhas_varredura,
+    tabela_cenarios, varredura
+)
+from estimador.grafico_cenarios import com_visibilidade, figura_cenarios
+from estimador.grafico_cliente import dados_base, html_interativo
+from estimador.ingestao_epe import atualizar_agregado
+from estimador.meta_emissao import TIPOS, resolver
+from estimador.observador import Observador
+from estimador.previsao_consumo import prever_hierarquia
+from estimador.projecao_fatores import carregar_capacidade, projetar_fatores
+from estimador.regional import (
+    PESOS_DC_UF, emissoes_regionais, fatores_regionais, pesos_por_regiao
+)
+from estimador.sensibilidade import METRICAS, analisar
+
 # Config padrão do app: página larga pra aproveitar o espaço dos gráficos
 st.set_page_config(
     page_title="Estimador CO₂ – Data Centers",
@@ -21,32 +38,84 @@ st.title("Estimador de Emissões de CO₂ de Data Centers no Brasil")
 # 1) CARREGAR ARQUIVOS
 # Aqui só deixamos em funções com cache pra não ficar relendo
 # arquivo toda hora que o usuário mexe nos sliders.
+# Cada função recebe a versão (hash) dos arquivos que lê: quando um
+# arquivo de input/ muda, o observador refaz em segundo plano só as
+# funções que dependem dele e depois troca a versão (ver
+# estimador/observador.py). Sem reiniciar o app.
 #############################################################
 
 @st.cache_data
-def carregar_fatores(path="input/fatores_emissao.csv"):
+def carregar_fatores(versao, path="input/fatores_emissao.csv"):
     # Fatores de emissão anuais (tCO₂/MWh)
     df = pd.read_csv(path)
     df["ano"] = df["ano"].astype(int)
     return df
 
 @st.cache_data
-def carregar_consumo(path="input/Dados_abertos_Consumo_Mensal.xlsx"):
-    # Consumo mensal → agregamos por ano para simplificar o modelo
-    df = pd.read_excel(path, dtype={"Data": str})
-    df["Consumo"] = df["Consumo"].astype(float)
-    df["ano"] = df["Data"].str[:4].astype(int)
+def carregar_consumo(versao, path="input/Dados_abertos_Consumo_Mensal.xlsx"):
+    # Consumo mensal da EPE, lido em blocos e pré-agregado em disco por
+    # (ano, mês, UF, classe). Arquivo revisto é somado de novo por inteiro.
+    df = atualizar_agregado([path])
 
     # Mantemos só o recorte da série que faz sentido com os fatores
     df = df[df["ano"].between(2006, 2024)]
 
-    # Soma do consumo de todos os meses do ano
-    df_anual = df.groupby("ano")["Consumo"].sum().reset_index()
-    df_anual = df_anual.rename(columns={"Consumo": "consumo_total_MWh"})
+    # Soma do consumo de todos os meses, UFs e classes do ano
+    df_anual = df.groupby("ano")["consumo_MWh"].sum().reset_index()
+    df_anual = df_anual.rename(columns={"consumo_MWh": "consumo_total_MWh"})
     return df_anual
 
-fatores = carregar_fatores()
-consumo_anual = carregar_consumo()
+@st.cache_data
+def prever_consumo(versao, path="input/Dados_abertos_Consumo_Mensal.xlsx", ano_fim=2050):
+    # Previsão do consumo em todos os níveis (nacional, subsistema, UF,
+    # classe), ajustada de uma vez só e reconciliada (partes somam o total)
+    return prever_hierarquia(atualizar_agregado([path]), ano_fim)
+
+@st.cache_data
+def carregar_fatores_projetados(versao_fatores, versao_capacidade,
+                                path_fatores="input/fatores_emissao.csv",
+                                path_capacidade="input/CAPACIDADE_GERACAO.csv"):
+    # Fator de emissão ano a ano até 2050, evoluindo com as entradas e
+    # saídas de usinas do ONS. As versões (hash dos arquivos) entram só
+    # como chave do cache: a conta roda uma vez por versão dos dados.
+    return projetar_fatores(carregar_fatores(versao_fatores, path_fatores),
+                            carregar_capacidade(path_capacidade))
+
+@st.cache_data
+def carregar_fatores_regionais(versao_fatores, versao_capacidade,
+                               path_capacidade="input/CAPACIDADE_GERACAO.csv"):
+    # Fator por subsistema (SE, S, NE, N) × ano, também uma vez por versão
+    return fatores_regionais(
+        carregar_fatores_projetados(versao_fatores, versao_capacidade),
+        carregar_capacidade(path_capacidade)
+    )
+
+@st.cache_resource
+def observador_entradas():
+    # Um observador por processo, compartilhado por todas as sessões
+    return Observador().iniciar()
+
+# Arquivo(s) de que cada função depende, na ordem dos argumentos de versão
+observador = observador_entradas()
+observador.depende(carregar_fatores, "input/fatores_emissao.csv")
+observador.depende(carregar_consumo, "input/Dados_abertos_Consumo_Mensal.xlsx")
+observador.depende(prever_consumo, "input/Dados_abertos_Consumo_Mensal.xlsx")
+observador.depende(carregar_fatores_projetados,
+                   "input/fatores_emissao.csv", "input/CAPACIDADE_GERACAO.csv")
+observador.depende(carregar_fatores_regionais,
+                   "input/fatores_emissao.csv", "input/CAPACIDADE_GERACAO.csv")
+
+for arquivo, erro in observador.falhas().items():
+    st.warning(f"{arquivo} mudou mas não pôde ser lido ({erro}). Usando a versão anterior.")
+
+versao_fatores = observador.versao("input/fatores_emissao.csv")
+versao_consumo = observador.versao("input/Dados_abertos_Consumo_Mensal.xlsx")
+versao_capacidade = observador.versao("input/CAPACIDADE_GERACAO.csv")
+
+fatores = carregar_fatores(versao_fatores)
+consumo_anual = carregar_consumo(versao_consumo)
+consumo_previsto = prever_consumo(versao_consumo)
+fatores_projetados = carregar_fatores_projetados(versao_fatores, versao_capacidade)
 
 
 #############################################################
@@ -70,35 +139,18 @@ ultimo_ano_hist = df_final["ano"].max()
 
 
 #############################################################
-# 3) PREPARAÇÃO DO PROPHET
-# O Prophet exige uma coluna ds (datas) e y (série alvo).
-# A ideia é prever a emissão total do sistema, depois recortar
-# só a parte dos DCs.
+# 3) PREVISÃO PELOS DIRECIONADORES
+# Emissão total = consumo × fator. Em vez de prever a emissão
+# total direto, usamos a previsão do consumo (hierárquica) e o
+# fator projetado, e multiplicamos. Assim a emissão total e os
+# cenários dos DCs saem dos mesmos números.
 #############################################################
 
 @st.cache_data
-def preparar_prophet(df):
-    p = df.rename(columns={"ano": "ds", "emissao_total_tCO2": "y"})
-    # Jogamos tudo para 31/12 de cada ano, só pra ter uma data válida
-    p["ds"] = pd.to_datetime(p["ds"].astype(str) + "-12-31")
-    return p
-
-df_prophet = preparar_prophet(df_final)
+def montar_direcionadores(df_final, consumo_previsto, fatores_projetados):
+    return prever_direcionadores(df_final, consumo_previsto, fatores_projetados)
 
-@st.cache_resource
-def treinar(df):
-    # Modelo bem simples: só tendência, sem sazonalidade diária/semanal
-    # porque estamos trabalhando com dados anuais.
-    model = Prophet(
-        growth="linear",
-        daily_seasonality=False,
-        weekly_seasonality=False,
-        yearly_seasonality=False
-    )
-    model.fit(df)
-    return model
-
-model = treinar(df_prophet)
+direcionadores = montar_direcionadores(df_final, consumo_previsto, fatores_projetados)
 
 
 #############################################################
@@ -122,12 +174,14 @@ with col1:
 with col2:
     # Quanto dos dados centros vão representar no consumo nesse ano final?
     # Usamos esse valor como alvo da curva suave.
+    # Com key, a busca por meta (logo abaixo) consegue preencher o campo
+    st.session_state.setdefault("participacao_final", 3.6)
     participacao_final = st.number_input(
         f"Participação dos DCs em {ano_fim} (% do consumo):",
         min_value=0.0,
         max_value=100.0,
-        value=3.6,
-        step=0.1
+        step=0.1,
+        key="participacao_final"
     ) / 100  # já convertemos pra fração
 
 with col3:
@@ -136,33 +190,58 @@ with col3:
     show_emissao = st.checkbox("Emissões (tCO₂)", True)
     show_consumo = st.checkbox("Consumo (MWh)", True)
 
+with st.expander("Buscar a participação que cumpre uma meta de emissões"):
+    # A emissão dos DCs é linear na participação do ano final, então a
+    # participação máxima que cumpre a meta sai direto da conta
+    # (estimador/meta_emissao.py), sem ficar testando valor por valor
+    if ano_fim <= ultimo_ano_hist:
+        st.info(f"Escolha um ano final depois de {ultimo_ano_hist} para buscar uma meta.")
+    else:
+        tipo_meta = st.radio("Meta:", list(TIPOS), format_func=TIPOS.get, horizontal=True)
+
+        col_m1, col_m2, col_m3 = st.columns(3)
+        with col_m1:
+            meta = st.number_input("Limite de emissões dos DCs (tCO₂):", min_value=0.0,
+                                   value=2_000_000.0, step=100_000.0, format="%.0f")
+        with col_m2:
+            ano_de = st.number_input("Ano:" if tipo_meta == "ano" else "De:",
+                                     min_value=ultimo_ano_hist + 1, max_value=ano_fim,
+                                     value=ano_fim if tipo_meta == "ano" else ultimo_ano_hist + 1)
+        with col_m3:
+            ano_ate = None
+            if tipo_meta != "ano":
+                ano_ate = st.number_input("Até:", min_value=ano_de, max_value=ano_fim, value=ano_fim)
+
+        solucao = resolver(direcionadores, ano_inicio, ano_fim, meta, tipo_meta, ano_de, ano_ate)
+        st.dataframe(
+            solucao.assign(participacao_final=solucao["participacao_final"] * 100)
+                   .rename(columns={"participacao_final": f"participacao_max_{ano_fim}_%"}),
+            hide_index=True
+        )
+
+        # Arredonda para baixo (2 casas, como o campo): arredondar para
+        # cima poderia levar o gráfico para um pouco acima da meta
+        participacao_base = solucao.loc[solucao["cenario"] == "Base", "participacao_final"].iloc[0]
+        participacao_campo = np.floor(participacao_base * 100 * 100) / 100
+
+        def usar_participacao(valor):
+            st.session_state["participacao_final"] = valor
+
+        st.button(
+            f"Usar {participacao_campo:.2f}% (cenário Base) no gráfico"
+            if np.isfinite(participacao_base) else "Usar no gráfico",
+            on_click=usar_participacao,
+            args=(float(participacao_campo),) if np.isfinite(participacao_base) else None,
+            disabled=not np.isfinite(participacao_base)
+        )
+
 
 #############################################################
-# 5) PREVISÃO USANDO PROPHET
+# 5) PREVISÃO
+# Recorte dos direcionadores entre o primeiro ano e o ano final.
 #############################################################
 
-periods = ano_fim - ultimo_ano_hist
-future = model.make_future_dataframe(periods=periods, freq="YE")
-forecast = model.predict(future)
-
-previsao = forecast[["ds", "yhat"]].copy()
-previsao["ano"] = previsao["ds"].dt.year
-
-# Mantemos de 2006 até o ano final escolhido
-previsao = previsao[previsao["ano"].between(ano_inicio, ano_fim)]
-
-# Trazemos junto a série histórica de consumo e emissões reais
-previsao = previsao.merge(
-    df_final[["ano", "consumo_total_MWh", "emissao_total_tCO2"]],
-    on="ano", how="left"
-)
-
-# Onde não tem dado real, usamos o valor previsto pelo Prophet
-previsao["emissao_total_tCO2"] = previsao["emissao_total_tCO2"].fillna(previsao["yhat"])
-
-# Consumo elétrico: para frente, mantemos a última observação
-# (poderíamos prever também, mas aqui priorizamos simplicidade).
-previsao["consumo_total_MWh"] = previsao["consumo_total_MWh"].ffill()
+previsao = direcionadores[direcionadores["ano"].between(ano_inicio, ano_fim)].reset_index(drop=True)
 
 anos = previsao["ano"].values.astype(float)
 
@@ -175,12 +254,8 @@ anos = previsao["ano"].values.astype(float)
 # - e vai até o valor que o usuário escolheu no ano final.
 #############################################################
 
-def curva_suave(anos, alvo):
-    return np.interp(
-        anos,
-        [ano_inicio, 2024, ano_fim],
-        [0.003, 0.017, alvo]  # 0,3% em 2006 → 1,7% em 2024 → alvo no futuro
-    )
+# A conta fica em estimador/cenarios.py (curva_suave), para o gráfico
+# no navegador e outras páginas usarem exatamente a mesma regra.
 
 
 #############################################################
@@ -190,168 +265,322 @@ def curva_suave(anos, alvo):
 # Pessimista: maior participação (explosão de DCs)
 #############################################################
 
-cenarios = {
-    "Base": participacao_final,
-    "Otimista": participacao_final * 0.7,
-    "Pessimista": min(1.0, participacao_final * 1.3)  # nunca passa de 100%
-}
+cenarios = alvos(participacao_final)
 
-cenarios_detalhados = []
+# Para cada cenário: participação da curva × consumo total × fator
+# (o mesmo fator usado na emissão total, vindo dos direcionadores).
+# Tudo num único DataFrame para facilitar o plot.
+df_plot = calcular_cenarios(previsao, ano_inicio, ano_fim, participacao_final)
 
-for nome, alvo in cenarios.items():
 
-    # Começamos de uma cópia da previsão "macro" (malha inteira)
-    df_c = previsao.copy()
-    df_c["cenario"] = nome
+#############################################################
+# 8) GRÁFICO FINAL – HISTÓRICO + CENÁRIOS, DOIS EIXOS Y
+#############################################################
 
-    # Para cada cenário, geramos uma curva própria de participação
-    df_c["participacao_DC"] = curva_suave(anos, alvo)
+st.markdown("### Gráfico – Histórico e Cenários")
 
-    # Consumo dos DCs = consumo total * participação da curva
-    df_c["consumo_DC_MWh"] = df_c["consumo_total_MWh"] * df_c["participacao_DC"]
+# Modo instantâneo: os arrays base vão uma vez para o navegador e as
+# linhas dos cenários são refeitas lá (sem rerodar o script a cada mudança)
+modo_cliente = st.toggle(
+    "Modo instantâneo (cálculo no navegador)",
+    False,
+    help="Os controles ficam dentro do gráfico e não rerodam o app. "
+         "A tabela e o modo regional continuam usando os controles acima."
+)
 
-    # Precisamos novamente do fator de emissão para calcular só os DCs
-    df_c = df_c.merge(fatores, on="ano", how="left")
-    df_c["fator_emissao_tCO2_MWh"] = df_c["fator_emissao_tCO2_MWh"].ffill()
+@st.cache_data
+def montar_html_cliente(direcionadores, ano_inicio, ultimo_ano_hist, ano_fim,
+                        participacao_percentual, show_emissao, show_consumo):
+    return html_interativo(
+        dados_base(direcionadores, ano_inicio, ultimo_ano_hist),
+        ano_fim, participacao_percentual, show_emissao, show_consumo
+    )
 
-    # Emissão dos DCs = consumo dos DCs * fator de emissão
-    df_c["emissao_DC_tCO2"] = (
-        df_c["consumo_DC_MWh"] * df_c["fator_emissao_tCO2_MWh"]
+# Figura com todas as linhas, uma vez por combinação de ano final e
+# participação (a chave do cache é o próprio df_plot). Os checkboxes
+# só ligam/desligam linhas de uma cópia, sem refazer a figura.
+@st.cache_resource(max_entries=64)
+def figura_base(df_plot, ultimo_ano_hist):
+    return figura_cenarios(df_plot, ultimo_ano_hist)
+
+@st.cache_resource(max_entries=256)
+def figura_visivel(df_plot, ultimo_ano_hist, show_emissao, show_consumo):
+    return com_visibilidade(figura_base(df_plot, ultimo_ano_hist), show_emissao, show_consumo)
+
+if modo_cliente:
+    st.iframe(
+        montar_html_cliente(direcionadores, ano_inicio, ultimo_ano_hist, ano_fim,
+                            participacao_final * 100, show_emissao, show_consumo),
+        height=680
+    )
+else:
+    st.plotly_chart(
+        figura_visivel(df_plot, ultimo_ano_hist, show_emissao, show_consumo),
+        width='stretch'
     )
 
-    cenarios_detalhados.append(df_c)
 
-# Junta tudo em um único DataFrame para facilitar o plot
-df_plot = pd.concat(cenarios_detalhados, ignore_index=True)
+#############################################################
+# 9) TABELA FINAL
+# Por fim, mostramos a base consolidada pra quem quiser inspecionar
+# números exatos ou exportar depois.
+#############################################################
+
+st.markdown("### Tabela de Resultados")
+
+st.dataframe(df_plot[[
+    "ano", "cenario", "consumo_DC_MWh", "emissao_DC_tCO2"
+]])
+
+# Downloads: o arquivo só é gerado quando o botão é clicado (data=função),
+# escrito em blocos num arquivo temporário em disco
+col_formato, col_baixar = st.columns([1, 2], vertical_alignment="bottom")
+
+with col_formato:
+    formato = st.selectbox("Formato do arquivo:", formatos_disponiveis())
+extensao, mime = FORMATOS[formato]
+
+with col_baixar:
+    st.download_button(
+        "Baixar tabela completa (todos os cenários e colunas)",
+        data=lambda: arquivo_temporario([tabela_cenarios(df_plot)], formato),
+        file_name=f"cenarios_dc_{ano_fim}.{extensao}",
+        mime=mime,
+        on_click="ignore"
+    )
 
-# Série histórica "consolidada" dos DCs (pegamos o primeiro cenário só pra ter base),
-# porque até 2024 todos usam a mesma base de fatores e consumo.
-df_hist = df_plot[df_plot["ano"] <= ultimo_ano_hist].groupby("ano").first().reset_index()
+with st.expander("Exportar varredura de parâmetros"):
+    # Grade ano final × participação; cada combinação é calculada e
+    # escrita no arquivo uma de cada vez
+    anos_varredura = st.slider(
+        "Anos finais:", int(ultimo_ano_hist), 2050, (int(ultimo_ano_hist), 2050)
+    )
+    col_p1, col_p2, col_p3 = st.columns(3)
+    with col_p1:
+        p_min = st.number_input("Participação mínima (%):", 0.0, 100.0, 1.0, 0.5)
+    with col_p2:
+        p_max = st.number_input("Participação máxima (%):", 0.0, 100.0, 10.0, 0.5)
+    with col_p3:
+        p_passo = st.number_input("Passo (%):", 0.1, 100.0, 1.0, 0.1)
+
+    anos_fim_varredura = range(anos_varredura[0], anos_varredura[1] + 1)
+    participacoes_varredura = np.round(np.arange(p_min, p_max + p_passo / 2, p_passo), 4) / 100
+    st.caption(
+        f"{len(anos_fim_varredura) * len(participacoes_varredura)} combinações "
+        f"× {len(cenarios)} cenários"
+    )
+    linhas_total = linhas_varredura(direcionadores, ano_inicio, anos_fim_varredura, participacoes_varredura)
+    if formato == "Excel" and linhas_total > LIMITE_LINHAS_EXCEL - 1:
+        abas = -(-linhas_total // (LIMITE_LINHAS_EXCEL - 1))
+        st.info(
+            f"{linhas_total:,} linhas passam do limite de uma aba do Excel ({LIMITE_LINHAS_EXCEL:,}): "
+            f"o arquivo sai dividido em {abas} abas. Para uma varredura desse tamanho, "
+            "prefira CSV ou Parquet."
+        )
+
+    st.download_button(
+        "Baixar varredura",
+        data=lambda: arquivo_temporario(
+            varredura(direcionadores, ano_inicio, anos_fim_varredura, participacoes_varredura),
+            formato
+        ),
+        file_name=f"varredura_cenarios.{extensao}",
+        mime=mime,
+        on_click="ignore",
+        disabled=len(participacoes_varredura) == 0
+    )
 
 
 #############################################################
-# 8) GRÁFICO FINAL – HISTÓRICO + CENÁRIOS, DOIS EIXOS Y
+# 10) MODO REGIONAL
+# Os DCs não estão espalhados igualmente pelo país. Aqui o
+# consumo dos DCs é repartido entre estados/subsistemas com pesos
+# editáveis, e cada parte usa o fator do seu subsistema.
 #############################################################
 
-st.markdown("### Gráfico – Histórico e Cenários")
+st.markdown("### Emissões por Região")
+
+modo_regional = st.checkbox("Detalhar por estado/subsistema", False)
+
+if modo_regional:
+    colr1, colr2 = st.columns([1, 2])
+
+    with colr1:
+        nivel = st.radio("Agrupar por:", ["Subsistema", "Estado"], horizontal=True)
+        cenario_regional = st.selectbox("Cenário:", list(cenarios))
+
+        # Pesos por UF: não precisam somar 1, normalizamos depois
+        pesos_editados = st.data_editor(
+            pd.DataFrame({"UF": list(PESOS_DC_UF), "peso": list(PESOS_DC_UF.values())}),
+            num_rows="dynamic",
+            hide_index=True,
+            key="pesos_dc_uf"
+        )
+
+    try:
+        regioes, pesos, indice_sub = pesos_por_regiao(
+            dict(zip(pesos_editados["UF"], pesos_editados["peso"].fillna(0))), nivel
+        )
+    except ValueError as erro:
+        st.warning(str(erro))
+        regioes = []
+
+if modo_regional and regioes:
+    # Fator de cada região nos anos do gráfico
+    fator_sub = carregar_fatores_regionais(versao_fatores, versao_capacidade)
+    colunas_anos = anos.astype(int) - int(fatores_projetados["ano"].min())
+    fator_regiao = fator_sub[indice_sub][:, colunas_anos]
+
+    # Participação de cada cenário (cenários × anos)
+    participacao = np.stack([curva_suave(anos, ano_inicio, ano_fim, alvo) for alvo in cenarios.values()])
+
+    # Tensor (cenários × regiões × anos) numa única operação
+    consumo_reg, emissao_reg = emissoes_regionais(
+        previsao["consumo_total_MWh"].to_numpy(), participacao, pesos, fator_regiao
+    )
 
-fig = go.Figure()
-
-# ======================================================================
-# 1) HISTÓRICO – aparece ou não conforme o usuário marcou as opções
-# ======================================================================
-
-# Emissões históricas dos DCs
-if show_emissao:
-    fig.add_trace(go.Scatter(
-        x=df_hist["ano"],
-        y=df_hist["emissao_DC_tCO2"],
-        mode="lines+markers",
-        name="Histórico – Emissões",
-        line=dict(color="#FFA500", width=4),
-        marker=dict(color="#FFA500"),
-        yaxis="y"  # eixo de emissões
-    ))
-
-# Consumo histórico dos DCs
-if show_consumo:
-    fig.add_trace(go.Scatter(
-        x=df_hist["ano"],
-        y=df_hist["consumo_DC_MWh"],
-        mode="lines+markers",
-        name="Histórico – Consumo",
-        line=dict(color="#00CED1", width=4, dash="dot"),
-        marker=dict(color="#00CED1"),
-        yaxis="y2"  # eixo de consumo
-    ))
-
-
-# ======================================================================
-# 2) CENÁRIOS – mesmos eixos, mas com cores diferentes por cenário
-# ======================================================================
-
-cores = {"Base": "#1f77b4", "Otimista": "#2ca02c", "Pessimista": "#d62728"}
-
-for cenario in ["Base", "Otimista", "Pessimista"]:
-
-    df_c = df_plot[df_plot["cenario"] == cenario].copy()
-
-    # Conectamos o cenário com o último ponto histórico
-    df_last = df_hist.tail(1).copy()
-    df_last["cenario"] = cenario
-    df_c = pd.concat([df_last, df_c[df_c["ano"] > ultimo_ano_hist]])
-
-    if show_emissao:
-        fig.add_trace(go.Scatter(
-            x=df_c["ano"],
-            y=df_c["emissao_DC_tCO2"],
-            mode="lines+markers",
-            name=f"Emissões – {cenario}",
-            line=dict(color=cores[cenario], width=3),
-            yaxis="y"
-        ))
+    i_cen = list(cenarios).index(cenario_regional)
+
+    with colr2:
+        # Área empilhada: emissões de cada região ao longo do tempo
+        fig_reg = go.Figure()
+        for i, regiao in enumerate(regioes):
+            fig_reg.add_trace(go.Scatter(
+                x=anos.astype(int),
+                y=emissao_reg[i_cen, i],
+                mode="lines",
+                name=regiao,
+                stackgroup="emissoes"
+            ))
+        fig_reg.update_layout(
+            template="plotly_white",
+            hovermode="x unified",
+            xaxis=dict(title="Ano", tickmode="linear", dtick=1),
+            yaxis=dict(title="Emissões (tCO₂)"),
+            title=f"Emissões dos Data Centers por {nivel.lower()} – {cenario_regional}"
+        )
+        st.plotly_chart(fig_reg, width='stretch')
+
+    # Barras empilhadas: cenários lado a lado no ano final
+    fig_bar = go.Figure()
+    for i, regiao in enumerate(regioes):
+        fig_bar.add_trace(go.Bar(x=list(cenarios), y=emissao_reg[:, i, -1], name=regiao))
+    fig_bar.update_layout(
+        template="plotly_white",
+        barmode="stack",
+        yaxis=dict(title="Emissões (tCO₂)"),
+        title=f"Emissões dos Data Centers em {ano_fim} por cenário e {nivel.lower()}"
+    )
+    st.plotly_chart(fig_bar, width='stretch')
 
-    if show_consumo:
-        fig.add_trace(go.Scatter(
-            x=df_c["ano"],
-            y=df_c["consumo_DC_MWh"],
-            mode="lines+markers",
-            name=f"Consumo – {cenario}",
-            line=dict(color=cores[cenario], width=2, dash="dot"),
-            yaxis="y2"
-        ))
+    # Comparação com a conta nacional (um fator só pro país inteiro)
+    nacional = df_plot[(df_plot["cenario"] == cenario_regional) & (df_plot["ano"] == ano_fim)]
+    st.caption(
+        f"{cenario_regional}, {ano_fim}: {emissao_reg[i_cen, :, -1].sum():,.0f} tCO₂ com fatores "
+        f"regionais vs {nacional['emissao_DC_tCO2'].iloc[0]:,.0f} tCO₂ com o fator nacional."
+    )
 
 
-# ======================================================================
-# 3) LAYOUT FINAL – arruma eixos, legenda, título e deixa legível
-# ======================================================================
-
-fig.update_layout(
-    template="plotly_white",
-    hovermode="x unified",
-
-    xaxis=dict(
-        title="Ano",
-        tickmode="linear",
-        dtick=1
-    ),
-
-    yaxis=dict(
-        title="Emissões (tCO₂)",
-        showgrid=True,
-        zeroline=True
-    ),
-
-    yaxis2=dict(
-        title="Consumo (MWh)",
-        overlaying="y",
-        side="right",
-        showgrid=False
-    ),
-
-    legend=dict(
-        orientation="h",
-        yanchor="bottom",
-        y=1.06,
-        xanchor="center",
-        x=0.5
-    ),
-
-    font=dict(size=14),
-    title="Histórico vs Cenários – Emissões e Consumo dos Data Centers"
-)
+#############################################################
+# 11) PREVISÃO DO CONSUMO POR NÍVEL
+# Mesma previsão usada no gráfico principal, aberta por
+# subsistema, UF ou classe de consumo.
+#############################################################
 
-st.plotly_chart(fig, width='stretch')
+with st.expander("Previsão do consumo por nível"):
+    nivel_consumo = st.selectbox(
+        "Nível:", ["Nacional", "Subsistema", "UF", "Classe"], key="nivel_consumo"
+    )
+    df_nivel = consumo_previsto[
+        (consumo_previsto["nivel"] == nivel_consumo) & (consumo_previsto["ano"] <= ano_fim)
+    ]
+
+    fig_cons = go.Figure()
+    for serie, df_s in df_nivel.groupby("serie"):
+        fig_cons.add_trace(go.Scatter(
+            x=df_s["ano"],
+            y=df_s["consumo_MWh"],
+            mode="lines",
+            name=serie,
+            stackgroup=None if nivel_consumo == "Nacional" else "consumo"
+        ))
+    fig_cons.add_vline(x=ultimo_ano_hist + 0.5, line_dash="dot", line_color="gray")
+    fig_cons.update_layout(
+        template="plotly_white",
+        hovermode="x unified",
+        xaxis=dict(title="Ano"),
+        yaxis=dict(title="Consumo (MWh)"),
+        title=f"Consumo de energia – {nivel_consumo} (histórico + previsão)"
+    )
+    st.plotly_chart(fig_cons, width='stretch')
 
 
 #############################################################
-# 9) TABELA FINAL
-# Por fim, mostramos a base consolidada pra quem quiser inspecionar
-# números exatos ou exportar depois.
+# 12) SENSIBILIDADE
+# Quais hipóteses mais mexem nas emissões dos DCs? Índices de
+# Sobol sobre todas as entradas dos cenários (participações,
+# multiplicador, fator projetado, crescimento do consumo), com
+# milhares de amostras avaliadas de uma vez (estimador/sensibilidade.py).
 #############################################################
 
-st.markdown("### Tabela de Resultados")
-
-st.dataframe(df_plot[[
-    "ano", "cenario", "consumo_DC_MWh", "emissao_DC_tCO2"
-]])
\ No newline at end of file
+@st.cache_data
+def calcular_sensibilidade(direcionadores, ano_inicio, ultimo_ano_hist, ano_fim,
+                           participacao_final, metrica, variacao, n):
+    return analisar(direcionadores, ano_inicio, ultimo_ano_hist, ano_fim,
+                    participacao_final, metrica, variacao, n)
+
+
+with st.expander("Análise de sensibilidade"):
+    if ano_fim <= ultimo_ano_hist:
+        st.info(f"Escolha um ano final depois de {ultimo_ano_hist} para a análise de sensibilidade.")
+    # Só calcula quando pedido: fora disso o rerun dos controles não paga a análise
+    elif st.toggle("Calcular sensibilidade", key="calcular_sensibilidade"):
+        col_s1, col_s2, col_s3 = st.columns(3)
+        with col_s1:
+            metrica = st.radio("Métrica:", list(METRICAS), format_func=METRICAS.get)
+        with col_s2:
+            variacao = st.slider("Faixa de cada hipótese (± %):", 10, 50, 30, step=5) / 100
+        with col_s3:
+            n_amostras = st.selectbox("Amostras:", [1024, 4096, 16384], index=1)
+
+        sens = calcular_sensibilidade(direcionadores, ano_inicio, ultimo_ano_hist, ano_fim,
+                                      participacao_final, metrica, variacao, n_amostras)
+        nominal = sens["nominal"].iloc[0]
+
+        # Tornado: barra de cada hipótese do mínimo ao máximo da faixa,
+        # a mais importante (maior ST) em cima
+        ordem = sens.iloc[::-1]
+        fig_sens = go.Figure()
+        for coluna, nome, cor in [("no_minimo", "Hipótese no mínimo", "#2ca02c"),
+                                  ("no_maximo", "Hipótese no máximo", "#d62728")]:
+            fig_sens.add_trace(go.Bar(
+                y=ordem["rotulo"],
+                x=ordem[coluna] - nominal,
+                base=nominal,
+                orientation="h",
+                name=nome,
+                marker_color=cor,
+                # x é a diferença para o nominal (a barra começa em base);
+                # o valor da métrica vai no customdata
+                customdata=ordem[["ST", coluna]],
+                hovertemplate="%{y}: %{customdata[1]:,.0f} tCO₂ "
+                              "(Δ vs nominal: %{x:+,.0f} tCO₂; ST = %{customdata[0]:.2f})<extra></extra>"
+            ))
+        fig_sens.add_vline(x=nominal, line_dash="dot", line_color="gray")
+        fig_sens.update_layout(
+            template="plotly_white",
+            barmode="overlay",
+            xaxis=dict(title=METRICAS[metrica]),
+            title=f"Sensibilidade – {ano_fim} (cenário Base = {nominal:,.0f} tCO₂)"
+        )
+        st.plotly_chart(fig_sens, width='stretch')
+
+        st.caption(
+            "S1: parte da variância explicada só pela hipótese; ST: incluindo as interações. "
+            "No ano final a participação é o alvo, então a de 2024 só pesa no acumulado; "
+            "a do primeiro ano só muda o histórico e não pesa em nenhuma das duas."
+        )
+        st.dataframe(
+            sens[["rotulo", "minimo", "maximo", "S1", "ST", "no_minimo", "no_maximo"]],
+            hide_index=True
+        )
\ No newline at end of file
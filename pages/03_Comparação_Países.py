@@ -0,0 +1,191 @@
+#############################################################
+# Comparação entre países – emissões de Data Centers.
+# Mesma conta do dashboard (consumo × participação dos DCs ×
+# fator da rede), rodada para dezenas de países de uma vez.
+#############################################################
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from estimador.comparacao_paises import (
+    CENARIOS, PARTICIPACAO_DC_PADRAO, PARTICIPACAO_DC_PAIS,
+    emissoes_dc_paises, montar_matrizes, preparar_tabelas_owid
+)
+
+st.title("🌐 Comparação entre Países – Emissões de Data Centers")
+
+
+#############################################################
+# 1) CARREGAR DADOS
+# Consumo elétrico e intensidade de carbono da rede por país.
+#############################################################
+
+COLUNAS_USADAS = {
+    "country", "year", "iso_code",
+    "electricity_demand", "electricity_generation", "carbon_intensity_elec"
+}
+
+@st.cache_data
+def carregar_paises(path="input/World Energy Consumption.csv"):
+    df = pd.read_csv(path, usecols=lambda c: c in COLUNAS_USADAS)
+    return preparar_tabelas_owid(df)
+
+try:
+    consumo, fator = carregar_paises()
+except FileNotFoundError:
+    st.error("Arquivo 'input/World Energy Consumption.csv' não encontrado.")
+    st.stop()
+except ValueError as erro:
+    st.error(str(erro))
+    st.stop()
+
+# Último ano com consumo e fator para comparar todos na mesma base
+ano_ref = int(min(consumo["ano"].max(), fator["ano"].max()))
+ano_ini = max(2006, int(max(consumo["ano"].min(), fator["ano"].min())))
+
+@st.cache_data
+def preparar_matrizes(consumo, fator, ano_ini, ano_ref, ano_max=2050):
+    # Ajuste feito uma vez só até 2050; mudar o ano final só recorta
+    return montar_matrizes(consumo, fator, ano_ini, ano_ref, ano_max)
+
+paises, anos_todos, consumo_m, fator_m = preparar_matrizes(consumo, fator, ano_ini, ano_ref)
+
+if not paises:
+    st.warning("Nenhum país com série completa de consumo e fator.")
+    st.stop()
+
+
+#############################################################
+# 2) CONTROLES
+#############################################################
+
+st.markdown("### Configurações")
+
+col1, col2, col3 = st.columns([1, 1, 1])
+
+with col1:
+    ano_fim = st.number_input(
+        "Ano final da projeção:", min_value=ano_ref, max_value=2050, value=2030, step=1
+    )
+
+with col2:
+    # Quanto a participação atual de cada país cresce até o ano final
+    crescimento = st.number_input(
+        f"Participação em {ano_fim} (× a atual):", min_value=0.0, max_value=10.0,
+        value=2.0, step=0.1
+    )
+
+with col3:
+    cenario = st.selectbox("Cenário do ranking:", list(CENARIOS))
+    # Com 5 países ou menos não há o que escolher: o ranking mostra todos
+    if len(paises) > 5:
+        n_top = st.slider("Países no ranking:", 5, min(40, len(paises)), min(15, len(paises)))
+    else:
+        n_top = len(paises)
+
+with st.expander(f"Participação dos DCs no consumo em {ano_ref} (%)"):
+    tabela_part = st.data_editor(
+        pd.DataFrame({
+            "pais": paises,
+            "participacao_pct": [100 * PARTICIPACAO_DC_PAIS.get(p, PARTICIPACAO_DC_PADRAO) for p in paises]
+        }),
+        hide_index=True,
+        disabled=["pais"],
+        key="participacao_paises"
+    )
+
+
+#############################################################
+# 3) CÁLCULO – países × cenários × anos de uma vez
+#############################################################
+
+k = ano_fim - ano_ini + 1
+anos = anos_todos[:k]
+
+part_atual = tabela_part["participacao_pct"].fillna(0).clip(0, 100).to_numpy() / 100
+part_final = part_atual * crescimento
+
+participacao, consumo_dc, emissao_dc = emissoes_dc_paises(
+    consumo_m[:, :k], fator_m[:, :k], part_atual, part_final, anos, ano_ref
+)
+
+i_cen = list(CENARIOS).index(cenario)
+final = emissao_dc[:, :, -1]  # (países × cenários) no ano final
+
+
+#############################################################
+# 4) RANKING NO ANO FINAL
+# Barra = cenário escolhido; traço = faixa otimista–pessimista.
+#############################################################
+
+st.markdown(f"### Ranking – Emissões dos DCs em {ano_fim} ({cenario})")
+
+ordem = np.argsort(final[:, i_cen])[::-1][:n_top][::-1]
+i_oti, i_pes = list(CENARIOS).index("Otimista"), list(CENARIOS).index("Pessimista")
+
+fig_rank = go.Figure(go.Bar(
+    x=final[ordem, i_cen],
+    y=[paises[i] for i in ordem],
+    orientation="h",
+    marker_color=["#FFA500" if paises[i] == "Brazil" else "#1f77b4" for i in ordem],
+    error_x=dict(
+        type="data",
+        symmetric=False,
+        array=final[ordem, i_pes] - final[ordem, i_cen],
+        arrayminus=final[ordem, i_cen] - final[ordem, i_oti]
+    )
+))
+fig_rank.update_layout(
+    template="plotly_white",
+    xaxis=dict(title="Emissões dos DCs (tCO₂)"),
+    height=max(400, 28 * len(ordem)),
+    font=dict(size=14)
+)
+st.plotly_chart(fig_rank, width='stretch')
+
+
+#############################################################
+# 5) EVOLUÇÃO DOS PAÍSES ESCOLHIDOS
+#############################################################
+
+st.markdown("### Evolução ao longo do tempo")
+
+padrao = [paises[i] for i in ordem[::-1][:5]]
+if "Brazil" in paises and "Brazil" not in padrao:
+    padrao.append("Brazil")
+escolhidos = st.multiselect("Países:", paises, default=padrao)
+
+fig_linhas = go.Figure()
+for pais in escolhidos:
+    i = paises.index(pais)
+    fig_linhas.add_trace(go.Scatter(
+        x=anos, y=emissao_dc[i, i_cen], mode="lines+markers", name=pais
+    ))
+fig_linhas.add_vline(x=ano_ref + 0.5, line_dash="dot", line_color="gray")
+fig_linhas.update_layout(
+    template="plotly_white",
+    hovermode="x unified",
+    xaxis=dict(title="Ano"),
+    yaxis=dict(title="Emissões dos DCs (tCO₂)"),
+    title=f"Emissões dos Data Centers – {cenario}"
+)
+st.plotly_chart(fig_linhas, width='stretch')
+
+
+#############################################################
+# 6) TABELA
+#############################################################
+
+st.markdown("### Tabela de Resultados")
+
+resultado = pd.DataFrame({
+    "pais": paises,
+    "fator_tCO2_MWh": fator_m[:, k - 1],
+    "participacao_DC": participacao[:, i_cen, -1],
+    "consumo_DC_MWh": consumo_dc[:, i_cen, -1],
+    **{f"emissao_DC_tCO2 ({nome})": final[:, j] for j, nome in enumerate(CENARIOS)}
+}).sort_values(f"emissao_DC_tCO2 ({cenario})", ascending=False)
+
+st.dataframe(resultado, hide_index=True)
@@ -0,0 +1,129 @@
+#############################################################
+# Modelo de consumo de uma instalação (regressão linear).
+# Usa os dados horários de Energy_consumption.csv para estimar
+# quanto cada fator (temperatura, ocupação, HVAC...) pesa no
+# consumo, e simula cenários horários em lote.
+#############################################################
+
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from estimador.modelo_instalacao import (
+    COLUNAS_BINARIAS, COLUNAS_NUMERICAS, ajustar, codificar_dia, pontuar
+)
+
+st.title("🏢 Modelo de Consumo da Instalação")
+
+
+#############################################################
+# 1) DADOS E AJUSTE
+#############################################################
+
+@st.cache_data
+def carregar_dados(path="input/Energy_consumption.csv"):
+    df = pd.read_csv(path, parse_dates=["Timestamp"])
+    return df
+
+@st.cache_data
+def ajustar_modelo(df):
+    return ajustar(df)
+
+df = carregar_dados()
+modelo = ajustar_modelo(df)
+
+col1, col2, col3 = st.columns(3)
+col1.metric("R²", f"{modelo['r2']:.3f}")
+col2.metric("RMSE", f"{modelo['rmse']:.2f}")
+col3.metric("Horas usadas no ajuste", f"{modelo['n']:,}")
+
+coefs = pd.DataFrame({"variavel": modelo["colunas"], "coeficiente": modelo["coef"]})
+
+fig_coef = go.Figure(go.Bar(
+    x=coefs["coeficiente"][1:],
+    y=coefs["variavel"][1:],
+    orientation="h"
+))
+fig_coef.update_layout(
+    template="plotly_white",
+    xaxis=dict(title="Efeito no consumo (por unidade da variável)"),
+    title="Coeficientes da regressão"
+)
+st.plotly_chart(fig_coef, width='stretch')
+
+
+#############################################################
+# 2) CENÁRIOS HORÁRIOS
+# Repetimos o perfil observado por N horas e aplicamos os
+# ajustes do usuário. A conta é feita direto nos arrays.
+#############################################################
+
+st.markdown("### Simulação de Cenários")
+
+colc1, colc2, colc3 = st.columns(3)
+
+with colc1:
+    horas = st.select_slider(
+        "Horas simuladas:", options=[8_760, 87_600, 876_000, 4_380_000], value=87_600
+    )
+    delta_temp = st.slider("Variação de temperatura (°C):", -5.0, 5.0, 0.0, 0.5)
+
+with colc2:
+    fator_ocupacao = st.slider("Ocupação (× a observada):", 0.0, 2.0, 1.0, 0.1)
+    hvac_ligado = st.slider("Horas com HVAC ligado (%):", 0, 100,
+                            int(round(100 * (df["HVACUsage"] == "On").mean())))
+
+with colc3:
+    iluminacao_ligada = st.slider("Horas com iluminação ligada (%):", 0, 100,
+                                  int(round(100 * (df["LightingUsage"] == "On").mean())))
+    fator_renovavel = st.slider("Renovável (× a observada):", 0.0, 3.0, 1.0, 0.1)
+
+@st.cache_resource
+def perfil_base(df, horas):
+    # Perfil observado repetido até completar as horas pedidas, já em arrays.
+    # cache_resource: arrays grandes, só lidos; evita a cópia do cache_data.
+    idx = np.resize(np.arange(len(df)), horas)
+    base = {col: df[col].to_numpy(dtype=np.float32)[idx] for col in COLUNAS_NUMERICAS}
+    for col, positivo in COLUNAS_BINARIAS.items():
+        base[col] = (df[col].to_numpy() == positivo).astype(np.float32)[idx]
+    base["DayOfWeek"] = codificar_dia(df["DayOfWeek"])[idx]
+    # Sorteio fixo por hora, usado para ligar/desligar HVAC e iluminação
+    base["sorteio"] = np.random.default_rng(0).random(horas, dtype=np.float32)
+    return base
+
+base = perfil_base(df, horas)
+
+cenario = dict(base)
+cenario["Temperature"] = base["Temperature"] + delta_temp
+cenario["Occupancy"] = base["Occupancy"] * fator_ocupacao
+cenario["RenewableEnergy"] = base["RenewableEnergy"] * fator_renovavel
+cenario["HVACUsage"] = base["sorteio"] < hvac_ligado / 100
+cenario["LightingUsage"] = base["sorteio"] < iluminacao_ligada / 100
+
+inicio = time.perf_counter()
+consumo_base = pontuar(modelo, base)
+consumo_cenario = pontuar(modelo, cenario)
+duracao = time.perf_counter() - inicio
+
+colr1, colr2, colr3 = st.columns(3)
+colr1.metric("Consumo médio base", f"{consumo_base.mean():.2f}")
+colr2.metric("Consumo médio cenário", f"{consumo_cenario.mean():.2f}",
+             f"{100 * (consumo_cenario.mean() / consumo_base.mean() - 1):+.1f}%")
+colr3.metric("Vazão do cálculo", f"{2 * horas / duracao / 1e6:,.1f} M linhas/s")
+
+# Só a primeira semana no gráfico (o resto entra nas médias)
+semana = np.arange(min(168, horas))
+fig_sim = go.Figure()
+fig_sim.add_trace(go.Scatter(x=semana, y=consumo_base[semana], mode="lines", name="Base"))
+fig_sim.add_trace(go.Scatter(x=semana, y=consumo_cenario[semana], mode="lines", name="Cenário"))
+fig_sim.update_layout(
+    template="plotly_white",
+    hovermode="x unified",
+    xaxis=dict(title="Hora"),
+    yaxis=dict(title="Consumo previsto"),
+    title="Primeira semana simulada"
+)
+st.plotly_chart(fig_sim, width='stretch')
@@ -0,0 +1,119 @@
+#############################################################
+# Telemetria da instalação – estatísticas móveis.
+# Lê o armazenamento colunar (estimador/telemetria.py); na
+# primeira vez ele é criado a partir de Energy_consumption.csv.
+#############################################################
+
+import os
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+from estimador.janelas import JANELAS, estatisticas_moveis
+from estimador.telemetria import PASTA_PADRAO, abrir, agregar, converter_csv
+
+st.title("📈 Telemetria da Instalação")
+
+
+#############################################################
+# 1) CARREGAR TELEMETRIA
+#############################################################
+
+@st.cache_resource
+def criar_telemetria(pasta=PASTA_PADRAO, csv="input/Energy_consumption.csv"):
+    # Só na primeira vez (uma sessão converte, as outras esperam)
+    if not os.path.exists(os.path.join(pasta, "meta.json")):
+        converter_csv([csv], pasta)
+
+def versao_telemetria(pasta=PASTA_PADRAO):
+    # Tamanho e data do meta.json: mudam a cada bloco novo convertido
+    info = os.stat(os.path.join(pasta, "meta.json"))
+    return info.st_size, info.st_mtime_ns
+
+@st.cache_resource(max_entries=2)
+def abrir_telemetria(versao, pasta=PASTA_PADRAO):
+    # Um mapeamento por versão: dado novo abre de novo, com o nº de linhas atual
+    return abrir(pasta)
+
+@st.cache_data(max_entries=2)
+def series_horarias(versao, pasta=PASTA_PADRAO):
+    # Consumo e renovável por hora, numa grade horária contínua
+    dados, _ = abrir_telemetria(versao, pasta)
+    consumo = agregar(dados, "EnergyConsumption", "h")["soma"]
+    renovavel = agregar(dados, "RenewableEnergy", "h")["soma"]
+
+    grade = pd.date_range(consumo.index.min(), consumo.index.max(), freq="h")
+    df = pd.DataFrame({"consumo": consumo, "renovavel": renovavel}).reindex(grade)
+    # Horas sem medição: interpolamos entre as vizinhas
+    return df.interpolate(limit_area="inside")
+
+criar_telemetria()
+versao = versao_telemetria()
+dados, meta = abrir_telemetria(versao)
+horario = series_horarias(versao)
+
+st.caption(
+    f"{meta['linhas']:,} registros · {horario.index.min():%d/%m/%Y} a "
+    f"{horario.index.max():%d/%m/%Y} · {len(horario):,} horas"
+)
+
+
+#############################################################
+# 2) JANELAS MÓVEIS – todas calculadas numa passada
+#############################################################
+
+moveis = estatisticas_moveis(horario.index, horario["consumo"], horario["renovavel"])
+
+if not moveis:
+    st.warning("Série curta demais para as janelas móveis.")
+    st.stop()
+
+col1, col2 = st.columns([1, 3])
+
+with col1:
+    escolhidas = st.multiselect("Janelas:", list(moveis), default=list(moveis)[:1])
+    mostrar_horario = st.checkbox("Mostrar consumo horário", False)
+
+    # Resumo da janela mais longa disponível
+    ultima = moveis[list(moveis)[-1]].iloc[-1]
+    st.metric("Fator de carga (última janela)", f"{ultima['fator_carga']:.2f}")
+    st.metric("Participação renovável", f"{100 * ultima['participacao_renovavel']:.1f}%")
+
+with col2:
+    fig = make_subplots(
+        rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.08,
+        subplot_titles=("Consumo: média e pico móveis", "Fator de carga e participação renovável")
+    )
+
+    if mostrar_horario:
+        fig.add_trace(go.Scatter(
+            x=horario.index, y=horario["consumo"], mode="lines", name="Horário",
+            line=dict(color="lightgray", width=1)
+        ), row=1, col=1)
+
+    for nome in escolhidas:
+        df_j = moveis[nome]
+        fig.add_trace(go.Scatter(x=df_j.index, y=df_j["media"], mode="lines",
+                                 name=f"Média {nome.lower()}"), row=1, col=1)
+        fig.add_trace(go.Scatter(x=df_j.index, y=df_j["pico"], mode="lines",
+                                 name=f"Pico {nome.lower()}", line=dict(dash="dot")), row=1, col=1)
+        fig.add_trace(go.Scatter(x=df_j.index, y=df_j["fator_carga"], mode="lines",
+                                 name=f"Fator de carga {nome.lower()}"), row=2, col=1)
+        fig.add_trace(go.Scatter(x=df_j.index, y=df_j["participacao_renovavel"], mode="lines",
+                                 name=f"Renovável {nome.lower()}", line=dict(dash="dash")), row=2, col=1)
+
+    fig.update_layout(template="plotly_white", hovermode="x unified", height=650)
+    fig.update_yaxes(title_text="Consumo", row=1, col=1)
+    fig.update_yaxes(title_text="Fração", row=2, col=1)
+    st.plotly_chart(fig, width='stretch')
+
+
+#############################################################
+# 3) TABELA
+#############################################################
+
+with st.expander("Ver tabela das janelas móveis"):
+    nome_tabela = st.selectbox("Janela:", list(moveis), key="janela_tabela")
+    st.dataframe(moveis[nome_tabela].iloc[::max(1, JANELAS[nome_tabela] // 24)])
@@ -0,0 +1,145 @@
+#############################################################
+# Deslocamento de carga (carbon-aware).
+# Perfil horário de Energy_consumption.csv repetido por um ano,
+# fatores mensais do Inventário MCTI e um formato diário típico.
+# A parte flexível da carga vai para as horas mais limpas.
+#############################################################
+
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from estimador.arquivos import hash_arquivo
+from estimador.deslocamento_carga import deslocar_carga, fator_horario
+from estimador.fatores_mcti import ARQUIVO_FE, ARQUIVO_INVENTARIO, carregar, fatores_mensais
+
+st.title("🕒 Deslocamento de Carga para Horas Mais Limpas")
+
+
+#############################################################
+# 1) DADOS
+#############################################################
+
+@st.cache_data
+def carregar_carga(path="input/Energy_consumption.csv"):
+    df = pd.read_csv(path, usecols=["EnergyConsumption"])
+    # kWh → MWh
+    return df["EnergyConsumption"].to_numpy() / 1000
+
+@st.cache_data
+def versao_arquivo(path, assinatura):
+    # Hash da planilha, recalculado só quando tamanho/data mudam
+    # (assinatura só entra na chave do cache)
+    return hash_arquivo(path)
+
+def assinatura(path):
+    info = os.stat(path)
+    return info.st_size, info.st_mtime_ns
+
+@st.cache_data
+def carregar_fatores(versao):
+    # versao só entra na chave do cache (hash das planilhas do MCTI)
+    return fatores_mensais(carregar())
+
+carga_observada = carregar_carga()
+tabela_mensal = carregar_fatores(
+    versao_arquivo(ARQUIVO_FE, assinatura(ARQUIVO_FE))
+    + versao_arquivo(ARQUIVO_INVENTARIO, assinatura(ARQUIVO_INVENTARIO))
+)
+
+# Só anos com os 12 meses
+meses_por_ano = tabela_mensal.groupby("ano")["mes"].count()
+anos_completos = meses_por_ano[meses_por_ano == 12].index.tolist()
+
+
+#############################################################
+# 2) PARÂMETROS
+#############################################################
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    ano_fator = st.selectbox("Fatores mensais do ano:", anos_completos, index=len(anos_completos) - 1)
+    amplitude = st.slider("Variação do fator ao longo do dia (±%):", 0, 60, 30, 5)
+
+with col2:
+    participacao = st.slider("Carga flexível (%):", 0, 100, 20, 5)
+    horas_janela = st.select_slider("Janela para deslocar (horas):", options=[6, 12, 24, 48, 168], value=24)
+
+with col3:
+    folga = st.slider("Capacidade acima do pico atual (%):", 0, 100, 10, 5)
+    escala = st.number_input("Escala da instalação (× a carga observada):", 1.0, 100000.0, 1.0, 10.0)
+
+
+#############################################################
+# 3) SIMULAÇÃO
+#############################################################
+
+tempo = pd.date_range(f"{ano_fator}-01-01", f"{ano_fator}-12-31 23:00", freq="h")
+carga = np.resize(carga_observada, len(tempo)) * escala
+fator = fator_horario(tempo, tabela_mensal, amplitude=amplitude / 100)
+
+inicio = time.perf_counter()
+resultado = deslocar_carga(
+    carga, fator,
+    participacao_flexivel=participacao / 100,
+    capacidade=carga.max() * (1 + folga / 100),
+    horas_janela=horas_janela
+)
+duracao = time.perf_counter() - inicio
+
+colm1, colm2, colm3, colm4 = st.columns(4)
+colm1.metric("Emissão original", f"{resultado['emissao_original_tCO2']:,.2f} tCO₂")
+colm2.metric("Emissão com deslocamento", f"{resultado['emissao_deslocada_tCO2']:,.2f} tCO₂")
+colm3.metric("Evitado", f"{resultado['evitado_tCO2']:,.2f} tCO₂",
+             f"-{100 * resultado['evitado_tCO2'] / resultado['emissao_original_tCO2']:.1f}%",
+             delta_color="inverse")
+colm4.metric("Tempo de cálculo", f"{1000 * duracao:.1f} ms")
+
+st.caption(f"Energia deslocada no ano: {resultado['energia_deslocada']:,.1f} MWh "
+           f"de {carga.sum():,.1f} MWh consumidos.")
+
+
+#############################################################
+# 4) GRÁFICOS
+#############################################################
+
+# 52 semanas e um pedaço: a última semana é a que sobra do ano
+semana = st.slider("Semana do ano:", 1, math.ceil(len(tempo) / 168), 1)
+trecho = slice((semana - 1) * 168, min(semana * 168, len(tempo)))
+
+fig = go.Figure()
+fig.add_trace(go.Scatter(x=tempo[trecho], y=resultado["carga_original"][trecho],
+                         mode="lines", name="Carga original"))
+fig.add_trace(go.Scatter(x=tempo[trecho], y=resultado["carga_deslocada"][trecho],
+                         mode="lines", name="Carga deslocada"))
+fig.add_trace(go.Scatter(x=tempo[trecho], y=fator[trecho], mode="lines", name="Fator de emissão",
+                         line=dict(dash="dot", color="gray"), yaxis="y2"))
+fig.update_layout(
+    template="plotly_white",
+    hovermode="x unified",
+    yaxis=dict(title="Carga (MWh/h)"),
+    yaxis2=dict(title="tCO₂/MWh", overlaying="y", side="right", showgrid=False),
+    title=f"Semana {semana} de {ano_fator}"
+)
+st.plotly_chart(fig, width='stretch')
+
+# Emissão evitada por mês
+mensal = pd.DataFrame({
+    "mes": tempo.month,
+    "evitado": (resultado["carga_original"] - resultado["carga_deslocada"]) * fator,
+}).groupby("mes")["evitado"].sum()
+
+fig_mes = go.Figure(go.Bar(x=mensal.index, y=mensal.values))
+fig_mes.update_layout(
+    template="plotly_white",
+    xaxis=dict(title="Mês", dtick=1),
+    yaxis=dict(title="tCO₂ evitadas"),
+    title="Emissão evitada por mês"
+)
+st.plotly_chart(fig_mes, width='stretch')
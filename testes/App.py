@@ -1,10 +1,23 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 
-from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
+
+from cache_previsao import CacheLRU
+from cubo_energia import montar_cubo, serie_global, serie_pais
+from previsao_paises import (
+    ARQUIVO_PREVISOES, carregar_previsoes, preparar_serie, previsoes_do_pais, treinar_pais
+)
+
+# Quantos países ficam com modelo/previsão em memória e onde gravar
+# em disco (None = só memória)
+MAX_PAISES_CACHE = 8
+PASTA_CACHE = "./cache/previsoes"
 
 # --- Configuração da Página ---
 st.set_page_config(page_title="Análise de Energia", layout="wide")
@@ -12,27 +25,27 @@ st.set_page_config(page_title="Análise de Energia", layout="wide")
 st.title("⚡ Dashboard de de Energia Global")
 
 # --- 1. Carregamento de Dados com Cache ---
-# O @st.cache_data faz com que o arquivo não seja recarregado a cada clique, melhorando a performance
-@st.cache_data
+# O arquivo vira um cubo país × ano × métrica (só as colunas usadas, em float32).
+# cache_resource: o cubo é montado uma vez e compartilhado, sem cópia a cada clique.
+@st.cache_resource
 def load_data():
     # Tenta carregar do caminho local especificado
     try:
-        df = pd.read_csv('./input/World Energy Consumption.csv')
-        return df
+        return montar_cubo('./input/World Energy Consumption.csv')
     except FileNotFoundError:
         st.error("Arquivo './input/World Energy Consumption.csv' não encontrado.")
         return None
 
-df = load_data()
+cubo = load_data()
 
-if df is None:
+if cubo is None:
     st.error("Erro: Arquivo './input/World Energy Consumption.csv' não encontrado.")
     st.stop()
 
 # --- ANÁLISE GLOBAL ---
 st.header("1. Consumo Global")
 
-global_energy = df.groupby('year')['primary_energy_consumption'].sum().reset_index()
+global_energy = serie_global(cubo)
 
 # Criar a figura explicitamente para o Streamlit
 fig1, ax1 = plt.subplots(figsize=(10, 6))
@@ -47,53 +60,111 @@ st.pyplot(fig1)
 
 st.markdown("---")
 
+# --- CACHE DE PREVISÕES POR PAÍS ---
+# Um único cache por processo do servidor (compartilhado entre sessões).
+# Voltar para um país já visto não treina o Prophet de novo.
+@st.cache_resource
+def obter_cache():
+    return CacheLRU(capacidade=MAX_PAISES_CACHE, pasta=PASTA_CACHE)
+
+# Conversão para o disco: o Prophet recomenda serializar em JSON
+def salvar_resultado(resultado):
+    return {'modelo': model_to_json(resultado['modelo']), 'previsoes': resultado['previsoes']}
+
+def carregar_resultado(dados):
+    return {'modelo': model_from_json(dados['modelo']), 'previsoes': dados['previsoes']}
+
+cache = obter_cache()
+
+# --- PREVISÕES PRÉ-CALCULADAS ---
+# Geradas fora do app por `python previsao_paises.py` (todos os países de uma vez).
+# Se o arquivo existir, o app só lê os resultados, sem treinar nada.
+# A data de modificação entra na chave: arquivo novo → leitura nova.
+@st.cache_resource
+def obter_previsoes_precomputadas(path, modificado_em):
+    return carregar_previsoes(path)
+
+precomputadas = None
+if os.path.exists(ARQUIVO_PREVISOES):
+    precomputadas = obter_previsoes_precomputadas(
+        ARQUIVO_PREVISOES, os.path.getmtime(ARQUIVO_PREVISOES)
+    )
+
+def plotar_previsao(previsoes):
+    # Mesmo visual do modelo.plot() do Prophet, a partir das colunas salvas
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(previsoes['ds'], previsoes['y'], 'k.', label='Observado')
+    ax.plot(previsoes['ds'], previsoes['yhat'], ls='-', c='#0072B2', label='Previsão')
+    ax.fill_between(previsoes['ds'], previsoes['yhat_lower'], previsoes['yhat_upper'],
+                    color='#0072B2', alpha=0.2)
+    ax.set_xlabel('ds')
+    ax.set_ylabel('y')
+    ax.grid(True, which='major', c='gray', ls='-', lw=1, alpha=0.2)
+    fig.tight_layout()
+    return fig
+
 # --- ANÁLISE POR PAÍS COM PROPHET ---
 st.header("2. Previsão por País (Prophet)")
 
 # Interatividade: Escolha o país
-lista_paises = df['country'].unique()
+lista_paises = cubo['paises']
 # Tenta definir o padrão como Brazil, se existir
 index_padrao = list(lista_paises).index('Brazil') if 'Brazil' in lista_paises else 0
 pais = st.selectbox("Selecione o país para análise:", lista_paises, index=index_padrao)
 
-# Filtra o país
-dados_pais = df[df['country'] == pais]
+# Fatia do país no cubo
+dados_pais = serie_pais(cubo, pais)
+
+# Tratamento dos dados (mesma função usada no cálculo em lote)
+dados_validos = preparar_serie(dados_pais)
+previsoes = None
 
 # Verifica se há dados suficientes
-if dados_pais['primary_energy_consumption'].sum() == 0:
+if dados_validos is None:
     st.warning(f"O país {pais} não possui dados de consumo válidos.")
-else:
-    # Lógica original de tratamento de dados
-    primeiro_ano_valido = dados_pais.loc[
-        dados_pais['primary_energy_consumption'] > 0, 'year'
-    ].min()
+elif precomputadas is not None and pais in precomputadas['falhas']:
+    st.warning(f"Não foi possível prever {pais}: {precomputadas['falhas'][pais]}")
+elif precomputadas is not None and pais in precomputadas['indice']:
+    st.write(f"**Primeiro ano com consumo > 0:** {dados_validos['ds'].min().year}")
 
-    st.write(f"**Primeiro ano com consumo > 0:** {primeiro_ano_valido}")
+    # Só leitura: fatia do arquivo pré-calculado
+    previsoes = previsoes_do_pais(precomputadas, pais)
 
-    dados_validos = dados_pais[
-        dados_pais['year'] >= primeiro_ano_valido
-    ][['year', 'primary_energy_consumption']].dropna()
+    st.subheader("Tendência Gerada pelo Prophet")
+    st.pyplot(plotar_previsao(previsoes))
+else:
+    st.write(f"**Primeiro ano com consumo > 0:** {dados_validos['ds'].min().year}")
+    st.info("Sem previsão pré-calculada para este país: treinando aqui. "
+            "Rode `python previsao_paises.py` para calcular todos de uma vez.")
 
-    # Preparação para o Prophet
-    dados_validos = dados_validos.rename(columns={'year': 'ds', 'primary_energy_consumption': 'y'})
-    dados_validos['ds'] = pd.to_datetime(dados_validos['ds'], format='%Y')
+    # A chave leva um hash dos dados: se o CSV mudar, o país é treinado de novo
+    chave = (pais, int(pd.util.hash_pandas_object(dados_validos, index=False).sum()))
 
-    # Treinamento do Modelo (com spinner de carregamento)
+    # Treinamento do Modelo (com spinner de carregamento) – só se não estiver no cache
     with st.spinner('Treinando o modelo Prophet...'):
-        modelo = Prophet()
-        modelo.fit(dados_validos)
-
-        # Gera datas futuras (20 anos)
-        # Nota: freq='YE' é para pandas novos. Se der erro, use freq='Y'
-        datas_futuras = modelo.make_future_dataframe(periods=20, freq='YE') 
-        previsoes = modelo.predict(datas_futuras)
-
-    # Plot 1: Componentes do Prophet
+        resultado = cache.obter(
+            chave,
+            lambda: treinar_pais(dados_validos),
+            salvar=salvar_resultado,
+            carregar=carregar_resultado
+        )
+    modelo = resultado['modelo']
+    previsoes = resultado['previsoes']
+
+    st.caption(
+        f"Cache de previsões: {cache.taxa_acerto:.0%} de acerto "
+        f"({cache.acertos_memoria} em memória, {cache.acertos_disco} do disco, "
+        f"{cache.falhas} treinos) · {len(cache.itens)}/{cache.capacidade} países em memória"
+    )
+
+    # Plot 1: Componentes do Prophet (a figura também fica guardada junto)
     st.subheader("Tendência Gerada pelo Prophet")
-    fig2 = modelo.plot(previsoes)
-    st.pyplot(fig2)
+    if 'fig' not in resultado:
+        resultado['fig'] = modelo.plot(previsoes)
+    st.pyplot(resultado['fig'])
 
-    # Plot 2: Comparação Real vs Futuro (Seu gráfico customizado)
+# Plot 2: Comparação Real vs Futuro (Seu gráfico customizado)
+if previsoes is not None:
     st.subheader("Visualização: Histórico vs Previsão")
     
     ultimo_ano = dados_validos['ds'].max().year
@@ -0,0 +1,80 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+# --- Cache LRU de modelos/previsões por país ---
+# Guarda no máximo `capacidade` países em memória; quando passa disso,
+# o país usado há mais tempo sai. Se `pasta` for informada, cada
+# resultado também é gravado em disco e volta de lá sem precisar
+# treinar de novo (mesmo depois de reiniciar o app). O disco segue o
+# mesmo limite: ao gravar um arquivo novo, os mais antigos (mtime) saem.
+class CacheLRU:
+
+    def __init__(self, capacidade=8, pasta=None):
+        self.capacidade = capacidade
+        self.pasta = pasta
+        self.itens = OrderedDict()
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self.trava = threading.Lock()
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+    def _aparar_disco(self):
+        # Mantém só os `capacidade` arquivos usados mais recentemente
+        caminhos = [os.path.join(self.pasta, n) for n in os.listdir(self.pasta) if n.endswith(".pkl")]
+        caminhos.sort(key=os.path.getmtime, reverse=True)
+        for caminho in caminhos[self.capacidade:]:
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass  # outra sessão já apagou
+
+    def _arquivo(self, chave):
+        nome = "_".join(str(parte) for parte in chave)
+        nome = "".join(c if c.isalnum() or c in "-_" else "_" for c in nome)
+        return os.path.join(self.pasta, f"{nome}.pkl")
+
+    def _guardar(self, chave, valor):
+        self.itens[chave] = valor
+        self.itens.move_to_end(chave)
+        while len(self.itens) > self.capacidade:
+            self.itens.popitem(last=False)
+
+    def obter(self, chave, calcular, salvar=None, carregar=None):
+        # calcular(): gera o valor quando não está em cache nenhum
+        # salvar(valor) / carregar(dados): conversão para o disco
+        # (o padrão é gravar o próprio valor com pickle)
+        with self.trava:
+            if chave in self.itens:
+                self.acertos_memoria += 1
+                self.itens.move_to_end(chave)
+                return self.itens[chave]
+
+        if self.pasta and os.path.exists(self._arquivo(chave)):
+            with open(self._arquivo(chave), "rb") as f:
+                dados = pickle.load(f)
+            os.utime(self._arquivo(chave))  # usado agora: fica por último na fila do disco
+            valor = carregar(dados) if carregar else dados
+            with self.trava:
+                self.acertos_disco += 1
+                self._guardar(chave, valor)
+            return valor
+
+        valor = calcular()
+        if self.pasta:
+            with open(self._arquivo(chave), "wb") as f:
+                pickle.dump(salvar(valor) if salvar else valor, f)
+            self._aparar_disco()
+        with self.trava:
+            self.falhas += 1
+            self._guardar(chave, valor)
+        return valor
+
+    @property
+    def taxa_acerto(self):
+        total = self.acertos_memoria + self.acertos_disco + self.falhas
+        return (self.acertos_memoria + self.acertos_disco) / total if total else 0.0
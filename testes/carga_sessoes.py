@@ -0,0 +1,248 @@
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+
+# --- Teste de carga: várias sessões ao mesmo tempo ---
+# Sobe uma instância do app (streamlit run Apresentação.py) e abre
+# várias sessões nela pelo mesmo websocket que o navegador usa. Cada
+# sessão simulada abre a Apresentação, vai para o Dashboard e segue
+# um roteiro de interações (muda o ano final, a participação, liga/
+# desliga as linhas do gráfico), esperando cada rerun terminar.
+#
+# O AppTest não serve aqui: cada run troca o Runtime global do
+# Streamlit, então duas sessões ao mesmo tempo no mesmo processo se
+# atrapalham. Com o servidor de verdade, o cache, as threads dos
+# scripts e o GIL são os mesmos que os analistas vão encontrar.
+#
+# Para cada nível de concorrência mostramos a latência de cada rerun
+# (p50/p95/p99, do envio até o script terminar), reruns por segundo e
+# a memória (RSS) do processo do servidor.
+#
+# Uso (da raiz do projeto):
+#   python testes/carga_sessoes.py [niveis] [passos]
+#   python testes/carga_sessoes.py 1,2,4,8,16 10
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP = 'Apresentação.py'
+PAGINA = 'Dashboard'   # pages/01_Dashboard.py
+
+TIMEOUT = 300  # s por rerun; a primeira execução ajusta os modelos
+
+
+# --- Servidor ---
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def subir_servidor(porta=None):
+    # Devolve (processo, porta) quando o /_stcore/health responde
+    porta = porta or _porta_livre()
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP,
+         '--server.headless', 'true', '--server.port', str(porta),
+         '--browser.gatherUsageStats', 'false'],
+        cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limite = time.perf_counter() + 60
+    while time.perf_counter() < limite:
+        try:
+            with urllib.request.urlopen(f'http://localhost:{porta}/_stcore/health', timeout=1):
+                return processo, porta
+        except OSError:
+            if processo.poll() is not None:
+                raise RuntimeError('streamlit run terminou antes de responder')
+            time.sleep(0.2)
+    processo.kill()
+    raise TimeoutError('o servidor não respondeu em 60 s')
+
+
+def rss_mb(pid):
+    # Memória residente do processo (Linux: /proc); None fora do Linux
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+# --- Sessão simulada ---
+# O navegador manda, a cada rerun, a página e o estado dos widgets que
+# o usuário mexeu. Os widgets são achados pelo começo do rótulo (o da
+# participação muda com o ano final) e o id vem das mensagens da
+# última execução.
+
+ROTEIRO = [
+    ('number_input', 'Ano final da projeção', lambda rng: int(rng.integers(2025, 2051))),
+    ('number_input', 'Participação dos DCs', lambda rng: round(float(rng.uniform(0.5, 15)), 1)),
+    ('checkbox', 'Emissões', lambda rng: bool(rng.integers(2))),
+    ('checkbox', 'Consumo', lambda rng: bool(rng.integers(2))),
+]
+
+
+class Sessao:
+    def __init__(self, porta):
+        self.url = f'ws://localhost:{porta}/_stcore/stream'
+        self.ws = None
+        self.widgets = {}   # rótulo → (tipo, proto do widget) da última execução
+        self.valores = {}   # começo do rótulo → (tipo, valor) escolhido pelo usuário
+
+    async def abrir(self):
+        self.ws = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+
+    async def fechar(self):
+        await self.ws.close()
+
+    def _estado(self, mensagem):
+        for prefixo, (tipo, valor) in self.valores.items():
+            rotulo = next((r for r in self.widgets if r.startswith(prefixo)), None)
+            if rotulo is None:
+                continue
+            _, widget = self.widgets[rotulo]
+            estado = mensagem.rerun_script.widget_states.widgets.add()
+            estado.id = widget.id
+            if tipo == 'checkbox':
+                estado.bool_value = valor
+            elif widget.data_type == widget.INT:
+                estado.int_value = int(valor)
+            else:
+                estado.double_value = float(valor)
+
+    async def rerun(self, pagina=PAGINA):
+        # Manda o rerun e espera o script terminar; devolve a duração (s)
+        mensagem = BackMsg()
+        mensagem.rerun_script.page_name = pagina
+        self._estado(mensagem)
+
+        inicio = time.perf_counter()
+        await self.ws.send(mensagem.SerializeToString())
+        widgets = {}
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await asyncio.wait_for(self.ws.recv(), TIMEOUT))
+            tipo_msg = msg.WhichOneof('type')
+
+            if tipo_msg == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                elemento = msg.delta.new_element
+                tipo = elemento.WhichOneof('type')
+                if tipo == 'exception':
+                    raise RuntimeError(f'{pagina}: {elemento.exception.message}')
+                if tipo in ('number_input', 'checkbox'):
+                    widget = getattr(elemento, tipo)
+                    widgets[widget.label] = (tipo, widget)
+
+            elif tipo_msg == 'script_finished':
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError(f'{pagina}: erro de compilação')
+                if msg.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                    break
+
+        self.widgets = widgets
+        return time.perf_counter() - inicio
+
+    def mexer(self, passo, rng):
+        tipo, prefixo, valor = ROTEIRO[passo % len(ROTEIRO)]
+        self.valores[prefixo] = (tipo, valor(rng))
+
+
+async def sessao(porta, passos, semente):
+    # Apresentação → Dashboard → passos interações.
+    # Devolve a latência (s) de cada execução do Dashboard.
+    rng = np.random.default_rng(semente)
+    s = Sessao(porta)
+    await s.abrir()
+    try:
+        await s.rerun(pagina='')
+        latencias = [await s.rerun()]
+        for i in range(passos):
+            s.mexer(i, rng)
+            latencias.append(await s.rerun())
+    finally:
+        await s.fechar()
+    return latencias
+
+
+# --- Níveis de concorrência ---
+
+async def nivel(porta, pid, n_sessoes, passos, semente=0):
+    amostras_rss = []
+
+    async def medir_memoria():
+        while True:
+            amostras_rss.append(rss_mb(pid))
+            await asyncio.sleep(0.05)
+
+    medidor = asyncio.create_task(medir_memoria())
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(
+        sessao(porta, passos, semente + i) for i in range(n_sessoes)
+    ))
+    duracao = time.perf_counter() - inicio
+    medidor.cancel()
+
+    # A primeira execução de cada sessão (abrir a página) fica separada
+    # das interações, que são o que o analista sente a cada clique
+    abertura = np.array([r[0] for r in resultados]) * 1000
+    reruns = np.array([x for r in resultados for x in r[1:]]) * 1000
+    p50, p95, p99 = np.percentile(reruns, [50, 95, 99]) if len(reruns) else (np.nan,) * 3
+    rss = [m for m in amostras_rss if m is not None]
+
+    return {
+        'sessoes': n_sessoes,
+        'reruns': len(reruns),
+        'abertura_ms': float(abertura.max()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'reruns_por_s': (len(reruns) + n_sessoes) / duracao,
+        'rss_mb': max(rss) if rss else float('nan'),
+    }
+
+
+def executar(niveis=(1, 2, 4, 8), passos=10, porta=None):
+    processo, porta = subir_servidor(porta)
+    try:
+        async def rodar():
+            # Aquecimento: a primeira sessão ajusta os modelos e enche o
+            # cache. Os níveis medem a instância já aquecida (o caso normal).
+            inicio = time.perf_counter()
+            await sessao(porta, 0, semente=10_000)
+            print(f'aquecimento (cache frio): {time.perf_counter() - inicio:.1f} s | '
+                  f'RSS {rss_mb(processo.pid) or float("nan"):.0f} MB')
+
+            resultados = []
+            for n in niveis:
+                r = await nivel(porta, processo.pid, n, passos)
+                resultados.append(r)
+                print(f'{r["sessoes"]:>3} sessões | {r["reruns"]:>4} reruns | '
+                      f'abertura {r["abertura_ms"]:7.0f} ms | '
+                      f'p50 {r["p50_ms"]:6.0f} ms | p95 {r["p95_ms"]:6.0f} ms | '
+                      f'p99 {r["p99_ms"]:6.0f} ms | {r["reruns_por_s"]:5.1f} reruns/s | '
+                      f'RSS {r["rss_mb"]:6.0f} MB')
+            return resultados
+
+        return asyncio.run(rodar())
+    finally:
+        processo.terminate()
+        processo.wait()
+
+
+if __name__ == '__main__':
+    niveis = [int(n) for n in sys.argv[1].split(',')] if len(sys.argv) > 1 else [1, 2, 4, 8]
+    passos = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    executar(niveis, passos)
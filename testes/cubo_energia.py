@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+
+# --- Cubo país × ano × métrica ---
+# Em vez de guardar o CSV inteiro (centenas de colunas) e filtrar/agrupar
+# a cada interação, lemos só as colunas usadas, em float32, e montamos um
+# array 3D. Escolher um país vira uma fatia e o total global já fica pronto.
+
+METRICAS = ['primary_energy_consumption']
+
+
+def montar_cubo(path, metricas=METRICAS):
+    df = pd.read_csv(
+        path,
+        usecols=['country', 'year'] + metricas,
+        dtype={m: np.float32 for m in metricas}
+    )
+
+    # factorize mantém a ordem em que os países aparecem no arquivo
+    codigos, paises = pd.factorize(df['country'])
+    anos = np.arange(df['year'].min(), df['year'].max() + 1)
+
+    cubo = np.full((len(paises), len(anos), len(metricas)), np.nan, dtype=np.float32)
+    cubo[codigos, df['year'].to_numpy() - anos[0], :] = df[metricas].to_numpy()
+
+    # Soma de todos os países por ano (mesma conta do groupby('year').sum())
+    total_global = np.nansum(cubo, axis=0)
+
+    # Só leitura: o cubo é compartilhado entre as sessões
+    cubo.flags.writeable = False
+    total_global.flags.writeable = False
+
+    return {
+        'paises': np.asarray(paises),
+        'indice_pais': {p: i for i, p in enumerate(paises)},
+        'anos': anos,
+        'metricas': list(metricas),
+        'cubo': cubo,
+        'total_global': total_global,
+    }
+
+
+def serie_pais(cubo, pais, metrica=METRICAS[0]):
+    # Fatia de um país no formato de DataFrame (year, métrica)
+    i = cubo['indice_pais'][pais]
+    j = cubo['metricas'].index(metrica)
+    return pd.DataFrame({'year': cubo['anos'], metrica: cubo['cubo'][i, :, j]})
+
+
+def serie_global(cubo, metrica=METRICAS[0]):
+    j = cubo['metricas'].index(metrica)
+    return pd.DataFrame({'year': cubo['anos'], metrica: cubo['total_global'][:, j]})
@@ -0,0 +1,204 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# --- Frota de data centers por coorte ---
+# Em vez de interpolar "nº de DCs" e "consumo médio" entre dois anos,
+# simulamos cada instalação: ano de construção, capacidade de TI,
+# vida útil, rampa de utilização e PUE. Tudo fica em arrays (um valor
+# por instalação), nada de objeto Python por DC, e a conta ano a ano
+# é feita por coorte (ano de construção), numa matriz coortes × anos.
+
+HORAS_ANO = 8760
+
+PARAMETROS_PADRAO = {
+    'vida_util_media': 15,      # anos
+    'forma_weibull': 3.0,       # >1: aposentadoria concentrada perto da média
+    'anos_rampa': 3,            # anos até chegar na utilização máxima
+    'utilizacao_maxima': 0.7,   # fração da capacidade de TI em uso
+    'pue_inicio': 1.8,          # PUE de quem é construído no ano inicial
+    'pue_fim': 1.3,             # PUE de quem é construído no ano final
+    'melhoria_pue_anual': 0.005,
+    'pue_minimo': 1.1,
+    'dispersao_capacidade': 0.5,  # desvio do log da capacidade
+    'semente': 0,
+}
+
+
+def _escala_weibull(media, forma):
+    # Escala da Weibull que dá a vida útil média pedida
+    from math import gamma
+    return media / gamma(1 + 1 / forma)
+
+
+def sobrevivencia(idade, media, forma):
+    # Fração das instalações ainda ativas com essa idade
+    escala = _escala_weibull(media, forma)
+    return np.exp(-(np.maximum(idade, 0) / escala) ** forma)
+
+
+def construcoes_por_ano(anos, alvo, n_inicial, p):
+    # Quantos DCs entram em cada ano para a frota seguir o alvo,
+    # repondo os que se aposentam (sobrevivência esperada).
+    # A frota inicial tem idades uniformes entre 0 e a vida útil média.
+    T = len(anos)
+    idade_ini = np.arange(p['vida_util_media'])
+    s0 = sobrevivencia(idade_ini, p['vida_util_media'], p['forma_weibull'])
+
+    # Sobreviventes da frota inicial em cada ano (sobrevivência condicional)
+    futuros = sobrevivencia(idade_ini[:, None] + np.arange(T)[None, :],
+                            p['vida_util_media'], p['forma_weibull'])
+    restantes_ini = n_inicial / len(idade_ini) * (futuros / s0[:, None]).sum(axis=0)
+
+    s = sobrevivencia(np.arange(T), p['vida_util_media'], p['forma_weibull'])
+    novos = np.zeros(T)
+    for t in range(1, T):
+        ativos = restantes_ini[t] + novos[:t] @ s[t - np.arange(t)]
+        novos[t] = max(0.0, alvo[t] - ativos)
+    return novos
+
+
+def montar_frota(ano_inicio, ano_fim, n_dc_inicio, n_dc_fim,
+                 cons_dc_inicio, cons_dc_fim, parametros=None):
+    # Sorteia as instalações. Devolve um dict de arrays compactos.
+    p = {**PARAMETROS_PADRAO, **(parametros or {})}
+    rng = np.random.default_rng(p['semente'])
+
+    anos = np.arange(ano_inicio, ano_fim + 1)
+    alvo = np.interp(anos, [ano_inicio, ano_fim], [n_dc_inicio, n_dc_fim])
+    novos = construcoes_por_ano(anos, alvo, n_dc_inicio, p)
+
+    # Frota inicial (construída antes do ano inicial) + coortes novas
+    idade_ini = rng.integers(0, p['vida_util_media'], int(round(n_dc_inicio)))
+    n_por_coorte = np.round(novos).astype(np.int64)
+    ano_construcao = np.concatenate([
+        ano_inicio - idade_ini,
+        np.repeat(anos, n_por_coorte),
+    ]).astype(np.int16)
+    idade_no_inicio = np.maximum(ano_inicio - ano_construcao, 0)
+    N = len(ano_construcao)
+
+    # Vida útil Weibull, condicionada a já ter chegado na idade atual
+    escala = _escala_weibull(p['vida_util_media'], p['forma_weibull'])
+    u = rng.random(N)
+    vida = escala * ((idade_no_inicio / escala) ** p['forma_weibull'] - np.log(u)) ** (1 / p['forma_weibull'])
+
+    # PUE e capacidade pelo ano de construção (antes do início = valores iniciais).
+    # Capacidade escolhida para que um DC maduro consuma o "consumo médio" do ano.
+    pue = np.interp(ano_construcao, [ano_inicio, ano_fim], [p['pue_inicio'], p['pue_fim']])
+    consumo_maduro = np.interp(ano_construcao, [ano_inicio, ano_fim], [cons_dc_inicio, cons_dc_fim])
+    capacidade = consumo_maduro / (HORAS_ANO * p['utilizacao_maxima'] * pue)
+
+    # Tamanhos variados (lognormal com a mesma média)
+    sigma = p['dispersao_capacidade']
+    capacidade = capacidade * rng.lognormal(-sigma ** 2 / 2, sigma, N)
+
+    return {
+        'anos': anos,
+        'ano_construcao': ano_construcao,
+        'vida_util': vida.astype(np.float32),
+        'capacidade_MW': capacidade.astype(np.float32),
+        'pue_construcao': pue.astype(np.float32),
+        'parametros': p,
+    }
+
+
+def _coortes(frota):
+    # Agrega as instalações por ano de construção (coorte).
+    # Numa coorte todos têm a mesma idade, PUE e rampa; só a capacidade e
+    # a vida útil mudam. Então basta saber quanta capacidade da coorte
+    # ainda está ativa em cada idade: um bincount pela idade de saída
+    # e uma soma acumulada de trás pra frente. Custo O(instalações),
+    # mais uma matriz coortes × anos.
+    p = frota['parametros']
+    anos = frota['anos']
+    coortes, codigo = np.unique(frota['ano_construcao'], return_inverse=True)
+    C = len(coortes)
+    if C == 0:
+        # Frota vazia (0 DCs no início e no fim): nenhuma coorte, tudo zero
+        vazio = np.zeros((0, len(anos)))
+        return coortes, vazio.astype(np.int64), vazio, vazio
+
+    idade = anos[None, :] - coortes[:, None].astype(np.int64)
+    A = int(idade.max()) + 1
+
+    # Ativa na idade a enquanto a < vida, ou seja, a < ceil(vida)
+    saida = np.minimum(np.ceil(frota['vida_util']), A).astype(np.int64)
+    chave = codigo * (A + 1) + saida
+    cap_sai = np.bincount(chave, weights=frota['capacidade_MW'], minlength=C * (A + 1)).reshape(C, A + 1)
+    n_sai = np.bincount(chave, minlength=C * (A + 1)).reshape(C, A + 1)
+
+    # viva[c, a] = soma de quem sai numa idade > a
+    cap_viva = np.zeros((C, A + 1))
+    n_viva = np.zeros((C, A + 1), dtype=np.int64)
+    cap_viva[:, :-1] = cap_sai[:, ::-1].cumsum(axis=1)[:, ::-1][:, 1:]
+    n_viva[:, :-1] = n_sai[:, ::-1].cumsum(axis=1)[:, ::-1][:, 1:]
+
+    idade_ok = np.maximum(idade, 0)
+    construida = idade >= 0
+    capacidade = np.where(construida, np.take_along_axis(cap_viva, idade_ok, axis=1), 0)
+    n_ativos = np.where(construida, np.take_along_axis(n_viva, idade_ok, axis=1), 0)
+
+    # Rampa de utilização pela idade e PUE da coorte melhorando com o tempo
+    pue_coorte = frota['pue_construcao'][np.unique(codigo, return_index=True)[1]]
+    utilizacao = p['utilizacao_maxima'] * np.minimum((idade_ok + 1) / p['anos_rampa'], 1)
+    pue = np.maximum(pue_coorte[:, None] * (1 - p['melhoria_pue_anual']) ** idade_ok, p['pue_minimo'])
+
+    carga_ti = capacidade * utilizacao
+    return coortes, n_ativos, carga_ti, carga_ti * pue * HORAS_ANO
+
+
+def simular(frota):
+    # Totais da frota por ano
+    _, n_ativos, carga_ti, consumo = _coortes(frota)
+    n_total = n_ativos.sum(axis=0)
+    consumo_total = consumo.sum(axis=0)
+    carga_total = carga_ti.sum(axis=0)
+
+    return pd.DataFrame({
+        'ano': frota['anos'],
+        'n_datacenters': n_total,
+        'consumo_DC_MWh': consumo_total,
+        'consumo_medio_DC_MWh': consumo_total / np.maximum(n_total, 1),
+        'carga_TI_MW': carga_total,
+        'pue_medio': consumo_total / np.maximum(carga_total * HORAS_ANO, 1e-9),
+    })
+
+
+def consumo_por_coorte(frota, decada=True):
+    # Consumo (MWh) por ano, somado pelo ano (ou década) de construção
+    coortes, _, _, consumo = _coortes(frota)
+    if len(coortes) == 0:
+        return pd.DataFrame(index=frota['anos'])
+    grupo = coortes // 10 * 10 if decada else coortes
+    rotulos, inicios = np.unique(grupo, return_index=True)
+    por_grupo = np.add.reduceat(consumo, inicios, axis=0)
+    return pd.DataFrame(por_grupo.T, index=frota['anos'], columns=rotulos)
+
+
+def conferir_frota_vazia():
+    # Sem DCs no início e no fim: a simulação roda e dá tudo zero
+    frota = montar_frota(2006, 2030, 0, 0, 5_000, 12_000)
+    resultado = simular(frota)
+    assert len(frota['ano_construcao']) == 0
+    assert len(resultado) == len(frota['anos'])
+    assert (resultado['n_datacenters'] == 0).all()
+    assert (resultado['consumo_DC_MWh'] == 0).all()
+    assert consumo_por_coorte(frota).shape == (len(frota['anos']), 0)
+
+
+if __name__ == '__main__':
+    conferir_frota_vazia()
+    print('frota vazia: ok')
+
+    # Teste de escala: ~100 mil instalações × 45 anos
+    inicio = time.perf_counter()
+    frota = montar_frota(2006, 2050, 20_000, 100_000, 5_000, 12_000)
+    meio = time.perf_counter()
+    resultado = simular(frota)
+    fim = time.perf_counter()
+    print(f'{len(frota["ano_construcao"]):,} instalações, {len(frota["anos"])} anos')
+    print(f'montar_frota: {meio - inicio:.3f} s | simular: {fim - meio:.3f} s')
+    print(resultado.iloc[[0, 18, -1]].to_string(index=False))
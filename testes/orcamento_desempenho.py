@@ -0,0 +1,265 @@
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+
+# --- Orçamento de desempenho do Dashboard ---
+# Roda pages/01_Dashboard.py sem navegador (AppTest), num processo
+# novo, e confere duas coisas:
+# 1) os números: a tabela da página bate com a conta feita aqui fora
+#    (consumo × fator, curva suave, cenários), a previsão do consumo
+#    continua do último ano observado e a exportação em Excel divide
+#    em abas o que passa do limite de linhas;
+# 2) o tempo e a memória: abertura com o cache vazio, reruns depois de
+#    mexer nos controles e pico de memória do processo.
+# Se algo passar do orçamento o script termina com código 1, então
+# dá pra rodar antes de cada commit (ou num CI) e pegar uma mudança que
+# deixou o caminho do rerun mais lento antes de chegar nos usuários.
+#
+# Uso (da raiz do projeto):
+#   python testes/orcamento_desempenho.py
+
+RAIZ = Path(__file__).resolve().parent.parent
+DASHBOARD = str(RAIZ / 'pages' / '01_Dashboard.py')
+
+ORCAMENTO = {
+    'abertura_s': 5.0,          # primeira execução (cache do processo vazio)
+    'rerun_mediana_ms': 250,    # rerun típico depois de mexer num controle
+    'rerun_max_ms': 750,        # pior rerun do roteiro
+    'pico_rss_mb': 500,         # memória máxima do processo
+}
+
+# Interações: (tipo do widget, começo do rótulo, valor)
+ROTEIRO = [
+    ('number_input', 'Ano final da projeção', 2040),
+    ('number_input', 'Participação dos DCs', 5.0),
+    ('checkbox', 'Emissões', False),
+    ('checkbox', 'Emissões', True),
+    ('number_input', 'Ano final da projeção', 2050),
+    ('number_input', 'Participação dos DCs', 12.5),
+    ('checkbox', 'Consumo', False),
+    ('number_input', 'Ano final da projeção', 2030),
+    ('number_input', 'Participação dos DCs', 3.6),
+    ('checkbox', 'Consumo', True),
+]
+
+TOLERANCIA = 1e-9  # relativa, nas comparações numéricas
+
+
+def pico_rss_mb():
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def _widget(at, tipo, rotulo):
+    for w in getattr(at, tipo):
+        if w.label.startswith(rotulo):
+            return w
+    raise LookupError(f'{tipo} "{rotulo}…" não encontrado')
+
+
+def _tabela_cenarios(at):
+    # O st.dataframe da seção 9 (a busca por meta também mostra uma tabela)
+    for df in at.dataframe:
+        if {'ano', 'cenario', 'emissao_DC_tCO2'} <= set(df.value.columns):
+            return df.value
+    raise LookupError('tabela de cenários não encontrada')
+
+
+def _rodar(at):
+    inicio = time.perf_counter()
+    at.run()
+    duracao = time.perf_counter() - inicio
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return duracao
+
+
+# --- Equivalência numérica ---
+
+def conferir_numeros(resultado, tabela, ano_fim, participacao_final):
+    # resultado: saída de estimador.pipeline.executar().
+    # tabela: o st.dataframe da seção 9 (ano, cenario, consumo_DC_MWh, emissao_DC_tCO2).
+    # Refaz a conta do zero com os arquivos de entrada e as constantes
+    # dos cenários. Devolve a lista de problemas encontrados.
+    from estimador.cenarios import (
+        ANO_REFERENCIA, MULTIPLICADORES, PARTICIPACAO_INICIAL, PARTICIPACAO_REFERENCIA,
+        calcular_cenarios, curva_suave
+    )
+    from estimador.pipeline import ARQUIVO_FATORES
+
+    problemas = []
+
+    def comparar(nome, obtido, esperado):
+        obtido, esperado = np.asarray(obtido, dtype=float), np.asarray(esperado, dtype=float)
+        if obtido.shape != esperado.shape or not np.allclose(obtido, esperado, rtol=TOLERANCIA, atol=0):
+            erro = np.max(np.abs(obtido - esperado) / np.abs(esperado)) if obtido.shape == esperado.shape else None
+            problemas.append(f'{nome}: diferente (erro relativo máx. {erro})')
+
+    ano_inicio = resultado['ano_inicio']
+    ultimo_ano_hist = resultado['ultimo_ano_hist']
+
+    # calcular_emissoes: emissão histórica = consumo anual × fator do ano
+    hist = resultado['historico']
+    fatores = pd.read_csv(ARQUIVO_FATORES).set_index('ano')['fator_emissao_tCO2_MWh']
+    comparar('emissões históricas', hist['emissao_total_tCO2'],
+             hist['consumo_total_MWh'] * fatores.loc[hist['ano']].to_numpy())
+
+    # curva_suave: passa pelas três âncoras e é reta entre elas
+    anos = np.arange(ano_inicio, ano_fim + 1, dtype=float)
+    alvo = participacao_final
+    curva = curva_suave(anos, ano_inicio, ano_fim, alvo)
+    esperada = np.where(
+        anos <= ANO_REFERENCIA,
+        PARTICIPACAO_INICIAL + (PARTICIPACAO_REFERENCIA - PARTICIPACAO_INICIAL)
+        * (anos - ano_inicio) / (ANO_REFERENCIA - ano_inicio),
+        PARTICIPACAO_REFERENCIA + (alvo - PARTICIPACAO_REFERENCIA)
+        * (anos - ANO_REFERENCIA) / max(ano_fim - ANO_REFERENCIA, 1),
+    )
+    comparar('curva suave', curva, esperada)
+
+    # Previsão do consumo: o primeiro ano previsto continua do último
+    # observado, sem degrau (o passo até ele é o mesmo dos anos seguintes)
+    previsto = resultado['consumo_previsto']
+    nacional = previsto[previsto['nivel'] == 'Nacional'].set_index('ano')['consumo_MWh']
+    ultimo_obs = previsto.loc[previsto['origem'] == 'histórico', 'ano'].max()
+    if ultimo_obs + 2 in nacional.index:
+        comparar('previsão do consumo sem degrau',
+                 nacional[ultimo_obs + 1] - nacional[ultimo_obs],
+                 nacional[ultimo_obs + 2] - nacional[ultimo_obs + 1])
+
+    # Cenários: participação × consumo total × fator, alvo = informado × multiplicador
+    direcionadores = resultado['direcionadores']
+    previsao = direcionadores[direcionadores['ano'].between(ano_inicio, ano_fim)]
+    cenarios = calcular_cenarios(previsao, ano_inicio, ano_fim, participacao_final)
+    for nome, mult in MULTIPLICADORES.items():
+        c = cenarios[cenarios['cenario'] == nome]
+        part = curva_suave(c['ano'].to_numpy(dtype=float), ano_inicio, ano_fim,
+                           min(1.0, participacao_final * mult))
+        consumo = c['consumo_total_MWh'].to_numpy() * part
+        comparar(f'consumo {nome}', c['consumo_DC_MWh'], consumo)
+        comparar(f'emissão {nome}', c['emissao_DC_tCO2'],
+                 consumo * c['fator_emissao_tCO2_MWh'].to_numpy())
+
+    # No histórico, emissão/consumo dos DCs tem que ser o fator do ano
+    base_hist = cenarios[(cenarios['cenario'] == 'Base') & (cenarios['ano'] <= ultimo_ano_hist)]
+    comparar('fator implícito no histórico',
+             base_hist['emissao_DC_tCO2'] / base_hist['consumo_DC_MWh'],
+             fatores.loc[base_hist['ano']].to_numpy())
+
+    # A tabela da página tem que ser exatamente essa conta
+    colunas = ['ano', 'cenario', 'consumo_DC_MWh', 'emissao_DC_tCO2']
+    pagina = tabela[colunas].sort_values(['cenario', 'ano']).reset_index(drop=True)
+    fora = cenarios[colunas].sort_values(['cenario', 'ano']).reset_index(drop=True)
+    if not pagina[['ano', 'cenario']].equals(fora[['ano', 'cenario']]):
+        problemas.append('tabela da página: anos/cenários diferentes do pipeline')
+    else:
+        comparar('tabela da página (consumo)', pagina['consumo_DC_MWh'], fora['consumo_DC_MWh'])
+        comparar('tabela da página (emissão)', pagina['emissao_DC_tCO2'], fora['emissao_DC_tCO2'])
+
+    return problemas
+
+
+# --- Exportação em Excel acima do limite de linhas ---
+
+def conferir_excel_dividido(resultado, linhas_por_aba=50):
+    # Mesma varredura do dashboard, gravada com um limite pequeno por aba
+    # (o real é 1.048.576 linhas): nenhuma aba pode passar do limite, cada
+    # uma começa com o cabeçalho e, juntas, têm todas as linhas, na ordem.
+    import io
+
+    from openpyxl import load_workbook
+
+    from estimador.exportar_resultados import _excel, linhas_varredura, varredura
+
+    problemas = []
+    args = (resultado['direcionadores'], resultado['ano_inicio'], range(2030, 2033), [0.01, 0.05])
+    esperado = pd.concat(list(varredura(*args)), ignore_index=True)
+    if linhas_varredura(*args) != len(esperado):
+        problemas.append(f'linhas_varredura: {linhas_varredura(*args)} != {len(esperado)}')
+
+    arquivo = io.BytesIO()
+    _excel(varredura(*args), arquivo, linhas_por_aba)
+    arquivo.seek(0)
+    livro = load_workbook(arquivo, read_only=True)
+    abas = [list(aba.values) for aba in livro.worksheets]
+    livro.close()
+
+    if len(abas) != -(-len(esperado) // (linhas_por_aba - 1)):
+        problemas.append(f'excel: {len(abas)} abas para {len(esperado)} linhas')
+    if any(len(aba) > linhas_por_aba for aba in abas):
+        problemas.append('excel: aba acima do limite de linhas')
+    if any(list(aba[0]) != list(esperado.columns) for aba in abas):
+        problemas.append('excel: aba sem o cabeçalho')
+    lido = pd.DataFrame([linha for aba in abas for linha in aba[1:]], columns=esperado.columns)
+    if not np.allclose(lido['emissao_DC_tCO2'].astype(float), esperado['emissao_DC_tCO2'], rtol=TOLERANCIA):
+        problemas.append('excel: linhas diferentes da varredura')
+    return problemas
+
+
+# --- Tempo e memória ---
+
+def medir():
+    inicio = time.perf_counter()
+    at = AppTest.from_file(DASHBOARD, default_timeout=300)
+    abertura = _rodar(at)
+    abertura_total = time.perf_counter() - inicio
+
+    # Guarda a tabela depois de cada mudança de ano ou participação;
+    # a conferência dos números fica para depois, fora da medida de memória
+    reruns = []
+    tabelas = []
+    for i, (tipo, rotulo, valor) in enumerate(ROTEIRO):
+        _widget(at, tipo, rotulo).set_value(valor)
+        reruns.append(_rodar(at))
+
+        if tipo == 'number_input':
+            ano_fim = int(_widget(at, 'number_input', 'Ano final da projeção').value)
+            participacao = _widget(at, 'number_input', 'Participação dos DCs').value / 100
+            tabelas.append((i + 1, _tabela_cenarios(at), ano_fim, participacao))
+
+    reruns = np.array(reruns) * 1000
+    return {
+        'abertura_s': max(abertura, abertura_total),
+        'rerun_mediana_ms': float(np.median(reruns)),
+        'rerun_max_ms': float(reruns.max()),
+        'pico_rss_mb': pico_rss_mb(),
+    }, tabelas
+
+
+if __name__ == '__main__':
+    os.chdir(RAIZ)
+    if str(RAIZ) not in sys.path:
+        sys.path.insert(0, str(RAIZ))
+
+    from estimador.pipeline import executar
+
+    medidas, tabelas = medir()
+
+    resultado = executar()
+    problemas = [f'passo {passo}: {p}'
+                 for passo, tabela, ano_fim, participacao in tabelas
+                 for p in conferir_numeros(resultado, tabela, ano_fim, participacao)]
+    problemas += conferir_excel_dividido(resultado)
+
+    print(f'{"medida":<18} {"valor":>10} {"orçamento":>10}')
+    for chave, limite in ORCAMENTO.items():
+        valor = medidas[chave]
+        estourou = valor > limite
+        print(f'{chave:<18} {valor:>10.1f} {limite:>10.1f}  {"ESTOUROU" if estourou else "ok"}')
+        if estourou:
+            problemas.append(f'{chave}: {valor:.1f} > {limite}')
+
+    if problemas:
+        print('\nFalhas:')
+        for p in problemas:
+            print(f'- {p}')
+        sys.exit(1)
+    print('\nTudo dentro do orçamento.')
@@ -0,0 +1,155 @@
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from prophet import Prophet
+
+
+# --- Previsões de todos os países, calculadas fora do app ---
+# Uso (dentro de testes/):
+#   python previsao_paises.py [csv de entrada] [arquivo de saída] [nº de processos]
+# O resultado é um único .npz com colunas tipadas (uma linha por país × data)
+# e um índice país → (início, fim) dessas linhas.
+
+ARQUIVO_DADOS = './input/World Energy Consumption.csv'
+ARQUIVO_PREVISOES = './cache/previsoes_paises.npz'
+ANOS_FUTUROS = 20
+
+
+def preparar_serie(dados_pais):
+    # Mesma lógica do App: começa no primeiro ano com consumo > 0
+    if dados_pais['primary_energy_consumption'].sum() == 0:
+        return None
+
+    primeiro_ano_valido = dados_pais.loc[
+        dados_pais['primary_energy_consumption'] > 0, 'year'
+    ].min()
+
+    dados_validos = dados_pais[
+        dados_pais['year'] >= primeiro_ano_valido
+    ][['year', 'primary_energy_consumption']].dropna()
+
+    dados_validos = dados_validos.rename(columns={'year': 'ds', 'primary_energy_consumption': 'y'})
+    dados_validos['ds'] = pd.to_datetime(dados_validos['ds'], format='%Y')
+    return dados_validos
+
+
+def treinar_pais(dados_validos, anos_futuros=ANOS_FUTUROS):
+    modelo = Prophet()
+    modelo.fit(dados_validos)
+
+    # Nota: freq='YE' é para pandas novos. Se der erro, use freq='Y'
+    datas_futuras = modelo.make_future_dataframe(periods=anos_futuros, freq='YE')
+    previsoes = modelo.predict(datas_futuras)
+    return {'modelo': modelo, 'previsoes': previsoes}
+
+
+def _prever_pais(args):
+    # Roda num processo do pool. Nunca levanta erro: devolve o motivo da falha.
+    pais, dados_pais = args
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    try:
+        dados_validos = preparar_serie(dados_pais)
+        if dados_validos is None or len(dados_validos) < 2:
+            return pais, None, 'sem dados de consumo válidos'
+
+        previsoes = treinar_pais(dados_validos)['previsoes']
+        real = dados_validos.set_index('ds')['y'].reindex(previsoes['ds'])
+        return pais, {
+            # Datas guardadas como dias desde 1970 (int32)
+            'dia': previsoes['ds'].to_numpy().astype('datetime64[D]').astype(np.int32),
+            'y': real.to_numpy(),
+            'yhat': previsoes['yhat'].to_numpy(),
+            'yhat_lower': previsoes['yhat_lower'].to_numpy(),
+            'yhat_upper': previsoes['yhat_upper'].to_numpy(),
+        }, None
+    except Exception as erro:
+        return pais, None, f'{type(erro).__name__}: {erro}'
+
+
+def precomputar(df, max_workers=None):
+    # Ajusta todos os países num pool de processos.
+    # Devolve (colunas do arquivo, {país: motivo da falha}).
+    tarefas = [(pais, dados) for pais, dados in df.groupby('country', sort=True)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        resultados = list(pool.map(_prever_pais, tarefas, chunksize=4))
+
+    paises, partes, falhas = [], [], {}
+    for pais, colunas, erro in resultados:
+        if erro:
+            falhas[pais] = erro
+        else:
+            paises.append(pais)
+            partes.append(colunas)
+
+    tamanhos = np.array([len(p['dia']) for p in partes], dtype=np.int64)
+    inicio = np.concatenate([[0], np.cumsum(tamanhos)[:-1]]) if len(partes) else np.array([], dtype=np.int64)
+
+    def juntar(nome, tipo):
+        return np.concatenate([p[nome] for p in partes]).astype(tipo) if partes else np.array([], dtype=tipo)
+
+    colunas = {
+        'paises': np.array(paises),
+        'inicio': inicio,
+        'fim': inicio + tamanhos,
+        'dia': juntar('dia', np.int32),
+        'y': juntar('y', np.float32),
+        'yhat': juntar('yhat', np.float32),
+        'yhat_lower': juntar('yhat_lower', np.float32),
+        'yhat_upper': juntar('yhat_upper', np.float32),
+        'paises_falha': np.array(list(falhas)),
+        'motivos_falha': np.array(list(falhas.values())),
+    }
+    return colunas, falhas
+
+
+def salvar_previsoes(colunas, path=ARQUIVO_PREVISOES):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez_compressed(path, **colunas)
+
+
+def carregar_previsoes(path=ARQUIVO_PREVISOES):
+    # Lê o arquivo inteiro (é pequeno) e monta o índice país → linhas
+    with np.load(path) as arq:
+        colunas = {nome: arq[nome] for nome in arq.files}
+    colunas['indice'] = {
+        pais: (int(i), int(f))
+        for pais, i, f in zip(colunas['paises'], colunas['inicio'], colunas['fim'])
+    }
+    colunas['falhas'] = dict(zip(colunas['paises_falha'], colunas['motivos_falha']))
+    return colunas
+
+
+def previsoes_do_pais(colunas, pais):
+    # Fatia das colunas do país, no formato que o App usa
+    i, f = colunas['indice'][pais]
+    return pd.DataFrame({
+        'ds': pd.to_datetime(colunas['dia'][i:f].astype('datetime64[D]')),
+        'y': colunas['y'][i:f],
+        'yhat': colunas['yhat'][i:f],
+        'yhat_lower': colunas['yhat_lower'][i:f],
+        'yhat_upper': colunas['yhat_upper'][i:f],
+    })
+
+
+if __name__ == '__main__':
+    entrada = sys.argv[1] if len(sys.argv) > 1 else ARQUIVO_DADOS
+    saida = sys.argv[2] if len(sys.argv) > 2 else ARQUIVO_PREVISOES
+    processos = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    inicio = time.perf_counter()
+    df = pd.read_csv(entrada, usecols=['country', 'year', 'primary_energy_consumption'])
+    colunas, falhas = precomputar(df, processos)
+    salvar_previsoes(colunas, saida)
+    total = time.perf_counter() - inicio
+
+    print(f'{len(colunas["paises"])} países previstos, {len(falhas)} falhas, '
+          f'{total:.1f} s no total → {saida}')
+    for pais, motivo in falhas.items():
+        print(f'  - {pais}: {motivo}')
@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 import streamlit as st
 from prophet import Prophet
 
+from frota_dc import PARAMETROS_PADRAO, consumo_por_coorte, montar_frota, simular
+
 # ==============================
 # CONFIGURAÇÃO BÁSICA DO APP
 # ==============================
@@ -146,6 +148,27 @@ else:
         step=100.0
     )
 
+    # Parâmetros da frota (simulação por coorte de construção)
+    with st.sidebar.expander("Frota: vida útil, utilização e PUE"):
+        vida_util_media = st.slider(
+            "Vida útil média (anos)", 5, 30, PARAMETROS_PADRAO["vida_util_media"]
+        )
+        anos_rampa = st.slider(
+            "Anos até a utilização máxima", 1, 10, PARAMETROS_PADRAO["anos_rampa"]
+        )
+        utilizacao_maxima = st.slider(
+            "Utilização máxima da capacidade de TI", 0.1, 1.0,
+            PARAMETROS_PADRAO["utilizacao_maxima"], 0.05
+        )
+        pue_inicio = st.slider(
+            f"PUE dos DCs construídos em {ano_inicio}", 1.0, 3.0,
+            PARAMETROS_PADRAO["pue_inicio"], 0.05
+        )
+        pue_fim = st.slider(
+            f"PUE dos DCs construídos em {ano_fim}", 1.0, 3.0,
+            PARAMETROS_PADRAO["pue_fim"], 0.05
+        )
+
 # ==============================
 # 4) PREVER EMISSÕES TOTAIS
 # ==============================
@@ -209,25 +232,38 @@ else:
     # ------- MODO 2: POR CONSUMO -------
     st.markdown(
         """
-        **Modo consumo:** emissões dos DCs são calculadas a partir do número de data centers
-        e do consumo médio anual por DC, multiplicado pelo fator de emissão (tCO₂/MWh).
+        **Modo consumo:** a frota de data centers é simulada por coorte (ano de construção),
+        com vida útil, rampa de utilização e PUE. O número de DCs segue a reta entre os dois
+        anos e o consumo médio vale para um DC maduro construído naquele ano. O consumo
+        da frota é multiplicado pelo fator de emissão (tCO₂/MWh).
         """
     )
 
-    previsao["n_datacenters"] = np.interp(
-        anos,
-        [ano_inicio, ano_fim],
-        [n_dc_inicio, n_dc_fim]
-    )
-
-    previsao["consumo_medio_DC_MWh"] = np.interp(
-        anos,
-        [ano_inicio, ano_fim],
-        [cons_dc_inicio, cons_dc_fim]
+    parametros_frota = {
+        "vida_util_media": vida_util_media,
+        "anos_rampa": anos_rampa,
+        "utilizacao_maxima": utilizacao_maxima,
+        "pue_inicio": pue_inicio,
+        "pue_fim": pue_fim,
+    }
+
+    @st.cache_data
+    def simular_frota(ano_inicio, ano_fim, n_dc_inicio, n_dc_fim,
+                      cons_dc_inicio, cons_dc_fim, parametros):
+        # Frota sorteada por coorte; o mesmo conjunto de entradas
+        # sempre dá a mesma frota (semente fixa)
+        frota = montar_frota(ano_inicio, ano_fim, n_dc_inicio, n_dc_fim,
+                             cons_dc_inicio, cons_dc_fim, parametros)
+        return simular(frota), consumo_por_coorte(frota)
+
+    frota_anual, frota_coortes = simular_frota(
+        int(ano_inicio), int(ano_fim), n_dc_inicio, n_dc_fim,
+        cons_dc_inicio, cons_dc_fim, parametros_frota
     )
 
-    previsao["consumo_DC_MWh"] = (
-        previsao["n_datacenters"] * previsao["consumo_medio_DC_MWh"]
+    previsao = previsao.merge(
+        frota_anual[["ano", "n_datacenters", "consumo_medio_DC_MWh", "consumo_DC_MWh", "pue_medio"]],
+        on="ano", how="left"
     )
 
     fatores = df_final[["ano", "fator_emissao_tCO2_MWh"]].drop_duplicates()
@@ -246,6 +282,21 @@ else:
         previsao["emissao_DC_tCO2"] / previsao["emissao_total_tCO2"]
     )
 
+    with st.expander("🏗️ Frota de data centers por década de construção"):
+        if frota_coortes.empty:
+            st.info("Nenhum data center na frota (0 DCs no início e no fim).")
+        else:
+            fig_frota, ax_frota = plt.subplots(figsize=(12, 4))
+            ax_frota.stackplot(
+                frota_coortes.index,
+                frota_coortes.T.values / 1e6,
+                labels=[f"{d}s" for d in frota_coortes.columns]
+            )
+            ax_frota.set_xlabel("Ano")
+            ax_frota.set_ylabel("Consumo (TWh)")
+            ax_frota.legend(loc="upper left")
+            st.pyplot(fig_frota)
+
 # separar real x previsto para DCs
 df_real_dc = previsao[previsao["ano"] <= ultimo_ano_hist].copy()
 df_prev_dc = previsao[previsao["ano"] > ultimo_ano_hist].copy()
@@ -375,7 +426,7 @@ with st.expander("🔍 Ver tabela de resultados (previsão completa)"):
                 "emissao_DC_tCO2",
                 "participacao_DC"
             ] + (
-                ["n_datacenters", "consumo_medio_DC_MWh", "consumo_DC_MWh"]
+                ["n_datacenters", "consumo_medio_DC_MWh", "consumo_DC_MWh", "pue_medio"]
                 if "n_datacenters" in previsao.columns
                 else []
             )